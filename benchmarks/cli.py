@@ -0,0 +1,84 @@
+"""
+Command line interface of the benchmark suite.
+
+Examples::
+
+    python -m benchmarks run --suite quick --label main
+    python -m benchmarks run --scenario 500:100000:0.2 --phases run reproduce
+    python -m benchmarks compare --baseline main --threshold 0.1
+
+``compare`` checks the latest entry (or ``--current``) against the one before
+it (or ``--baseline``) and exits with status 1 if a throughput dropped by
+more than the threshold.
+"""
+
+import argparse
+import sys
+from benchmarks.history import append_history, compare, find_entry, load_history, make_entry
+from benchmarks.scenarios import SUITES, parse_scenario
+from benchmarks.timing import PHASES, run_scenario
+
+DEFAULT_HISTORY = "benchmarks/history.json"
+
+
+def _run(args):
+    scenarios = [parse_scenario(text) for text in args.scenario] if args.scenario else SUITES[args.suite]
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = run_scenario(scenario, args.foodweb, phases=args.phases, seed=args.seed,
+                                              repeat=args.repeat)
+        for phase, metrics in results[scenario.name].items():
+            print(f"{scenario.name:24} {phase:16} {metrics['agent_steps_per_sec']:>14,.0f} agent-steps/s"
+                  f"{metrics['seconds']:>10.3f} s")
+    append_history(args.history, make_entry(results, label=args.label))
+    print(f"✅ Results appended to {args.history}")
+    return 0
+
+
+def _compare(args):
+    history = load_history(args.history)
+    if len(history) < 2 and args.baseline is None:
+        print(f"Need at least two entries in {args.history} to compare.")
+        return 2
+    current = find_entry(history, args.current)
+    baseline = find_entry(history, args.baseline if args.baseline is not None else -2)
+    regressions = compare(baseline, current, args.threshold)
+    for r in regressions:
+        print(f"REGRESSION {r.scenario} {r.phase} {r.metric}: {r.baseline:,.1f} -> {r.current:,.1f} "
+              f"({r.change:+.1%})")
+    if regressions:
+        return 1
+    print(f"✅ No throughput dropped by more than {args.threshold:.0%}.")
+    return 0
+
+
+def main(argv=None):
+    """
+    Command line entry point, see the module docstring.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the simulation and track its throughput.")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON history file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run scenarios and append the results to the history")
+    run.add_argument("--suite", choices=sorted(SUITES), default="quick", help="predefined scenarios")
+    run.add_argument("--scenario", action="append", help="GRID:POPULATION[:DENSITY[:STEPS]], repeatable")
+    run.add_argument("--phases", nargs="+", choices=PHASES, default=list(PHASES), help="phases to time")
+    run.add_argument("--repeat", type=int, default=3, help="repeats per measurement (best is kept)")
+    run.add_argument("--seed", type=int, default=0, help="seed of engines and terrains")
+    run.add_argument("--label", default=None, help="label of the history entry")
+    run.add_argument("--foodweb", default="configs/foodweb_config.json", help="food web configuration")
+    run.set_defaults(handler=_run)
+
+    cmp = commands.add_parser("compare", help="flag throughput regressions between history entries")
+    cmp.add_argument("--baseline", default=None, help="index, label or commit (default: second to last)")
+    cmp.add_argument("--current", default="-1", help="index, label or commit (default: last)")
+    cmp.add_argument("--threshold", type=float, default=0.1, help="tolerated relative drop")
+    cmp.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+JSON history of benchmark results and regression checks between entries.
+
+The history file holds a list of entries, oldest first::
+
+    [{"label": "...", "timestamp": "...", "commit": "...", "python": "...",
+      "results": {"g100-n1000-d0.1": {"run": {"seconds": 0.8, "steps_per_sec": 25.0, ...}, ...}}}]
+"""
+
+import datetime
+import json
+import os
+import platform
+import subprocess
+from typing import NamedTuple
+
+
+class Regression(NamedTuple):
+    """
+    A throughput that dropped between two history entries.
+
+    Attributes:
+        scenario (str): Scenario name.
+        phase (str): Phase name.
+        metric (str): Throughput metric.
+        baseline (float): Value in the baseline entry.
+        current (float): Value in the current entry.
+    """
+    scenario: str
+    phase: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self):
+        """
+        Returns:
+            float: Relative change, e.g. -0.25 for a 25% drop.
+        """
+        return self.current / self.baseline - 1
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def make_entry(results, label=None):
+    """
+    Wraps benchmark results into a history entry with the time, the git commit
+    (if available) and the Python version.
+
+    Parameters:
+        results (dict): Scenario name -> phase -> metrics.
+        label (str): Optional label, e.g. a branch name.
+
+    Returns:
+        dict: The entry.
+    """
+    return {
+        "label": label,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def load_history(path):
+    """
+    Parameters:
+        path (str): History file.
+
+    Returns:
+        list: The entries, empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def append_history(path, entry):
+    """
+    Appends an entry to a history file, which is rewritten atomically.
+
+    Parameters:
+        path (str): History file.
+        entry (dict): Entry as made by make_entry.
+    """
+    history = load_history(path)
+    history.append(entry)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(history, fp, indent=1)
+    os.replace(tmp_path, path)
+
+
+def find_entry(history, ref):
+    """
+    Looks up a history entry by list index (negative from the end), label or commit.
+
+    Parameters:
+        history (list): The entries.
+        ref (str | int): Index, label or commit.
+
+    Returns:
+        dict: The entry.
+
+    Raises:
+        KeyError: If no entry matches.
+    """
+    try:
+        return history[int(ref)]
+    except (ValueError, IndexError):
+        pass
+    for entry in reversed(history):
+        if ref in (entry.get("label"), entry.get("commit")):
+            return entry
+    raise KeyError(f"No benchmark entry {ref!r}.")
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Finds the throughputs that dropped by more than threshold. Only scenarios,
+    phases and metrics present in both entries are compared.
+
+    Parameters:
+        baseline (dict): Baseline entry.
+        current (dict): Current entry.
+        threshold (float): Tolerated relative drop, e.g. 0.1 for 10%.
+
+    Returns:
+        list: Regression tuples, worst first.
+    """
+    regressions = []
+    for scenario, phases in current["results"].items():
+        for phase, metrics in phases.items():
+            reference = baseline["results"].get(scenario, {}).get(phase, {})
+            for metric, value in metrics.items():
+                if not metric.endswith("_per_sec") or not reference.get(metric):
+                    continue
+                if value < reference[metric] * (1 - threshold):
+                    regressions.append(Regression(scenario, phase, metric, reference[metric], value))
+    return sorted(regressions, key=lambda r: r.change)
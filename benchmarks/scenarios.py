@@ -0,0 +1,159 @@
+"""
+Benchmark scenarios: a grid size, a population and a terrain density.
+
+A scenario's population is split over the species of the food web by
+SPECIES_SHARES and placed like SimulationEngine.setup does. Its terrain covers
+the given fraction of the cells with water, trees, hills and shelters
+(TERRAIN_SHARES), drawn from the scenario seed.
+"""
+
+from typing import NamedTuple
+import numpy as np
+from core.rng import make_rng
+from core.terrain import Terrain, WATER, TREE, HILL, SHELTER
+from simulation.engine import SimulationEngine
+
+# Share of the population per organism type and trophic level.
+SPECIES_SHARES = {"Producer": 0.5, "primary": 0.35, "secondary": 0.1, "tertiary": 0.03, "omnivore": 0.02}
+
+# Share of the non-plain cells per terrain type.
+TERRAIN_SHARES = ((WATER, 0.4), (TREE, 0.3), (HILL, 0.2), (SHELTER, 0.1))
+
+
+class Scenario(NamedTuple):
+    """
+    One benchmark scenario.
+
+    Attributes:
+        grid_size (int): Size of the grid.
+        population (int): Initial number of organisms.
+        terrain_density (float): Fraction of non-plain cells, in [0, 1).
+        steps (int): Steps of a full run.
+    """
+    grid_size: int
+    population: int
+    terrain_density: float = 0.1
+    steps: int = 20
+
+    @property
+    def name(self):
+        """
+        Returns:
+            str: Stable name, e.g. 'g100-n1000-d0.1'.
+        """
+        return f"g{self.grid_size}-n{self.population}-d{self.terrain_density:g}"
+
+
+# Scaling ladders from 20x20 with 100 organisms up to 2000x2000 with a million.
+SUITES = {
+    "quick": [
+        Scenario(20, 100, 0.1, steps=50),
+        Scenario(100, 1_000, 0.1),
+        Scenario(200, 10_000, 0.1, steps=10),
+    ],
+    "scaling": [
+        Scenario(20, 100, 0.1, steps=50),
+        Scenario(100, 1_000, 0.1),
+        Scenario(200, 10_000, 0.1, steps=10),
+        Scenario(500, 100_000, 0.1, steps=5),
+        Scenario(2000, 1_000_000, 0.1, steps=2),
+    ],
+    "terrain": [
+        Scenario(200, 10_000, 0.0, steps=10),
+        Scenario(200, 10_000, 0.1, steps=10),
+        Scenario(200, 10_000, 0.3, steps=10),
+        Scenario(200, 10_000, 0.5, steps=10),
+    ],
+}
+
+
+def parse_scenario(text):
+    """
+    Parses a scenario given as 'GRID:POPULATION[:DENSITY[:STEPS]]', e.g. '500:100000:0.2'.
+
+    Parameters:
+        text (str): The scenario.
+
+    Returns:
+        Scenario: The parsed scenario.
+    """
+    parts = text.split(":")
+    if not 2 <= len(parts) <= 4:
+        raise ValueError(f"Scenario must be GRID:POPULATION[:DENSITY[:STEPS]], got {text!r}.")
+    grid_size, population = int(parts[0]), int(float(parts[1]))
+    density = float(parts[2]) if len(parts) > 2 else 0.1
+    steps = int(parts[3]) if len(parts) > 3 else 20
+    return Scenario(grid_size, population, density, steps)
+
+
+def build_terrain(scenario, rng):
+    """
+    Creates the terrain of a scenario.
+
+    Parameters:
+        scenario (Scenario): The scenario.
+        rng (RandomSource): Random source.
+
+    Returns:
+        Terrain: Terrain whose non-plain cells make up terrain_density of the grid.
+    """
+    terrain = Terrain(scenario.grid_size, rng=rng)
+    cells = scenario.grid_size ** 2
+    chosen = rng.choice(cells, size=round(scenario.terrain_density * cells), replace=False)
+    start = 0
+    for code, share in TERRAIN_SHARES:
+        count = round(share * len(chosen))
+        ys, xs = np.divmod(chosen[start:start + count], scenario.grid_size)
+        terrain.grid[ys, xs] = code
+        start += count
+    terrain.refresh_masks()
+    return terrain
+
+
+def initial_counts(scenario, foodweb):
+    """
+    Splits the population of a scenario over the food web species.
+
+    Parameters:
+        scenario (Scenario): The scenario.
+        foodweb (FoodWeb): The food web.
+
+    Returns:
+        dict: Initial count per species.
+    """
+    groups = {}
+    for species in foodweb.all_species():
+        kind = foodweb.get_type(species)
+        if kind == "Consumer":
+            kind = foodweb.get_trophic_level(species)
+        if kind in SPECIES_SHARES:
+            groups.setdefault(kind, []).append(species)
+    total = sum(SPECIES_SHARES[kind] for kind in groups)
+    counts = {}
+    for kind, members in groups.items():
+        for species in members:
+            counts[species] = round(scenario.population * SPECIES_SHARES[kind] / total / len(members))
+    return counts
+
+
+def build_engine(scenario, foodweb_path="configs/foodweb_config.json", seed=0):
+    """
+    Creates a headless engine set up for a scenario.
+
+    Parameters:
+        scenario (Scenario): The scenario.
+        foodweb_path (str): Path to the food web configuration JSON.
+        seed (int): Seed of the engine and the terrain.
+
+    Returns:
+        SimulationEngine: Engine after setup().
+
+    Raises:
+        ValueError: If the population does not fit on the free cells.
+    """
+    engine = SimulationEngine(grid_size=scenario.grid_size, steps=scenario.steps, foodweb_path=foodweb_path,
+                              headless=True, seed=seed)
+    engine.initial_counts = initial_counts(scenario, engine.foodweb)
+    engine.terrain = build_terrain(scenario, make_rng(seed))
+    engine.setup()
+    return engine
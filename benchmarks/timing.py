@@ -0,0 +1,130 @@
+"""
+Throughput measurements of the simulation and of its phases.
+
+Every measurement returns a dict of metrics. Throughputs ("..._per_sec") are
+higher-is-better and are what benchmarks.history compares; "seconds" is the
+best wall time over the repeats.
+"""
+
+import logging
+import time
+from core.organism import Consumer
+from logic.reproduction import reproduce
+import logic.behavior as behavior
+from benchmarks.scenarios import build_engine
+
+PHASES = ("run", "reproduce", "behavior", "update_shelters")
+
+
+def time_run(scenario, foodweb_path, seed=0, repeat=1):
+    """
+    Times SimulationEngine.run over the scenario's steps, rendering off.
+
+    Returns:
+        dict: seconds, steps_per_sec and agent_steps_per_sec (organism
+        updates, i.e. the live organisms summed over the steps).
+    """
+    timings, agent_steps = [], 0
+    for _ in range(repeat):
+        engine = build_engine(scenario, foodweb_path, seed)
+        alive = sum(org.alive for org in engine.organisms)
+        start = time.perf_counter()
+        engine.run()
+        timings.append(time.perf_counter() - start)
+        history = list(engine.population_history.values())
+        agent_steps = alive + sum(sum(counts[:-1]) for counts in history)
+    seconds = min(timings)
+    return {"seconds": seconds, "steps_per_sec": scenario.steps / seconds,
+            "agent_steps_per_sec": agent_steps / seconds}
+
+
+def time_reproduce(scenario, foodweb_path, seed=0, repeat=3):
+    """
+    Times one reproduce() call on the initial population at a producer-spreading
+    step, with the cooldown tables reset before every call.
+
+    Returns:
+        dict: seconds, calls_per_sec and agent_steps_per_sec.
+    """
+    engine = build_engine(scenario, foodweb_path, seed)
+    context = engine._reproduction
+    timings = []
+    for _ in range(repeat):
+        context.last_repro.clear()
+        context.last_primary_respawn.clear()
+        start = time.perf_counter()
+        reproduce(engine.organisms, engine.grid_size, 30, context)
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+    return {"seconds": seconds, "calls_per_sec": 1 / seconds, "agent_steps_per_sec": len(engine.organisms) / seconds}
+
+
+def time_behavior(scenario, foodweb_path, seed=0, repeat=3):
+    """
+    Times the consumer behaviour (flee, chase, eat, random move) of one step,
+    on a fresh engine for every repeat.
+
+    Returns:
+        dict: seconds and agent_steps_per_sec (consumer updates).
+    """
+    timings, consumers = [], []
+    for _ in range(repeat):
+        engine = build_engine(scenario, foodweb_path, seed)
+        consumers = [org for org in engine.organisms if isinstance(org, Consumer)]
+        start = time.perf_counter()
+        for org in consumers:
+            org.step(engine.grid_size, engine.organisms, engine.foodweb, behavior, engine.terrain,
+                     index=engine.spatial_index, rng=engine.rng)
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+    return {"seconds": seconds, "agent_steps_per_sec": len(consumers) / seconds}
+
+
+def time_update_shelters(scenario, foodweb_path, seed=0, repeat=3):
+    """
+    Times one Terrain.update_shelters pass over the initial population, on a
+    fresh engine for every repeat.
+
+    Returns:
+        dict: seconds and agent_steps_per_sec.
+    """
+    timings, count = [], 0
+    for _ in range(repeat):
+        engine = build_engine(scenario, foodweb_path, seed)
+        count = len(engine.organisms)
+        start = time.perf_counter()
+        engine.terrain.update_shelters(engine.organisms, index=engine.spatial_index)
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+    return {"seconds": seconds, "agent_steps_per_sec": count / seconds}
+
+
+TIMERS = {
+    "run": time_run,
+    "reproduce": time_reproduce,
+    "behavior": time_behavior,
+    "update_shelters": time_update_shelters,
+}
+
+
+def run_scenario(scenario, foodweb_path="configs/foodweb_config.json", phases=PHASES, seed=0, repeat=3):
+    """
+    Measures the given phases of one scenario. Full runs are repeated only
+    once for scenarios of 100,000 organisms or more.
+
+    Parameters:
+        scenario (Scenario): The scenario.
+        foodweb_path (str): Path to the food web configuration JSON.
+        phases (tuple): Names from PHASES.
+        seed (int): Seed of the engine and the terrain.
+        repeat (int): Number of repeats; the best time is kept.
+
+    Returns:
+        dict: Phase name -> metrics.
+    """
+    logging.getLogger("simulation").setLevel(logging.WARNING)
+    results = {}
+    for phase in phases:
+        runs = 1 if phase == "run" and scenario.population >= 100_000 else repeat
+        results[phase] = TIMERS[phase](scenario, foodweb_path, seed=seed, repeat=runs)
+    return results
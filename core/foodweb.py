@@ -1,8 +1,19 @@
 import json
+import numpy as np
 
 class FoodWeb:
     """
     A class to represent and query an ecological food web based on a JSON file.
+
+    On load the web is compiled into interned integer species ids, a boolean
+    predator x prey matrix and cached prey/predator sets, so relationship
+    queries are O(1) by name or id and can be vectorized over id arrays.
+
+    Attributes:
+        species_names (list): Species name for every species id.
+        species_ids (dict): Species id for every species name.
+        predation_matrix (numpy.ndarray): ``predation_matrix[predator_id, prey_id]``
+            is True if the predator eats the prey.
     """
     
     def __init__(self, filepath):
@@ -16,6 +27,31 @@ class FoodWeb:
             data = json.load(f)
             self.organisms = data["organisms"]
             self.web = data["predation"]
+        self._compile()
+
+    def _compile(self):
+        """
+        Interns species names into integer ids and builds the predation matrix
+        and the per-species prey and predator caches.
+        """
+        self.species_names = list(self.organisms.keys())
+        for predator, prey_list in self.web.items():
+            for species in [predator, *prey_list]:
+                if species not in self.species_names:
+                    self.species_names.append(species)
+        self.species_ids = {name: i for i, name in enumerate(self.species_names)}
+
+        n = len(self.species_names)
+        self.predation_matrix = np.zeros((n, n), dtype=bool)
+        predators = {name: [] for name in self.species_names}
+        for predator, prey_list in self.web.items():
+            for prey in prey_list:
+                self.predation_matrix[self.species_ids[predator], self.species_ids[prey]] = True
+                if predator not in predators[prey]:
+                    predators[prey].append(predator)
+        self._predator_lists = predators
+        self._prey_sets = {name: frozenset(self.web.get(name, [])) for name in self.species_names}
+        self._predator_sets = {name: frozenset(preds) for name, preds in predators.items()}
 
     def get_prey(self, predator):
         """
@@ -39,7 +75,7 @@ class FoodWeb:
         Returns:
         list: List of predator species names.
         """
-        return [pred for pred, prey_list in self.web.items() if species in prey_list]
+        return list(self._predator_lists.get(species, []))
 
     def is_prey(self, predator, prey):
         """
@@ -52,7 +88,82 @@ class FoodWeb:
         Returns:
         bool: True if prey is in the predator's prey list, False otherwise.
         """
-        return prey in self.web.get(predator, [])
+        prey_set = self._prey_sets.get(predator)
+        return prey_set is not None and prey in prey_set
+
+    def prey_set(self, predator):
+        """
+        Get the cached set of prey species for a given predator.
+
+        Parameters:
+        predator (str): Name of the predator species.
+
+        Returns:
+        frozenset: Prey species names (empty if the species eats nothing).
+        """
+        return self._prey_sets.get(predator, frozenset())
+
+    def predator_set(self, species):
+        """
+        Get the cached set of predators for a given species.
+
+        Parameters:
+        species (str): Name of the species to check for predators.
+
+        Returns:
+        frozenset: Predator species names (empty if nothing hunts the species).
+        """
+        return self._predator_sets.get(species, frozenset())
+
+    def species_id(self, species):
+        """
+        Get the interned integer id of a species.
+
+        Parameters:
+        species (str): Name of the species.
+
+        Returns:
+        int: Species id, an index into species_names and predation_matrix.
+        """
+        return self.species_ids[species]
+
+    def is_prey_id(self, predator_id, prey_id):
+        """
+        Check predation by species id. Accepts scalars or NumPy id arrays,
+        in which case the check is vectorized element-wise.
+
+        Parameters:
+        predator_id (int or numpy.ndarray): Predator species id(s).
+        prey_id (int or numpy.ndarray): Prey species id(s).
+
+        Returns:
+        bool or numpy.ndarray: True where the predator eats the prey.
+        """
+        return self.predation_matrix[predator_id, prey_id]
+
+    def prey_ids(self, predator_id):
+        """
+        Get the ids of all prey species of a predator.
+
+        Parameters:
+        predator_id (int): Predator species id.
+
+        Returns:
+        numpy.ndarray: Prey species ids.
+        """
+        return np.flatnonzero(self.predation_matrix[predator_id])
+
+    def predator_ids(self, prey_id):
+        """
+        Get the ids of all predators of a species.
+
+        Parameters:
+        prey_id (int): Species id.
+
+        Returns:
+        numpy.ndarray: Predator species ids.
+        """
+        return np.flatnonzero(self.predation_matrix[:, prey_id])
 
     def is_predator(self, prey, predator):
         """
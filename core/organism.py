@@ -1,5 +1,6 @@
-import random
+import itertools
 import logic.behavior as behavior
+from core.rng import get_rng
 
 class Organism:
     """
@@ -12,8 +13,11 @@ class Organism:
         energy (int): Current energy level of the organism.
         max_energy (int): Maximum energy the organism can have.
         alive (bool): Indicates whether the organism is alive.
+        uid (int): Identifier unique within the process, in creation order.
     """
-    def __init__(self, species_name, x, y, energy=100, max_energy=120):
+    _uids = itertools.count()
+
+    def __init__(self, species_name, x, y, energy=100, max_energy=120, uid=None):
         """
         Initializes an Organism instance with a species name, coordinates, and energy levels.
 
@@ -23,6 +27,7 @@ class Organism:
             y (int): Y-coordinate.
             energy (int, optional): Starting energy. Defaults to 100.
             max_energy (int, optional): Maximum energy. Defaults to 120.
+            uid (int, optional): Identifier; the next one of the process-wide sequence if omitted.
         """
         self.species = species_name
         self.x = x
@@ -30,6 +35,7 @@ class Organism:
         self.energy = energy
         self.max_energy = max_energy
         self.alive = True
+        self.uid = next(Organism._uids) if uid is None else uid
 
     def step(self, grid_size):
         """
@@ -63,7 +69,7 @@ class Producer(Organism):
     Attributes:
         is_edible (bool): Whether the producer can be consumed by other organisms.
     """
-    def __init__(self, species_name, x, y):
+    def __init__(self, species_name, x, y, uid=None):
         """
         Initializes a Producer at a given location with default energy.
 
@@ -71,8 +77,9 @@ class Producer(Organism):
             species_name (str): The species name.
             x (int): X-coordinate.
             y (int): Y-coordinate.
+            uid (int, optional): Identifier; see Organism.
         """
-        super().__init__(species_name, x, y, energy=100)  
+        super().__init__(species_name, x, y, energy=100, uid=uid)  
         self.is_edible = True
 
     def step(self, grid_size):
@@ -95,7 +102,7 @@ class Consumer(Organism):
         trophic_level (str): The trophic level (e.g., 'primary', 'secondary').
         speed (int): Maximum number of grid cells the consumer can move per step.
     """
-    def __init__(self, species_name, x, y, trophic_level='primary', speed=1):
+    def __init__(self, species_name, x, y, trophic_level='primary', speed=1, uid=None):
         """
         Initializes a Consumer with position, energy, and behavior attributes.
 
@@ -105,24 +112,27 @@ class Consumer(Organism):
             y (int): Y-coordinate.
             trophic_level (str, optional): Trophic level. Defaults to 'primary'.
             speed (int, optional): Movement speed. Defaults to 1.
+            uid (int, optional): Identifier; see Organism.
         """
-        super().__init__(species_name, x, y, energy=100, max_energy=120)
+        super().__init__(species_name, x, y, energy=100, max_energy=120, uid=uid)
         self.trophic_level = trophic_level
         self.speed = speed
 
-    def move(self, grid_size):
+    def move(self, grid_size, rng=None):
         """
         Moves the consumer randomly within the bounds of the grid.
 
         Args:
             grid_size (int): Size of the simulation grid.
+            rng (RandomSource, optional): Random source; a shared one if omitted.
         """
-        dx = random.randint(-self.speed, self.speed)
-        dy = random.randint(-self.speed, self.speed)
+        rng = get_rng(rng)
+        dx = rng.randint(-self.speed, self.speed)
+        dy = rng.randint(-self.speed, self.speed)
         self.x = max(0, min(grid_size - 1, self.x + dx))
         self.y = max(0, min(grid_size - 1, self.y + dy))
 
-    def step(self, grid_size, others, foodweb, behavior, terrain=None):
+    def step(self, grid_size, others, foodweb, behavior, terrain=None, index=None, rng=None):
         """
         Executes one simulation step where the consumer may perform:
         - fleeing from threats
@@ -136,15 +146,25 @@ class Consumer(Organism):
             foodweb (FoodWeb): Object representing food chain relationships.
             behavior (module): Module containing decision-making logic.
             terrain (optional): Grid terrain, possibly affecting movement.
+            index (SpatialIndex, optional): Spatial index used for neighbour queries
+                instead of scanning `others`. Kept up to date with the new position
+                and liveness.
+            rng (RandomSource, optional): Random source for the random move.
+
+        Returns:
+            list: (prey, energy gained) for every prey eaten (see behavior.eat_if_possible).
         """
         if not self.alive:
-            return
+            return []
 
-        behavior.flee(self, others, foodweb)
-        behavior.chase(self, others, foodweb)
-        behavior.eat_if_possible(self, others, foodweb)
-        behavior.random_move(self, grid_size, terrain)
+        behavior.flee(self, others, foodweb, index=index, grid_size=grid_size)
+        behavior.chase(self, others, foodweb, index=index, grid_size=grid_size)
+        meals = behavior.eat_if_possible(self, others, foodweb, index=index)
+        behavior.random_move(self, grid_size, terrain, rng=rng)
 
         self.energy -= 1
         if self.energy <= 0:
             self.alive = False
+        if index is not None:
+            index.update(self)
+        return meals
@@ -0,0 +1,417 @@
+import numpy as np
+from core.organism import Organism, Producer, Consumer
+from core.rng import get_rng
+
+PRODUCER = 0
+CONSUMER = 1
+
+TROPHIC_LEVELS = ["primary", "secondary", "tertiary", "omnivore", "unknown"]
+
+
+class OrganismView:
+    """
+    Lightweight view of one row of a PopulationArrays store.
+
+    Exposes the same attributes as core.organism.Organism so existing code can
+    read (and write) `org.x`, `org.species`, `org.energy` and `org.alive`
+    without knowing that the data lives in NumPy arrays. A store keeps one view
+    per row, so a view can be used as a key or stored in a SpatialIndex; the
+    views of producers and consumers (ProducerView, ConsumerView) are also
+    instances of Producer and Consumer, whose methods work on them unchanged.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        """
+        Args:
+            store (PopulationArrays): The backing store.
+            row (int): Row of the organism in the store.
+        """
+        self._store = store
+        self._row = row
+
+    @property
+    def species(self):
+        return self._store.species_names[self._store._species_id[self._row]]
+
+    @property
+    def species_id(self):
+        return self._store._species_id.item(self._row)
+
+    @property
+    def uid(self):
+        return self._store._uid.item(self._row)
+
+    @property
+    def max_energy(self):
+        return self._store._max_energy.item(self._row)
+
+    @property
+    def is_producer(self):
+        return self._store._kind[self._row] == PRODUCER
+
+    @property
+    def x(self):
+        return self._store._x.item(self._row)
+
+    @x.setter
+    def x(self, value):
+        self._store._x[self._row] = value
+
+    @property
+    def y(self):
+        return self._store._y.item(self._row)
+
+    @y.setter
+    def y(self, value):
+        self._store._y[self._row] = value
+
+    @property
+    def energy(self):
+        return self._store._energy.item(self._row)
+
+    @energy.setter
+    def energy(self, value):
+        self._store._energy[self._row] = value
+
+    @property
+    def alive(self):
+        return self._store._alive.item(self._row)
+
+    @alive.setter
+    def alive(self, value):
+        self._store._alive[self._row] = value
+
+    def to_organism(self):
+        """
+        Copies the row into a detached Producer or Consumer with the same uid.
+
+        Returns:
+            Organism: The new organism.
+        """
+        org = Organism.__new__(Producer if self.is_producer else Consumer)
+        org.species = self.species
+        org.x = self.x
+        org.y = self.y
+        org.energy = self.energy
+        org.max_energy = self.max_energy
+        org.alive = self.alive
+        org.uid = self.uid
+        if self.is_producer:
+            org.is_edible = True
+        else:
+            org.trophic_level = self.trophic_level
+            org.speed = self.speed
+        return org
+
+    def __repr__(self):
+        return f"{self.species}({self.x},{self.y},E={self.energy})"
+
+
+class ProducerView(OrganismView, Producer):
+    """
+    View of a producer row; like a Producer it has ``is_edible`` but no
+    trophic level or speed.
+    """
+    is_edible = True
+
+
+class ConsumerView(OrganismView, Consumer):
+    """
+    View of a consumer row, adding the trophic level and speed of a Consumer.
+    """
+
+    @property
+    def trophic_level(self):
+        return TROPHIC_LEVELS[self._store._trophic[self._row]]
+
+    @property
+    def speed(self):
+        return self._store._speed.item(self._row)
+
+
+class PopulationArrays:
+    """
+    Structure-of-arrays population backend.
+
+    Keeps species id, uid, position, energy, alive flag, speed, trophic level
+    and organism kind in contiguous NumPy arrays, so that energy decay, death
+    and random movement can be applied to the whole population at once (see
+    step), and census or output code can read whole columns. Every row has a
+    persistent view (ProducerView or ConsumerView) through which the
+    per-organism code of the simulation runs; SimulationEngine uses the store
+    as its ``backend="arrays"``.
+
+    Attributes:
+        species_names (list): Species name for every species id.
+        size (int): Number of rows in use.
+    """
+
+    _COLUMNS = {
+        "species_id": np.int16,
+        "uid": np.int64,
+        "x": np.int32,
+        "y": np.int32,
+        "energy": np.int32,
+        "max_energy": np.int32,
+        "alive": np.bool_,
+        "speed": np.int16,
+        "trophic": np.int8,
+        "kind": np.int8,
+    }
+
+    def __init__(self, capacity=1024, species_names=None):
+        """
+        Initializes an empty store.
+
+        Args:
+            capacity (int, optional): Number of preallocated rows. Defaults to 1024.
+            species_names (list, optional): Known species, in species id order.
+        """
+        self.species_names = list(species_names or [])
+        self._species_ids = {name: i for i, name in enumerate(self.species_names)}
+        self.size = 0
+        self._capacity = max(1, capacity)
+        self._views = []
+        for name, dtype in self._COLUMNS.items():
+            setattr(self, "_" + name, np.zeros(self._capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.size:
+            raise IndexError(row)
+        return self._views[row]
+
+    def __iter__(self):
+        return iter(self._views)
+
+    def __getattr__(self, name):
+        # Columns are exposed trimmed to the rows in use, e.g. `store.x`.
+        if name in PopulationArrays._COLUMNS:
+            return self.__dict__["_" + name][:self.size]
+        raise AttributeError(name)
+
+    def views(self, rows):
+        """
+        Returns the views of the given rows.
+
+        Args:
+            rows (numpy.ndarray): Row indices, e.g. ``numpy.flatnonzero(store.alive)``.
+
+        Returns:
+            list: The views, in the order of rows.
+        """
+        views = self._views
+        return [views[row] for row in rows.tolist()]
+
+    def species_id_of(self, species):
+        """
+        Returns the id of a species, registering it if it is new.
+
+        Args:
+            species (str): Species name.
+
+        Returns:
+            int: The species id.
+        """
+        sid = self._species_ids.get(species)
+        if sid is None:
+            sid = len(self.species_names)
+            self.species_names.append(species)
+            self._species_ids[species] = sid
+        return sid
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in self._COLUMNS:
+            old = self.__dict__["_" + name]
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            self.__dict__["_" + name] = new
+        self._capacity = capacity
+
+    def add(self, species, x, y, energy=100, max_energy=120, speed=1,
+            trophic_level="primary", kind=CONSUMER, uid=None):
+        """
+        Appends one organism to the store.
+
+        Args:
+            species (str): Species name.
+            x (int): X-coordinate.
+            y (int): Y-coordinate.
+            energy (int, optional): Starting energy. Defaults to 100.
+            max_energy (int, optional): Maximum energy. Defaults to 120.
+            speed (int, optional): Movement speed. Defaults to 1.
+            trophic_level (str, optional): Trophic level. Defaults to 'primary'.
+            kind (int, optional): PRODUCER or CONSUMER. Defaults to CONSUMER.
+            uid (int, optional): Uid of the organism; a new one is drawn like
+                for an Organism if omitted.
+
+        Returns:
+            OrganismView: View of the new row.
+        """
+        self._reserve(1)
+        row = self.size
+        self._species_id[row] = self.species_id_of(species)
+        self._uid[row] = next(Organism._uids) if uid is None else uid
+        self._x[row] = x
+        self._y[row] = y
+        self._energy[row] = energy
+        self._max_energy[row] = max_energy
+        self._alive[row] = True
+        self._speed[row] = speed
+        self._trophic[row] = TROPHIC_LEVELS.index(trophic_level if trophic_level in TROPHIC_LEVELS else "unknown")
+        self._kind[row] = kind
+        self.size += 1
+        view = (ProducerView if kind == PRODUCER else ConsumerView)(self, row)
+        self._views.append(view)
+        return view
+
+    def add_organism(self, org):
+        """
+        Appends a copy of a Producer or Consumer (or of a view), keeping its uid.
+
+        Args:
+            org (Organism): The organism to copy.
+
+        Returns:
+            OrganismView: View of the new row.
+        """
+        producer = isinstance(org, Producer)
+        view = self.add(
+            org.species, org.x, org.y,
+            energy=org.energy,
+            max_energy=org.max_energy,
+            speed=0 if producer else getattr(org, "speed", 1),
+            trophic_level=getattr(org, "trophic_level", "unknown"),
+            kind=PRODUCER if producer else CONSUMER,
+            uid=org.uid,
+        )
+        view.alive = org.alive
+        return view
+
+    @classmethod
+    def from_organisms(cls, organisms, species_names=None):
+        """
+        Builds a store from a list of Organism objects.
+
+        Args:
+            organisms (list): Producers and Consumers to copy.
+            species_names (list, optional): Species in species id order.
+
+        Returns:
+            PopulationArrays: The new store.
+        """
+        store = cls(capacity=len(organisms), species_names=species_names)
+        for org in organisms:
+            store.add_organism(org)
+        return store
+
+    def to_organisms(self):
+        """
+        Converts the store back into Producer and Consumer objects with the
+        uids of the rows (see OrganismView.to_organism).
+
+        Returns:
+            list: One organism per row, in row order.
+        """
+        return [view.to_organism() for view in self._views]
+
+    def compact(self):
+        """
+        Drops dead rows and packs the live ones at the front of the arrays.
+        The views of the live rows follow them; the views of the dropped rows
+        are detached into a store of their own, so they keep their values.
+
+        Returns:
+            numpy.ndarray: Old row index of every remaining row.
+        """
+        keep = np.flatnonzero(self.alive)
+        dropped = np.flatnonzero(~self.alive)
+        if dropped.size:
+            detached = PopulationArrays(capacity=dropped.size, species_names=self.species_names)
+            for name in self._COLUMNS:
+                detached.__dict__["_" + name][:dropped.size] = self.__dict__["_" + name][dropped]
+            detached.size = dropped.size
+            for new_row, old_row in enumerate(dropped.tolist()):
+                view = self._views[old_row]
+                view._store, view._row = detached, new_row
+                detached._views.append(view)
+        for name in self._COLUMNS:
+            column = self.__dict__["_" + name]
+            column[:keep.size] = column[keep]
+        self._views = [self._views[row] for row in keep.tolist()]
+        for row, view in enumerate(self._views):
+            view._row = row
+        self.size = keep.size
+        return keep
+
+    def random_move(self, grid_size, terrain=None, rng=None, tries=10):
+        """
+        Moves every live consumer like logic.behavior.random_move, as whole-array operations.
+
+        Each consumer draws a random offset within its speed (1 on hills) and
+        retries up to `tries` times while the target cell is blocked or water.
+        All consumers move at once, so the draws are not those of moving them
+        one after the other.
+
+        Args:
+            grid_size (int): Size of the simulation grid.
+            terrain (Terrain, optional): Terrain used for movement constraints.
+            rng (RandomSource, optional): Random source to draw from; a shared one if omitted.
+            tries (int, optional): Maximum attempts per consumer. Defaults to 10.
+        """
+        rng = get_rng(rng)
+        pending = np.flatnonzero(self.alive & (self.kind == CONSUMER))
+        if pending.size == 0:
+            return
+        blocked, hill = _terrain_grids(terrain, grid_size)
+        step_size = self.speed[pending].astype(np.int64)
+        if hill is not None:
+            step_size[hill[self.y[pending], self.x[pending]]] = 1
+
+        for _ in range(tries):
+            dx = rng.integers(-step_size, step_size + 1)
+            dy = rng.integers(-step_size, step_size + 1)
+            new_x = np.clip(self.x[pending] + dx, 0, grid_size - 1)
+            new_y = np.clip(self.y[pending] + dy, 0, grid_size - 1)
+            ok = ~blocked[new_y, new_x] if blocked is not None else np.ones(pending.size, dtype=bool)
+            moved = pending[ok]
+            self.x[moved] = new_x[ok]
+            self.y[moved] = new_y[ok]
+            pending = pending[~ok]
+            step_size = step_size[~ok]
+            if pending.size == 0:
+                break
+
+    def step(self, grid_size, terrain=None, rng=None):
+        """
+        Runs the movement, energy decay and death part of Consumer.step for the
+        whole population. Producers are left unchanged, as in Producer.step.
+
+        Args:
+            grid_size (int): Size of the simulation grid.
+            terrain (Terrain, optional): Terrain used for movement constraints.
+            rng (RandomSource, optional): Random source to draw from; a shared one if omitted.
+        """
+        self.random_move(grid_size, terrain, rng)
+        consumers = self.alive & (self.kind == CONSUMER)
+        self.energy[consumers] -= 1
+        self.alive[consumers & (self.energy <= 0)] = False
+
+
+def _terrain_grids(terrain, grid_size):
+    """
+    Returns (blocked, hill) boolean grids indexed [y, x] for a terrain, or (None, None).
+    Blocked cells are the ones random movement may not enter (trees and water).
+    """
+    if terrain is None:
+        return None, None
+    return ~terrain.passable, terrain.hill
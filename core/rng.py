@@ -0,0 +1,152 @@
+import numpy as np
+
+class RandomSource:
+    """
+    Random source of one simulation, backed by a ``numpy.random.Generator``.
+
+    Each call into a Generator costs a few microseconds whatever the number of
+    values drawn, which is far too much for the one-or-two scalar draws an
+    organism needs per step. Scalar draws (random, randint) are therefore
+    served from blocks of ``block_size`` uniform floats drawn in one call;
+    array draws go straight to ``generator``. All draws of a run come from the
+    same seeded stream, so equal seeds give equal runs. A RandomSource pickles
+    with its generator state and its unconsumed block, which checkpoints rely on.
+
+    Attributes:
+        generator (numpy.random.Generator): The underlying generator.
+        block_size (int): Number of floats drawn per refill.
+    """
+
+    def __init__(self, seed=None, block_size=4096):
+        """
+        Creates the source.
+
+        Args:
+            seed (int | numpy.random.SeedSequence | numpy.random.Generator, optional):
+                Seed or seed sequence of a new PCG64 generator, or an existing
+                Generator to wrap. None seeds from the operating system.
+            block_size (int, optional): Number of floats drawn per refill. Defaults to 4096.
+        """
+        if isinstance(seed, np.random.Generator):
+            self.generator = seed
+        else:
+            self.generator = np.random.Generator(np.random.PCG64(seed))
+        self.block_size = max(1, block_size)
+        self._block = []
+        self._pos = 0
+
+    def random(self):
+        """
+        Returns:
+            float: Uniform float in [0, 1).
+        """
+        if self._pos == len(self._block):
+            self._block = self.generator.random(self.block_size).tolist()
+            self._pos = 0
+        value = self._block[self._pos]
+        self._pos += 1
+        return value
+
+    def randint(self, low, high):
+        """
+        Returns a uniform integer in [low, high], both ends included (like random.randint).
+
+        Args:
+            low (int): Lowest value.
+            high (int): Highest value.
+
+        Returns:
+            int: The drawn integer.
+        """
+        return low + int(self.random() * (high - low + 1))
+
+    def integers(self, low, high=None, size=None, endpoint=False):
+        """
+        Array draw, see numpy.random.Generator.integers.
+        """
+        return self.generator.integers(low, high, size=size, endpoint=endpoint)
+
+    def choice(self, a, size=None, replace=True):
+        """
+        Array draw, see numpy.random.Generator.choice.
+        """
+        return self.generator.choice(a, size=size, replace=replace)
+
+# Shared source for callers that do not pass one (e.g. behaviours used on their own).
+_default = RandomSource()
+
+def make_rng(seed=None):
+    """
+    Creates the random source of a simulation.
+
+    Args:
+        seed (int | numpy.random.SeedSequence | numpy.random.Generator | RandomSource, optional):
+            Seed, seed sequence or generator of a new RandomSource. A RandomSource
+            is returned as is. None seeds from the operating system.
+
+    Returns:
+        RandomSource: The random source.
+    """
+    if isinstance(seed, RandomSource):
+        return seed
+    return RandomSource(seed)
+
+def get_rng(rng=None):
+    """
+    Returns the given random source, or the shared module-level one if None.
+
+    Args:
+        rng (RandomSource, optional): Random source to use.
+
+    Returns:
+        RandomSource: The random source to draw from.
+    """
+    return _default if rng is None else rng
+
+def spawn_seeds(seed, n):
+    """
+    Derives n statistically independent seed sequences from one master seed.
+
+    The children are cheap to pickle, so they are the preferred way to hand
+    streams to worker processes: ``make_rng(child)`` in every worker.
+
+    Args:
+        seed (int | numpy.random.SeedSequence): Master seed.
+        n (int): Number of streams.
+
+    Returns:
+        list: n numpy.random.SeedSequence objects.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
+def spawn_rngs(seed, n):
+    """
+    Creates n independent random sources from one master seed (see spawn_seeds).
+
+    Args:
+        seed (int | numpy.random.SeedSequence): Master seed.
+        n (int): Number of random sources.
+
+    Returns:
+        list: n RandomSource objects.
+    """
+    return [make_rng(child) for child in spawn_seeds(seed, n)]
+
+def jumped_rngs(seed, n):
+    """
+    Creates n non-overlapping random sources by jumping one PCG64 stream ahead.
+
+    Stream i starts i * 2**127 draws after the master stream, so the streams
+    cannot overlap within any practical run length.
+
+    Args:
+        seed (int): Master seed.
+        n (int): Number of random sources.
+
+    Returns:
+        list: n RandomSource objects.
+    """
+    base = np.random.PCG64(seed)
+    return [RandomSource(np.random.Generator(base.jumped(i))) for i in range(1, n + 1)]
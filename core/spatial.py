@@ -0,0 +1,217 @@
+from collections import defaultdict
+import numpy as np
+
+class SpatialIndex:
+    """
+    Cell-bucketed spatial index over the organisms of a simulation grid.
+
+    Every organism is stored in the bucket of the grid cell it occupies, so
+    neighbour queries only visit the cells around the query point instead of
+    scanning the whole population. A live-occupancy count grid is kept next to
+    the buckets and updated by moves, deaths and births, so "is this cell taken"
+    is a single array lookup.
+
+    The occupancy grid can be limited to a window of the grid (e.g. one tile of
+    a partitioned simulation plus its halo). Organisms outside the window are
+    still bucketed and found by neighbour queries, but their cells never count
+    as occupied.
+
+    Attributes:
+        grid_size (int): The size of the square simulation grid.
+        bounds (tuple): Window (x0, y0, x1, y1) covered by the occupancy grid, end exclusive.
+        buckets (defaultdict): Mapping of (x, y) cells to the organisms on them.
+        occupancy (numpy.ndarray): Number of live organisms per cell of the window,
+            indexed [y - y0, x - x0]; [y, x] for the default whole-grid window.
+    """
+
+    def __init__(self, grid_size, organisms=None, bounds=None):
+        """
+        Initializes an empty index, optionally filled with the given organisms.
+
+        Args:
+            grid_size (int): Size of the simulation grid.
+            organisms (list, optional): Organisms to insert right away.
+            bounds (tuple, optional): Occupancy window (x0, y0, x1, y1). Defaults to the whole grid.
+        """
+        self.grid_size = grid_size
+        self.bounds = tuple(bounds) if bounds is not None else (0, 0, grid_size, grid_size)
+        x0, y0, x1, y1 = self.bounds
+        self.buckets = defaultdict(list)
+        self.occupancy = np.zeros((y1 - y0, x1 - x0), dtype=np.int32)
+        self._cells = {}
+        if organisms:
+            self.rebuild(organisms)
+
+    def __getstate__(self):
+        """
+        Entries are keyed by organism id, which does not survive pickling, so
+        they are stored next to their organisms and re-keyed on unpickling.
+        """
+        state = self.__dict__.copy()
+        state["_cells"] = [(org, self._cells[id(org)]) for bucket in self.buckets.values() for org in bucket]
+        return state
+
+    def __setstate__(self, state):
+        state["_cells"] = {id(org): entry for org, entry in state["_cells"]}
+        self.__dict__.update(state)
+
+    def __len__(self):
+        """
+        Returns:
+            int: Number of organisms stored in the index.
+        """
+        return len(self._cells)
+
+    def __contains__(self, org):
+        """
+        Returns:
+            bool: True if the organism is stored in the index.
+        """
+        return id(org) in self._cells
+
+    def rebuild(self, organisms):
+        """
+        Discards the current content and indexes the given organisms.
+
+        Args:
+            organisms (list): Organisms to index.
+        """
+        self.buckets.clear()
+        self.occupancy.fill(0)
+        self._cells.clear()
+        for org in organisms:
+            self.insert(org)
+
+    def sync(self, organisms):
+        """
+        Re-indexes every given organism, picking up moves and deaths that
+        happened without the index being told.
+
+        Args:
+            organisms (list): Organisms to re-index.
+        """
+        for org in organisms:
+            self.update(org)
+
+    def insert(self, org):
+        """
+        Adds an organism to the bucket of its current cell.
+
+        Args:
+            org (Organism): The organism to add.
+        """
+        alive = bool(org.alive)
+        self._cells[id(org)] = (org.x, org.y, alive)
+        self.buckets[(org.x, org.y)].append(org)
+        if alive:
+            self._count(org.x, org.y, 1)
+
+    def remove(self, org):
+        """
+        Removes an organism from the index. Unknown organisms are ignored.
+
+        Args:
+            org (Organism): The organism to remove.
+        """
+        entry = self._cells.pop(id(org), None)
+        if entry is None:
+            return
+        x, y, alive = entry
+        bucket = self.buckets[(x, y)]
+        bucket.remove(org)
+        if not bucket:
+            del self.buckets[(x, y)]
+        if alive:
+            self._count(x, y, -1)
+
+    def update(self, org):
+        """
+        Re-indexes an organism if it has moved or died since it was last indexed.
+        Organisms that are not in the index are ignored.
+
+        Args:
+            org (Organism): The organism to re-index.
+        """
+        entry = self._cells.get(id(org))
+        if entry is None:
+            return
+        x, y, alive = entry
+        if (x, y) != (org.x, org.y):
+            self.remove(org)
+            self.insert(org)
+        elif alive != bool(org.alive):
+            self._cells[id(org)] = (x, y, not alive)
+            self._count(x, y, -1 if alive else 1)
+
+    def _count(self, x, y, delta):
+        """
+        Adds delta to the occupancy of a cell if it lies inside the window.
+        """
+        x0, y0, x1, y1 = self.bounds
+        if x0 <= x < x1 and y0 <= y < y1:
+            self.occupancy[y - y0, x - x0] += delta
+
+    def is_occupied(self, x, y):
+        """
+        Checks whether a live organism stands on a cell.
+
+        Args:
+            x (int): X-coordinate.
+            y (int): Y-coordinate.
+
+        Returns:
+            bool: True if at least one live organism is on the cell (always False
+            outside the occupancy window).
+        """
+        x0, y0, x1, y1 = self.bounds
+        return x0 <= x < x1 and y0 <= y < y1 and bool(self.occupancy[y - y0, x - x0])
+
+    def at(self, x, y, alive_only=True):
+        """
+        Returns the organisms on a single cell.
+
+        Args:
+            x (int): X-coordinate.
+            y (int): Y-coordinate.
+            alive_only (bool, optional): Skip dead organisms. Defaults to True.
+
+        Returns:
+            list: Organisms on the cell.
+        """
+        bucket = self.buckets.get((x, y), ())
+        if alive_only:
+            return [o for o in bucket if o.alive]
+        return list(bucket)
+
+    def within(self, x, y, radius, alive_only=True):
+        """
+        Returns the organisms within a Manhattan radius of a cell.
+
+        Only the buckets of the diamond around (x, y) are visited, so the cost
+        depends on the local density rather than on the population size.
+
+        Args:
+            x (int): X-coordinate of the centre.
+            y (int): Y-coordinate of the centre.
+            radius (int): Maximum Manhattan distance (inclusive).
+            alive_only (bool, optional): Skip dead organisms. Defaults to True.
+
+        Returns:
+            list: Organisms within the radius, including any on (x, y) itself.
+        """
+        found = []
+        buckets = self.buckets
+        for dx in range(-radius, radius + 1):
+            cx = x + dx
+            if cx < 0 or cx >= self.grid_size:
+                continue
+            reach = radius - abs(dx)
+            for cy in range(max(0, y - reach), min(self.grid_size - 1, y + reach) + 1):
+                bucket = buckets.get((cx, cy))
+                if not bucket:
+                    continue
+                if alive_only:
+                    found.extend(o for o in bucket if o.alive)
+                else:
+                    found.extend(bucket)
+        return found
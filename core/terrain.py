@@ -1,29 +1,96 @@
 import json
-import random
-from collections import defaultdict
+from collections import defaultdict, Counter
+import numpy as np
+from core.rng import get_rng
+
+TERRAIN_TYPES = ["plain", "water", "tree", "hill", "shelter"]
+PLAIN, WATER, TREE, HILL, SHELTER = range(len(TERRAIN_TYPES))
 
 class Terrain:
     """
     Represents the terrain grid used in the ecosystem simulation, including terrain types and their effects.
 
+    The layout is stored as a ``uint8`` type grid indexed ``[y, x]`` (like the heatmaps),
+    together with precomputed boolean masks. The masks can be used for scalar lookups
+    (``terrain.water[y, x]``) as well as for fancy-indexed lookups over coordinate arrays
+    (``terrain.passable[ys, xs]``).
+
     Attributes:
         grid_size (int): The size of the square simulation grid.
-        map (defaultdict): A mapping of (x, y) positions to terrain types.
-        shelter_occupants (dict): Tracks the occupancy of shelters by organisms.
-        water_counters (defaultdict): Tracks energy boosts from water for individual organisms.
+        types (list): Terrain type name for every type code in the grid.
+        grid (numpy.ndarray): Terrain type code of every cell.
+        passable (numpy.ndarray): Cells that organisms may move onto (no tree, no water).
+        blocked (numpy.ndarray): Cells blocked by a tree.
+        water (numpy.ndarray): Water cells.
+        shelter (numpy.ndarray): Shelter cells.
+        hill (numpy.ndarray): Hill cells.
+        shelters (list): Shelter cells as (x, y), in the order they were placed (cells
+            that became shelters by writing to ``grid`` follow in row-major order).
+        shelter_occupants (dict): Tracks the occupancy of shelters by organisms, keyed by organism uid.
+        water_counters (defaultdict): Tracks energy boosts from water for individual organisms,
+            as a Counter of organism uids per water cell.
+        rng (RandomSource): Random source for generation and ejections, or None for
+            the shared default one. The engine sets it to its own random source.
     """
 
-    def __init__(self, grid_size):
+    def __init__(self, grid_size, rng=None):
         """
         Initializes the terrain grid with default terrain type "plain".
 
         Args:
             grid_size (int): Size of the simulation grid.
+            rng (RandomSource, optional): Random source to draw from.
         """
         self.grid_size = grid_size
-        self.map = defaultdict(lambda: "plain")
+        self.rng = rng
+        self.types = list(TERRAIN_TYPES)
+        self.grid = np.full((grid_size, grid_size), PLAIN, dtype=np.uint8)
+        self.shelters = []
+        self.refresh_masks()
         self.shelter_occupants = {}
-        self.water_counters = defaultdict(lambda: defaultdict(int))
+        self.water_counters = defaultdict(Counter)
+
+    def refresh_masks(self):
+        """
+        Recomputes the boolean masks from the type grid. Must be called after
+        writing to ``grid`` directly.
+        """
+        self.water = self.grid == WATER
+        self.blocked = self.grid == TREE
+        self.shelter = self.grid == SHELTER
+        self.hill = self.grid == HILL
+        self.passable = ~(self.water | self.blocked)
+        shelters = dict.fromkeys(pos for pos in self.shelters if self.shelter[pos[1], pos[0]])
+        ys, xs = np.nonzero(self.shelter)
+        if len(xs) != len(shelters):
+            shelters.update(dict.fromkeys(zip(xs.tolist(), ys.tolist())))
+        self.shelters = list(shelters)
+
+    def type_code(self, terrain_type):
+        """
+        Returns the grid code of a terrain type, registering unknown types.
+
+        Args:
+            terrain_type (str): Terrain type name.
+
+        Returns:
+            int: Code stored in the type grid.
+        """
+        if terrain_type not in self.types:
+            self.types.append(terrain_type)
+        return self.types.index(terrain_type)
+
+    @property
+    def map(self):
+        """
+        Mapping of (x, y) positions to terrain types for all non-plain cells.
+        Built on demand from the type grid; kept for compatibility.
+
+        Returns:
+            dict: Terrain type name for every non-plain cell.
+        """
+        ys, xs = np.nonzero(self.grid != PLAIN)
+        return {(int(x), int(y)): self.types[self.grid[y, x]] for x, y in zip(xs, ys)}
 
     def load_from_config(self, config_path):
         """
@@ -43,18 +110,16 @@ class Terrain:
             self.generate_shelters()
         elif mode == "manual":
             for obj in data.get("terrain_objects", []):
-                ttype = obj["type"]
+                code = self.type_code(obj["type"])
                 x0 = obj["x"]
                 y0 = obj["y"]
-                width = obj.get("width", 1)
-                height = obj.get("height", 1)
-
-                for dx in range(width):
-                    for dy in range(height):
-                        x = x0 + dx
-                        y = y0 + dy
-                        if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
-                            self.map[(x, y)] = ttype
+                x1 = x0 + obj.get("width", 1)
+                y1 = y0 + obj.get("height", 1)
+                self.grid[max(0, y0):max(0, y1), max(0, x0):max(0, x1)] = code
+                if code == SHELTER:
+                    self.shelters.extend((x, y) for x in range(max(0, x0), min(x1, self.grid_size))
+                                         for y in range(max(0, y0), min(y1, self.grid_size)))
+            self.refresh_masks()
 
     def _place_random(self, terrain_type):
         """
@@ -63,29 +128,41 @@ class Terrain:
         Args:
             terrain_type (str): The type of terrain to place (e.g., 'tree', 'shelter').
         """
+        code = self.type_code(terrain_type)
+        rng = get_rng(self.rng)
         tries = 0
         while tries < 100:
-            x = random.randint(0, self.grid_size - 1)
-            y = random.randint(0, self.grid_size - 1)
-            if self.map[(x, y)] == "plain":
-                self.map[(x, y)] = terrain_type
+            x = rng.randint(0, self.grid_size - 1)
+            y = rng.randint(0, self.grid_size - 1)
+            if self.grid[y, x] == PLAIN:
+                self.grid[y, x] = code
+                if code == SHELTER:
+                    self.shelters.append((x, y))
                 return
             tries += 1
 
+    def _place_patches(self, terrain_type, patches):
+        """
+        Fills 5x5 patches around random centres with a terrain type, on plain tiles only.
+
+        Args:
+            terrain_type (str): The type of terrain to place (e.g., 'water', 'hill').
+            patches (int): Number of patches to generate.
+        """
+        code = self.type_code(terrain_type)
+        rng = get_rng(self.rng)
+        for _ in range(patches):
+            cx = rng.randint(2, self.grid_size - 3)
+            cy = rng.randint(2, self.grid_size - 3)
+            region = self.grid[max(0, cy - 2):cy + 3, max(0, cx - 2):cx + 3]
+            region[region == PLAIN] = code
+        self.refresh_masks()
+
     def generate_water(self):
         """
         Generates water patches randomly across the terrain.
         """
-        patches = max(1, round(self.grid_size / 7))
-        for _ in range(patches):
-            cx = random.randint(2, self.grid_size - 3)
-            cy = random.randint(2, self.grid_size - 3)
-            for dx in range(-2, 3):
-                for dy in range(-2, 3):
-                    x, y = cx + dx, cy + dy
-                    if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
-                        if self.map[(x, y)] == "plain":
-                            self.map[(x, y)] = "water"
+        self._place_patches("water", max(1, round(self.grid_size / 7)))
 
     def generate_trees(self):
         """
@@ -93,21 +170,13 @@ class Terrain:
         """
         for _ in range(self.grid_size - 7):
             self._place_random("tree")
+        self.refresh_masks()
 
     def generate_hills(self):
         """
         Generates small clusters of 'hill' terrain types.
         """
-        patches = round(self.grid_size / 6)
-        for _ in range(patches):
-            cx = random.randint(2, self.grid_size - 3)
-            cy = random.randint(2, self.grid_size - 3)
-            for dx in range(-2, 3):
-                for dy in range(-2, 3):
-                    x, y = cx + dx, cy + dy
-                    if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
-                        if self.map[(x, y)] == "plain":
-                            self.map[(x, y)] = "hill"
+        self._place_patches("hill", round(self.grid_size / 6))
 
     def generate_shelters(self):
         """
@@ -116,6 +185,10 @@ class Terrain:
         for _ in range(max(1, round(self.grid_size / 10))):
             for _ in range(4):
                 self._place_random("shelter")
+        self.refresh_masks()
+
+    def _in_bounds(self, x, y):
+        return 0 <= x < self.grid_size and 0 <= y < self.grid_size
 
     def get_type(self, x, y):
         """
@@ -128,7 +201,9 @@ class Terrain:
         Returns:
             str: Terrain type at the specified location.
         """
-        return self.map.get((x, y), "plain")
+        if not self._in_bounds(x, y):
+            return "plain"
+        return self.types[self.grid[y, x]]
 
     def is_blocked(self, x, y):
         """
@@ -141,7 +216,7 @@ class Terrain:
         Returns:
             bool: True if tile contains a tree.
         """
-        return self.map.get((x, y)) == "tree"
+        return self._in_bounds(x, y) and bool(self.blocked[y, x])
 
     def is_shelter(self, x, y):
         """
@@ -154,7 +229,7 @@ class Terrain:
         Returns:
             bool: True if tile is a shelter.
         """
-        return self.map.get((x, y)) == "shelter"
+        return self._in_bounds(x, y) and bool(self.shelter[y, x])
 
     def is_in_shelter(self, x, y):
         """
@@ -176,7 +251,7 @@ class Terrain:
         Returns:
             bool: True if tile is a hill.
         """
-        return self.map.get((x, y)) == "hill"
+        return self._in_bounds(x, y) and bool(self.hill[y, x])
 
     def is_water(self, x, y):
         """
@@ -189,7 +264,7 @@ class Terrain:
         Returns:
             bool: True if tile is water.
         """
-        return self.map.get((x, y)) == "water"
+        return self._in_bounds(x, y) and bool(self.water[y, x])
 
     def apply_terrain_effects(self, org, step_counter):
         """
@@ -201,6 +276,8 @@ class Terrain:
         """
         if step_counter % 10 != 0 or not org.alive or hasattr(org, "is_edible"):
             return
+        if not self.water[max(0, org.y - 1):org.y + 2, max(0, org.x - 1):org.x + 2].any():
+            return
         adjacent = [(org.x + dx, org.y + dy)
                     for dx in [-1, 0, 1]
                     for dy in [-1, 0, 1]
@@ -209,46 +286,59 @@ class Terrain:
                     and 0 <= org.y + dy < self.grid_size]
         for pos in adjacent:
             if self.is_water(*pos):
-                counter = self.water_counters[pos][id(org)]
+                counter = self.water_counters[pos][org.uid]
                 if counter < 2:
                     org.energy = min(org.max_energy, org.energy + 5)
-                    self.water_counters[pos][id(org)] += 1
+                    self.water_counters[pos][org.uid] += 1
                     break
 
-    def update_shelters(self, organisms):
+    def update_shelters(self, organisms, index=None):
         """
         Updates organism interactions with shelter tiles. Carnivores are pushed out,
         while herbivores gain temporary protection or die if they stay too long.
 
         Args:
             organisms (list): List of organisms to update.
+            index (SpatialIndex, optional): Spatial index to keep in sync with ejections and deaths.
+
+        Returns:
+            int: Number of carnivores ejected from a shelter.
         """
+        ejected = 0
         for org in organisms:
             pos = (org.x, org.y)
+            in_shelter = self.is_shelter(org.x, org.y)
 
-            if self.is_shelter(org.x, org.y) and getattr(org, "trophic_level", None) != "primary":
+            if in_shelter and getattr(org, "trophic_level", None) != "primary":
                 # Carnivores get ejected from shelters
+                rng = get_rng(self.rng)
                 for _ in range(20):
-                    new_x = random.randint(0, self.grid_size - 1)
-                    new_y = random.randint(0, self.grid_size - 1)
-                    if not self.is_shelter(new_x, new_y) and not self.is_blocked(new_x, new_y):
+                    new_x = rng.randint(0, self.grid_size - 1)
+                    new_y = rng.randint(0, self.grid_size - 1)
+                    if not self.shelter[new_y, new_x] and not self.blocked[new_y, new_x]:
                         org.x = new_x
                         org.y = new_y
+                        if index is not None:
+                            index.update(org)
+                        ejected += 1
                         break
                 continue  
 
-            if self.is_shelter(org.x, org.y) and getattr(org, "trophic_level", None) == "primary":
+            if in_shelter and getattr(org, "trophic_level", None) == "primary":
                 # Herbivores in shelter
                 if pos not in self.shelter_occupants:
                     self.shelter_occupants[pos] = {}
-                count = self.shelter_occupants[pos].get(id(org), 0) + 1
-                self.shelter_occupants[pos][id(org)] = count
+                count = self.shelter_occupants[pos].get(org.uid, 0) + 1
+                self.shelter_occupants[pos][org.uid] = count
                 if count > 3:
-                    org.alive = False  
+                    org.alive = False
+                    if index is not None:
+                        index.update(org)
             else:
                 # Clear shelter counter if not in shelter
                 for data in self.shelter_occupants.values():
-                    data.pop(id(org), None)
+                    data.pop(org.uid, None)
+        return ejected
 
     def can_enter_shelter(self, org):
         """
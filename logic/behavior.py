@@ -1,5 +1,11 @@
-import random
 import math
+from core.rng import get_rng
+
+# Manhattan radius within which animals notice prey and predators.
+PERCEPTION_RADIUS = 3
+
+# Energy a predator gains from eating one prey.
+MEAL_ENERGY = 20
 
 def distance(a, b):
     """
@@ -14,7 +20,7 @@ def distance(a, b):
     """
     return abs(a.x - b.x) + abs(a.y - b.y)
 
-def random_move(animal, grid_size, terrain=None):
+def random_move(animal, grid_size, terrain=None, rng=None):
     """
     Move the animal to a random adjacent cell based on its speed.
 
@@ -22,17 +28,19 @@ def random_move(animal, grid_size, terrain=None):
     animal (Animal): The animal object to move.
     grid_size (int): The size of the simulation grid.
     terrain (Terrain, optional): Terrain object for checking movement constraints.
+    rng (RandomSource, optional): Random source; a shared one if omitted.
     """
     if not animal.alive:
         return
     step_size = animal.speed
-    if terrain and terrain.get_type(animal.x, animal.y) == "hill":
+    if terrain and terrain.is_hill(animal.x, animal.y):
         step_size = 1
 
+    rng = get_rng(rng)
     tries = 0
     while tries < 10:
-        dx = random.randint(-step_size, step_size)
-        dy = random.randint(-step_size, step_size)
+        dx = rng.randint(-step_size, step_size)
+        dy = rng.randint(-step_size, step_size)
         new_x = max(0, min(animal.x + dx, grid_size - 1))
         new_y = max(0, min(animal.y + dy, grid_size - 1))
         if terrain and (terrain.is_blocked(new_x, new_y) or terrain.is_water(new_x, new_y)):
@@ -42,7 +50,7 @@ def random_move(animal, grid_size, terrain=None):
         animal.y = new_y
         break
 
-def chase(animal, others, foodweb, radius=3, terrain=None):
+def chase(animal, others, foodweb, radius=PERCEPTION_RADIUS, terrain=None, index=None, grid_size=20):
     """
     Chase the nearest prey within a radius if the animal has low energy.
 
@@ -52,31 +60,39 @@ def chase(animal, others, foodweb, radius=3, terrain=None):
     foodweb (FoodWeb): Object representing predator-prey relationships.
     radius (int, optional): Distance within which prey can be chased. Defaults to 3.
     terrain (Terrain, optional): Terrain object to validate movement.
+    index (SpatialIndex, optional): Spatial index used instead of scanning `others`.
+    grid_size (int, optional): Size of the simulation grid. Defaults to 20.
     """
     if not animal.alive or animal.energy > 40:
         return
+    prey_species = foodweb.prey_set(animal.species)
+    if not prey_species:
+        return
 
+    if index is not None:
+        others = index.within(animal.x, animal.y, radius)
     prey_candidates = [
         other for other in others
-        if foodweb.is_prey(animal.species, other.species)
+        if other.species in prey_species
         and other.alive and other != animal
         and distance(animal, other) <= radius
         and not (terrain and terrain.is_shelter(other.x, other.y))
     ]
 
     if prey_candidates:
-        target = min(prey_candidates, key=lambda o: distance(animal, o))
+        # Ties are broken by uid so the choice does not depend on the candidate order.
+        target = min(prey_candidates, key=lambda o: (distance(animal, o), o.uid))
         dx = int(math.copysign(1, target.x - animal.x)) if target.x != animal.x else 0
         dy = int(math.copysign(1, target.y - animal.y)) if target.y != animal.y else 0
-        new_x = max(0, min(animal.x + dx, 19))
-        new_y = max(0, min(animal.y + dy, 19))
+        new_x = max(0, min(animal.x + dx, grid_size - 1))
+        new_y = max(0, min(animal.y + dy, grid_size - 1))
         if terrain and (terrain.is_blocked(new_x, new_y) or terrain.is_water(new_x, new_y)):
             return
         animal.x = new_x
         animal.y = new_y
         animal.energy -= 1
 
-def flee(animal, others, foodweb, terrain=None):
+def flee(animal, others, foodweb, terrain=None, index=None, grid_size=20):
     """
     Move the animal away from nearby predators.
 
@@ -85,12 +101,19 @@ def flee(animal, others, foodweb, terrain=None):
     others (list): List of other Animal objects in the grid.
     foodweb (FoodWeb): Object representing predator-prey relationships.
     terrain (Terrain, optional): Terrain object to validate movement.
+    index (SpatialIndex, optional): Spatial index used instead of scanning `others`.
+    grid_size (int, optional): Size of the simulation grid. Defaults to 20.
     """
+    predator_species = foodweb.predator_set(animal.species)
+    if not predator_species:
+        return
+    if index is not None:
+        others = index.within(animal.x, animal.y, PERCEPTION_RADIUS)
     predators = [
         other for other in others
-        if foodweb.is_prey(other.species, animal.species)
+        if other.species in predator_species
         and other.alive and other != animal
-        and distance(animal, other) <= 3
+        and distance(animal, other) <= PERCEPTION_RADIUS
     ]
     if not predators:
         return
@@ -99,14 +122,14 @@ def flee(animal, others, foodweb, terrain=None):
     avg_y = sum(p.y for p in predators) / len(predators)
     dx = -1 if animal.x > avg_x else 1 if animal.x < avg_x else 0
     dy = -1 if animal.y > avg_y else 1 if animal.y < avg_y else 0
-    new_x = max(0, min(animal.x + dx, 19))
-    new_y = max(0, min(animal.y + dy, 19))
+    new_x = max(0, min(animal.x + dx, grid_size - 1))
+    new_y = max(0, min(animal.y + dy, grid_size - 1))
     if terrain and (terrain.is_blocked(new_x, new_y) or terrain.is_water(new_x, new_y)):
         return
     animal.x = new_x
     animal.y = new_y
 
-def eat_if_possible(predator, others, foodweb):
+def eat_if_possible(predator, others, foodweb, index=None):
     """
     Make the predator eat a prey at the same location if possible.
 
@@ -114,9 +137,25 @@ def eat_if_possible(predator, others, foodweb):
     predator (Animal): The predator animal.
     others (list): List of other Animal objects.
     foodweb (FoodWeb): Object representing predator-prey relationships.
+    index (SpatialIndex, optional): Spatial index used instead of scanning `others`.
+
+    Returns:
+    list: (prey, energy gained) for every prey eaten; the gain is less than
+    MEAL_ENERGY when the predator's energy was capped at max_energy.
     """
+    meals = []
+    prey_species = foodweb.prey_set(predator.species)
+    if not prey_species:
+        return meals
+    if index is not None:
+        others = index.at(predator.x, predator.y)
     for prey in others:
         if prey.alive and prey.x == predator.x and prey.y == predator.y:
-            if foodweb.is_prey(predator.species, prey.species):
+            if prey.species in prey_species:
                 prey.alive = False
-                predator.energy = min(predator.max_energy, predator.energy + 20)
+                if index is not None:
+                    index.update(prey)
+                energy = predator.energy
+                predator.energy = min(predator.max_energy, energy + MEAL_ENERGY)
+                meals.append((prey, predator.energy - energy))
+    return meals
@@ -1,6 +1,7 @@
 from collections import defaultdict, Counter
 from core.organism import Producer, Consumer
-import random
+from core.rng import get_rng
+import numpy as np
 
 REPRO_COOLDOWN_BY_LEVEL = {
     "primary": 2,
@@ -18,12 +19,172 @@ REPRO_ENERGY_THRESHOLD_BY_LEVEL = {
     "unknown": 80
 }
 
+# Spreading directions of producers.
+SPREAD_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+# Cell offsets at Manhattan distance exactly 2, used for proximity mating.
+PAIRING_OFFSETS = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if abs(dx) + abs(dy) == 2]
+
 REPRO_RATIOS = {
     "Rabbit": 2,   # 1 Rabbit -> 2 Carrot
     "Fox": 1       # 1 Fox -> 1 Rabbit
 }
 
-def reproduce(organisms, grid_size, step_counter):
+class ReproductionContext:
+    """
+    State and settings of reproduce(), owned by the caller (a SimulationEngine
+    or a partition tile) and passed to every call.
+
+    Attributes:
+    foodweb (FoodWeb): Food web giving prey counts and trophic levels, or None.
+    terrain (Terrain): Terrain limiting the birth cells, or None.
+    index (SpatialIndex): Occupancy used for spawn checks; without one the organisms are scanned.
+    rng (RandomSource): Random source; the shared default one if None.
+    thresholds (dict): Reproduction energy threshold per trophic level.
+    cooldowns (dict): Reproduction cooldown per trophic level.
+    last_repro (dict): Step of the last birth per (species, cell); updated in place.
+    last_primary_respawn (dict): Step of the last primary fallback per species; updated in place.
+    region (tuple): (x0, y0, x1, y1) births are restricted to, or None for the whole grid.
+    live_counts (dict): Live counts per species replacing those taken from the organisms.
+    pairings (list): If a list, every proximity pairing appends
+        (parent, partner, child, previous cooldown entry) to it.
+    births (Counter): Births per path ("producer_spread", "producer_respawn",
+        "same_cell", "pairing", "primary_fallback"), summed over all calls.
+    uids (iterator): Uids of the new organisms, or None for the process-wide sequence.
+    """
+
+    def __init__(self, foodweb=None, terrain=None, index=None, rng=None, thresholds=None, cooldowns=None,
+                 region=None, uids=None):
+        """
+        Parameters:
+        foodweb (FoodWeb): Food web, or None.
+        terrain (Terrain): Terrain, or None.
+        index (SpatialIndex): Spatial index of the organisms, or None.
+        rng (RandomSource): Random source, or None for the shared default one.
+        thresholds (dict): Energy thresholds; defaults to REPRO_ENERGY_THRESHOLD_BY_LEVEL.
+        cooldowns (dict): Cooldowns; defaults to REPRO_COOLDOWN_BY_LEVEL.
+        region (tuple): Region births are restricted to, or None.
+        uids (iterator): Uid allocator of the new organisms, or None.
+        """
+        self.foodweb = foodweb
+        self.terrain = terrain
+        self.index = index
+        self.rng = rng
+        self.thresholds = REPRO_ENERGY_THRESHOLD_BY_LEVEL if thresholds is None else thresholds
+        self.cooldowns = REPRO_COOLDOWN_BY_LEVEL if cooldowns is None else cooldowns
+        self.last_repro = {}
+        self.last_primary_respawn = {}
+        self.region = region
+        self.live_counts = None
+        self.pairings = None
+        self.births = Counter()
+        self.uids = uids
+
+    def next_uid(self):
+        """
+        Returns:
+        int: The uid of the next new organism, or None to let Organism draw it.
+        """
+        return None if self.uids is None else next(self.uids)
+
+def _is_occupied(context, organisms, x, y):
+    """
+    Check whether a live organism stands on a cell, using the context's
+    spatial index occupancy grid when available.
+
+    Parameters:
+    context (ReproductionContext): Context holding the index.
+    organisms (list): List of organism objects, scanned only without an index.
+    x (int): X-coordinate.
+    y (int): Y-coordinate.
+
+    Returns:
+    bool: True if the cell is occupied by a live organism.
+    """
+    if context.index is not None:
+        return context.index.is_occupied(x, y)
+    return any(o.x == x and o.y == y and o.alive for o in organisms)
+
+def _in_region(region, x, y):
+    """
+    Check whether a cell lies in the region reproduce() is restricted to.
+
+    Parameters:
+    region (tuple): (x0, y0, x1, y1) with exclusive ends, or None for the whole grid.
+    x (int): X-coordinate.
+    y (int): Y-coordinate.
+
+    Returns:
+    bool: True if the cell is inside the region.
+    """
+    return region is None or (region[0] <= x < region[2] and region[1] <= y < region[3])
+
+def producer_respawn_cells(producer_species, grid_size, rng):
+    """
+    Draw the cells tried when producers are respawned after all of them died:
+    three random cells per producer species.
+
+    Parameters:
+    producer_species (list): Producer species names.
+    grid_size (int): Size of the simulation grid.
+    rng (RandomSource): Random source.
+
+    Returns:
+    list: (species, x, y) tuples.
+    """
+    cells = []
+    for species in producer_species:
+        for _ in range(3):
+            new_x = rng.randint(0, grid_size - 1)
+            new_y = rng.randint(0, grid_size - 1)
+            cells.append((species, new_x, new_y))
+    return cells
+
+def respawn_producers(context, organisms, cells):
+    """
+    Create producers on those of the given cells that are neither occupied nor blocked.
+
+    Parameters:
+    context (ReproductionContext): Context holding the index and the terrain.
+    organisms (list): List of organism objects, scanned only without an index.
+    cells (list): (species, x, y) tuples as drawn by producer_respawn_cells.
+
+    Returns:
+    list: The new producers.
+    """
+    terrain = context.terrain
+    return [Producer(species, x, y, uid=context.next_uid()) for species, x, y in cells
+            if not _is_occupied(context, organisms, x, y)
+            and not (terrain is not None and terrain.is_blocked(x, y))]
+
+def primary_fallback_cells(live_counts, step_counter, foodweb, terrain, last_respawn):
+    """
+    Find the primary consumer species down to a single live organism that get
+    a new member in the first shelter placed (see Terrain.shelters), at most
+    every second step per species.
+
+    Parameters:
+    live_counts (dict): Live organisms per species.
+    step_counter (int): Current simulation step.
+    foodweb (FoodWeb): Food web giving the trophic levels.
+    terrain (Terrain): Terrain holding the shelters, or None.
+    last_respawn (dict): Step of the last fallback per species; updated in place.
+
+    Returns:
+    list: (species, x, y) tuples of the consumers to create.
+    """
+    cells = []
+    for species, count in live_counts.items():
+        if count == 1 and foodweb.get_trophic_level(species) == "primary":
+            last = last_respawn.get(species, -999)
+            if step_counter - last >= 2:
+                if terrain is not None and terrain.shelters:
+                    x, y = terrain.shelters[0]
+                    cells.append((species, x, y))
+                    last_respawn[species] = step_counter
+    return cells
+
+def reproduce(organisms, grid_size, step_counter, context=None):
     """
     Handles the reproduction logic for organisms in the simulation.
 
@@ -34,10 +195,37 @@ def reproduce(organisms, grid_size, step_counter):
     organisms (list): List of organism objects (Producers or Consumers).
     grid_size (int): Size of the simulation grid.
     step_counter (int): Current simulation step used for cooldown and timing logic.
+    context (ReproductionContext): Food web, terrain, random source, thresholds
+        and cooldown tables of the simulation. Without one a fresh default
+        context is used, so no cooldown carries over between calls.
+
+    Births are counted per path in ``context.births``.
+
+    A partitioned simulation (see simulation.partition) calls reproduce() per
+    tile, with the tile's organisms and the halo organisms around it:
+
+    - ``context.region`` (x0, y0, x1, y1) restricts births to the tile: only
+      producers inside it spread, and only same-cell groups and pairs whose
+      birth cell lies inside it reproduce. Halo organisms only take part as
+      partners. The world-wide producer respawn and the last-primary fallback
+      are left to the caller (see producer_respawn_cells, primary_fallback_cells).
+    - ``context.live_counts`` replaces the live counts taken from
+      ``organisms`` by world-wide ones.
+    - ``context.pairings`` records the proximity pairings if it is a list.
 
     Returns:
     list: List of newly spawned organism objects.
     """
+    if context is None:
+        context = ReproductionContext()
+    rng = get_rng(context.rng)
+    fw = context.foodweb
+    terrain = context.terrain
+    thresholds = context.thresholds
+    cooldowns = context.cooldowns
+    last_repro = context.last_repro
+    region = context.region
+    births = context.births
     new_organisms = []
     species_by_pos = defaultdict(list)
 
@@ -45,48 +233,58 @@ def reproduce(organisms, grid_size, step_counter):
         if org.alive:
             species_by_pos[(org.x, org.y)].append(org)
 
-    live_counts = Counter([o.species for o in organisms if o.alive])
+    if context.live_counts is not None:
+        live_counts = Counter(context.live_counts)
+    else:
+        live_counts = Counter([o.species for o in organisms if o.alive])
     food_sources = defaultdict(int)
 
-    if hasattr(reproduce, "_foodweb") and reproduce._foodweb:
-        fw = reproduce._foodweb
+    if fw:
+        counts = np.zeros(len(fw.species_names), dtype=np.int64)
+        for species, count in live_counts.items():
+            counts[fw.species_id(species)] = count
+        prey_totals = fw.predation_matrix @ counts
         for species in live_counts:
-            prey_species = fw.get_prey(species)
-            total_prey = sum(live_counts[prey] for prey in prey_species)
-            food_sources[species] = total_prey
+            food_sources[species] = int(prey_totals[fw.species_id(species)])
 
     # --- Producer Respawn ---
     if step_counter % 30 == 0:
-        producer_species = set(o.species for o in organisms if isinstance(o, Producer))
-        producers_alive = any(isinstance(o, Producer) and o.alive for o in organisms)
+        if fw:
+            producer_species = [s for s in fw.all_species() if fw.get_type(s) == "Producer"]
+        else:
+            producer_species = set(o.species for o in organisms if isinstance(o, Producer))
+        if context.live_counts is not None:
+            producers_alive = any(live_counts[s] for s in producer_species)
+        else:
+            producers_alive = any(isinstance(o, Producer) and o.alive for o in organisms)
 
         if not producers_alive:
-            for species in producer_species:
-                for _ in range(3):
-                    new_x = random.randint(0, grid_size - 1)
-                    new_y = random.randint(0, grid_size - 1)
-                    if any(o.x == new_x and o.y == new_y and o.alive for o in organisms):
-                        continue
-                    if hasattr(reproduce, "_terrain") and reproduce._terrain.is_blocked(new_x, new_y):
-                        continue
-                    new_organisms.append(Producer(species, new_x, new_y))
+            if region is None:
+                respawned = respawn_producers(context, organisms,
+                                              producer_respawn_cells(producer_species, grid_size, rng))
+                new_organisms.extend(respawned)
+                births["producer_respawn"] += len(respawned)
         else:
             for org in organisms:
-                if isinstance(org, Producer) and org.alive:
-                    dx, dy = random.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
-                    new_x = min(grid_size - 1, max(0, org.x + dx))
-                    new_y = min(grid_size - 1, max(0, org.y + dy))
-                    if any(o.x == new_x and o.y == new_y and o.alive for o in organisms):
-                        continue
-                    if hasattr(reproduce, "_terrain") and (
-                        reproduce._terrain.is_blocked(new_x, new_y)
-                        or reproduce._terrain.is_water(new_x, new_y)
-                        or reproduce._terrain.is_shelter(new_x, new_y)):
-                        continue
-                    new_organisms.append(Producer(org.species, new_x, new_y))
+                if not (isinstance(org, Producer) and org.alive) or not _in_region(region, org.x, org.y):
+                    continue
+                dx, dy = SPREAD_DIRECTIONS[rng.randint(0, len(SPREAD_DIRECTIONS) - 1)]
+                new_x = min(grid_size - 1, max(0, org.x + dx))
+                new_y = min(grid_size - 1, max(0, org.y + dy))
+                if _is_occupied(context, organisms, new_x, new_y):
+                    continue
+                if terrain is not None and (
+                    terrain.is_blocked(new_x, new_y)
+                    or terrain.is_water(new_x, new_y)
+                    or terrain.is_shelter(new_x, new_y)):
+                    continue
+                new_organisms.append(Producer(org.species, new_x, new_y, uid=context.next_uid()))
+                births["producer_spread"] += 1
 
     # --- Consumer on same cell ---
     for pos, orgs in species_by_pos.items():
+        if not _in_region(region, *pos):
+            continue
         groups = defaultdict(list)
         for o in orgs:
             if isinstance(o, Consumer):
@@ -95,7 +293,7 @@ def reproduce(organisms, grid_size, step_counter):
         for species, members in groups.items():
             if len(members) < 2:
                 continue
-            if not all(m.energy >= REPRO_ENERGY_THRESHOLD_BY_LEVEL.get(m.trophic_level, 70) for m in members):
+            if not all(m.energy >= thresholds.get(m.trophic_level, 70) for m in members):
                 continue
 
             prey_available = food_sources.get(species, 0)
@@ -104,62 +302,68 @@ def reproduce(organisms, grid_size, step_counter):
             if prey_available / required_ratio < current:
                 continue
 
-            last = reproduce._last_repro.get((species, pos), -999)
-            cooldown = REPRO_COOLDOWN_BY_LEVEL.get(members[0].trophic_level, 5)
+            last = last_repro.get((species, pos), -999)
+            cooldown = cooldowns.get(members[0].trophic_level, 5)
             if step_counter - last >= cooldown:
-                new_organisms.append(Consumer(species, pos[0], pos[1], trophic_level=members[0].trophic_level))
-                reproduce._last_repro[(species, pos)] = step_counter
+                new_organisms.append(Consumer(species, pos[0], pos[1], trophic_level=members[0].trophic_level,
+                                              uid=context.next_uid()))
+                last_repro[(species, pos)] = step_counter
+                births["same_cell"] += 1
 
     # --- Consumer proximity based (all consumers including primary) ---
+    # Only live consumers with enough energy can pair. They are bucketed per species
+    # and cell, so each one only looks at the 8 cells at Manhattan distance 2;
+    # candidates are visited in list order, like the former all-pairs scan.
     paired = set()
-    consumers = [o for o in organisms if isinstance(o, Consumer)]
+    consumers = [o for o in organisms if isinstance(o, Consumer) and o.alive and o.energy >= 40]
+    buckets = defaultdict(lambda: defaultdict(list))
+    for i, o in enumerate(consumers):
+        buckets[o.species][(o.x, o.y)].append(i)
     for i, o1 in enumerate(consumers):
-        for o2 in consumers[i+1:]:
-            if o1.species != o2.species or id(o1) in paired or id(o2) in paired:
+        cells = buckets[o1.species]
+        partners = sorted(
+            j for dx, dy in PAIRING_OFFSETS
+            for j in cells.get((o1.x + dx, o1.y + dy), ())
+            if j > i
+        )
+        for o2 in (consumers[j] for j in partners):
+            if id(o1) in paired or id(o2) in paired:
                 continue
-            if abs(o1.x - o2.x) + abs(o1.y - o2.y) == 2:
-                if o1.energy >= 40 and o2.energy >= 40:
-                    avg_x = (o1.x + o2.x) // 2
-                    avg_y = (o1.y + o2.y) // 2
-                    if hasattr(reproduce, "_terrain") and (
-                        reproduce._terrain.is_blocked(avg_x, avg_y)
-                        or reproduce._terrain.is_water(avg_x, avg_y)):
-                        continue
-                    prey_available = food_sources.get(o1.species, 0)
-                    predatorcount = live_counts.get(o1.species, 0)
-                    current = live_counts[o1.species]
-                    required_ratio = REPRO_RATIOS.get(o1.species, 1)
-                    if prey_available <= predatorcount*2:
-                        continue
-                    if prey_available / required_ratio < current:
-                        if random.random() > 0.7:
-                            continue
-                    pos = (avg_x, avg_y)
-                    last = reproduce._last_repro.get((o1.species, pos), -999)
-                    cooldown = REPRO_COOLDOWN_BY_LEVEL.get(o1.trophic_level, 5)
-                    if step_counter - last >= cooldown:
-                        new_organisms.append(Consumer(o1.species, avg_x, avg_y, trophic_level=o1.trophic_level))
-                        reproduce._last_repro[(o1.species, pos)] = step_counter
-                        paired.add(id(o1))
-                        paired.add(id(o2))
+            avg_x = (o1.x + o2.x) // 2
+            avg_y = (o1.y + o2.y) // 2
+            if not _in_region(region, avg_x, avg_y):
+                continue
+            if terrain is not None and (
+                terrain.is_blocked(avg_x, avg_y)
+                or terrain.is_water(avg_x, avg_y)):
+                continue
+            prey_available = food_sources.get(o1.species, 0)
+            predatorcount = live_counts.get(o1.species, 0)
+            current = live_counts[o1.species]
+            required_ratio = REPRO_RATIOS.get(o1.species, 1)
+            if prey_available <= predatorcount*2:
+                continue
+            if prey_available / required_ratio < current:
+                if rng.random() > 0.7:
+                    continue
+            pos = (avg_x, avg_y)
+            last = last_repro.get((o1.species, pos), -999)
+            cooldown = cooldowns.get(o1.trophic_level, 5)
+            if step_counter - last >= cooldown:
+                child = Consumer(o1.species, avg_x, avg_y, trophic_level=o1.trophic_level, uid=context.next_uid())
+                new_organisms.append(child)
+                if context.pairings is not None:
+                    context.pairings.append((o1, o2, child, last_repro.get((o1.species, pos))))
+                last_repro[(o1.species, pos)] = step_counter
+                births["pairing"] += 1
+                paired.add(id(o1))
+                paired.add(id(o2))
 
     # --- Primary 1 remaining fallback to shelter ---
-    if hasattr(reproduce, "_foodweb") and reproduce._foodweb:
-        fw = reproduce._foodweb
-        for species, count in live_counts.items():
-            if count == 1 and fw.get_trophic_level(species) == "primary":
-                last = reproduce._last_primary_respawn.get(species, -999)
-                if step_counter - last >= 2:
-                    if hasattr(reproduce, "_terrain"):
-                        for (x, y), t in reproduce._terrain.map.items():
-                            if t == "shelter":
-                                new_organisms.append(Consumer(species, x, y, trophic_level="primary"))
-                                reproduce._last_primary_respawn[species] = step_counter
-                                break
+    if fw and region is None:
+        for species, x, y in primary_fallback_cells(live_counts, step_counter, fw, terrain,
+                                                    context.last_primary_respawn):
+            new_organisms.append(Consumer(species, x, y, trophic_level="primary", uid=context.next_uid()))
+            births["primary_fallback"] += 1
 
     return new_organisms
-
-reproduce._last_repro = {}
-reproduce._last_primary_respawn = {}
-reproduce._foodweb = None
-reproduce._terrain = None
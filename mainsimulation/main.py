@@ -6,7 +6,9 @@ Handles setup for output directories, terrain configuration, and executes the si
 
 from simulation.engine import SimulationEngine
 from core.terrain import Terrain
+from core.rng import make_rng
 import json
+import logging
 import os
 import shutil
 
@@ -21,16 +23,32 @@ if os.path.exists("frames"):
     for f in os.listdir("frames"):
         os.remove(os.path.join("frames", f))
 
-def simulation(grid_size, steps, terrain_config_path, foodweb_path):
+def simulation(grid_size, steps, terrain_config_path, foodweb_path, headless=False,
+               render_every=1, chart_every=1, final_only=False, animation_path=None,
+               log_level=logging.INFO, event_log=None, seed=None):
     """
     Initialize terrain, configure simulation engine and run the simulation.
 
     Parameters:
     grid_size (int): Size of the simulation grid (NxN).
     steps (int): Number of simulation steps to execute.
+    terrain_config_path (str): Path to the terrain configuration JSON.
+    foodweb_path (str): Path to the food web configuration JSON.
+    headless (bool): If True, run without writing any images.
+    render_every (int): Save an organism frame every N steps (0 disables frames).
+    chart_every (int): Save the population chart every N steps (0 disables the chart).
+    final_only (bool): Only write the frame and chart of the last step.
+    animation_path (str): Optional GIF/MP4 file the frames are streamed into while running.
+    log_level (int): Logging level of the simulation messages; INFO prints a summary
+        per step, DEBUG additionally every organism.
+    event_log (str): Optional JSON-lines file receiving the step and decomposition events.
+    seed (int): Seed of the run; the same seed reproduces the same terrain and run.
     """
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("simulation").setLevel(log_level)
 
-    terrain = Terrain(grid_size)
+    rng = make_rng(seed)
+    terrain = Terrain(grid_size, rng=rng)
     
     # Load terrain config if available, otherwise generate random terrain
     if os.path.exists(terrain_config_path):
@@ -41,7 +59,11 @@ def simulation(grid_size, steps, terrain_config_path, foodweb_path):
         terrain.generate_hills()
         terrain.generate_shelters()
 
-    engine = SimulationEngine(grid_size=grid_size, steps=steps, foodweb_path=foodweb_path)
+    engine = SimulationEngine(grid_size=grid_size, steps=steps, foodweb_path=foodweb_path,
+                              headless=headless, render_every=render_every,
+                              chart_every=chart_every, final_only=final_only,
+                              animation_path=animation_path, event_log=event_log,
+                              seed=rng)
     engine.terrain = terrain
     engine.setup()
     engine.run()
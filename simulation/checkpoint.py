@@ -0,0 +1,54 @@
+import os
+import pickle
+import zlib
+
+MAGIC = b"ECOSIMCK"
+VERSION = 1
+
+
+def write_checkpoint(path, state, level=6):
+    """
+    Writes a checkpoint atomically.
+
+    The state is pickled, zlib-compressed and written to a temporary file next to
+    ``path``, which is fsynced and then renamed over ``path``. A crash while
+    writing therefore leaves the previous checkpoint intact.
+
+    Parameters:
+        path (str): Checkpoint file path.
+        state (dict): Picklable simulation state.
+        level (int): zlib compression level (default is 6).
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), level)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fp:
+        fp.write(MAGIC + bytes([VERSION]))
+        fp.write(payload)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp, path)
+
+
+def read_checkpoint(path):
+    """
+    Reads a checkpoint written by write_checkpoint.
+
+    Parameters:
+        path (str): Checkpoint file path.
+
+    Returns:
+        dict: The simulation state.
+
+    Raises:
+        ValueError: If the file is not a checkpoint of a supported version.
+    """
+    with open(path, "rb") as fp:
+        header = fp.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a simulation checkpoint.")
+        if header[len(MAGIC)] != VERSION:
+            raise ValueError(f"Unsupported checkpoint version {header[len(MAGIC)]} in {path}.")
+        return pickle.loads(zlib.decompress(fp.read()))
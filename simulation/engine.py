@@ -1,25 +1,59 @@
-from core.organism import Consumer, Producer
+from core.organism import Organism, Consumer, Producer
+from core.population import PopulationArrays, CONSUMER
 from core.foodweb import FoodWeb
+from core.spatial import SpatialIndex
+from core.rng import make_rng
 import logic.behavior as behavior
-from visualizer.plot import plot_organisms
-import random
-from logic.reproduction import reproduce
-from collections import defaultdict
+from visualizer.plot import FrameRenderer
+from visualizer.raster import FrameRasterizer
+from visualizer.animation import AnimationWriter
+from simulation.output import OutputPipeline, take_snapshot, freeze_history
+from simulation.events import JsonLinesEventSink
+from simulation.recorder import TrajectoryRecorder
+from simulation.checkpoint import write_checkpoint, read_checkpoint
+from simulation.metrics import SimulationMetrics, NullMetrics
+import gc
+import itertools
+import logging
+from logic.reproduction import (reproduce, ReproductionContext, REPRO_ENERGY_THRESHOLD_BY_LEVEL,
+                                REPRO_COOLDOWN_BY_LEVEL)
+from collections import defaultdict, deque
 import numpy as np
-import matplotlib.pyplot as plt
 import seaborn as sns
-from statistic_tools.heatmap import export_heatmaps
+from statistic_tools.heatmap import HeatmapAccumulator, export_heatmaps
+from statistic_tools.timeseries import PopulationSeries
 from statistic_tools.population import export_population_chart
 
+logger = logging.getLogger(__name__)
+
 class SimulationEngine:
     """
     Controls and runs the ecosystem simulation.
 
     Handles grid setup, population initialization, step-wise organism behavior,
     reproduction, and visualization including population tracking and heatmaps.
+
+    Live organisms are kept in ``organisms``. Dead ones are moved, together with
+    the step at which they died, to the ``corpses`` FIFO, which the decomposers
+    empty one corpse every ``decomposition_interval`` steps.
+
+    With ``backend="arrays"`` the organisms are rows of a PopulationArrays store
+    (``population``) and ``organisms`` holds their views. Behaviour, terrain
+    effects and reproduction run through the views in the same order as with
+    organism objects, since every organism sees the moves of those that acted
+    before it, so a seeded run gives the same results with either backend. The
+    census, burials, compaction and heatmap counts work on the store's columns.
     """
 
-    def __init__(self, grid_size=20, steps=30, foodweb_path="configs/foodweb_config.json"):
+    def __init__(self, grid_size=20, steps=30, foodweb_path="configs/foodweb_config.json", compact_every=1,
+                 headless=False, render_every=1, chart_every=1, final_only=False,
+                 animation_path=None, animation_fps=4, animation_scale=4,
+                 output_workers=0, output_processes=True, output_queue=None, event_log=None,
+                 record_path=None, checkpoint_path=None, checkpoint_every=0, seed=None,
+                 initial_counts=None, repro_thresholds=None, repro_cooldowns=None, metrics=False,
+                 metrics_path=None, heatmap_block=1, heatmap_sparse=False, heatmap_levels=1,
+                 history_window=None, history_path=None, history_flush_every=256, chart_max_points=2000,
+                 backend="objects"):
         """
         Initialize simulation parameters and state.
 
@@ -27,21 +61,117 @@ class SimulationEngine:
         grid_size (int): Size of the simulation grid.
         steps (int): Total number of simulation steps.
         foodweb_path (str): Path to food web configuration JSON.
+        compact_every (int): Number of steps between removals of dead organisms
+            from the live organism list.
+        headless (bool): If True, no frames, charts or heatmap images are written.
+        render_every (int): Save an organism frame every N steps (0 disables frames).
+        chart_every (int): Save the population chart every N steps (0 disables the chart).
+        final_only (bool): Only write the frame and chart of the last step.
+        animation_path (str): If given, rasterized frames are streamed into this
+            GIF/MP4 file at the render_every stride, also in headless mode.
+        animation_fps (int): Frames per second of the animation.
+        animation_scale (int): Pixels per grid cell of the animation frames.
+        output_workers (int): If > 0, frames and charts are rendered by a background
+            pool of this many workers (see OutputPipeline) instead of on the simulation thread.
+        output_processes (bool): Use worker processes (default) rather than threads.
+        output_queue (int): Maximum number of pending output jobs; defaults to
+            twice the number of workers.
+        event_log (str): Optional path of a JSON-lines file receiving one "step"
+            event per step and one "decomposed" event per decomposition.
+        record_path (str): Optional directory receiving a columnar trajectory
+            recording of every step (see TrajectoryRecorder).
+        checkpoint_path (str): File that save_checkpoint writes to by default.
+        checkpoint_every (int): Save a checkpoint to checkpoint_path every N steps
+            (0 disables periodic checkpoints).
+        seed (int | numpy.random.SeedSequence | numpy.random.Generator | RandomSource):
+            Seed of the engine's random source, or the source itself (see core.rng).
+            Every random draw of the run (placement, movement, reproduction, shelter
+            ejections) comes from this source, so equal seeds give equal runs.
+        initial_counts (dict): Initial number of organisms per species, overriding
+            the food web configuration.
+        repro_thresholds (dict): Reproduction energy threshold per trophic level,
+            overriding REPRO_ENERGY_THRESHOLD_BY_LEVEL for this engine.
+        repro_cooldowns (dict): Reproduction cooldown per trophic level, overriding
+            REPRO_COOLDOWN_BY_LEVEL for this engine.
+        metrics (bool): Record the wall time of every step phase and event counts
+            in ``metrics`` (see SimulationMetrics).
+        metrics_path (str): Optional file the metrics are written to after run();
+            JSON lines for .jsonl/.json, CSV otherwise. Implies metrics.
+        heatmap_block (int): Count heatmap visits per block x block square of cells
+            instead of per cell, dividing the heatmap memory by block squared.
+        heatmap_sparse (bool): Store only the visited cells of the heatmaps, for
+            huge grids (see HeatmapAccumulator).
+        heatmap_levels (int): Pyramid levels written by export_heatmaps after run().
+        history_window (int): Keep only the last N steps of population_history in
+            memory (see PopulationSeries); all steps if None.
+        history_path (str): Optional .npy or CSV file the population history is
+            streamed to, in chunks of history_flush_every steps.
+        history_flush_every (int): Steps per chunk written to history_path.
+        chart_max_points (int): Population charts thin longer histories to about
+            this many steps (None charts every step).
+        backend (str): "objects" keeps every organism as a Producer or Consumer
+            object; "arrays" keeps them in a PopulationArrays store (see above).
+
+        Raises:
+        ValueError: If the backend is unknown.
         """
-        
+        if backend not in ("objects", "arrays"):
+            raise ValueError(f"Unknown population backend {backend!r}, expected 'objects' or 'arrays'.")
+
         self.grid_size = grid_size
         self.steps = steps
         self.foodweb = FoodWeb(foodweb_path)
+        self.rng = make_rng(seed)
+        self.initial_counts = dict(initial_counts or {})
+        self.repro_thresholds = {**REPRO_ENERGY_THRESHOLD_BY_LEVEL, **(repro_thresholds or {})}
+        self.repro_cooldowns = {**REPRO_COOLDOWN_BY_LEVEL, **(repro_cooldowns or {})}
+        self.compact_every = max(1, compact_every)
+        self.headless = headless
+        self.render_every = render_every
+        self.chart_every = chart_every
+        self.final_only = final_only
+        self.animation_path = animation_path
+        self.animation_fps = animation_fps
+        self.animation_scale = animation_scale
+        self.output_workers = output_workers
+        self.output_processes = output_processes
+        self.output_queue = output_queue
+        self.event_log = event_log
+        self._events = None
+        self.record_path = record_path
+        self.recorder = None
+        self._record_resume = None
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.current_step = 0
+        self.metrics_path = metrics_path
+        self.metrics = SimulationMetrics() if metrics or metrics_path else NullMetrics()
+        self._renderer = None
+        self._pipeline = None
+        self._animation = None
+        self._rasterizer = None
+        self._frame = None
+        self.backend = backend
+        self.population = PopulationArrays(species_names=self.foodweb.species_names) if backend == "arrays" else None
         self.organisms = []
-        self.heatmaps = defaultdict(lambda: np.zeros((self.grid_size, self.grid_size), dtype=int))
-        self.population_history = defaultdict(list)
+        self.corpses = deque()
+        self._buried = set()
+        self.spatial_index = SpatialIndex(grid_size)
+        self.heatmaps = HeatmapAccumulator(grid_size, block=heatmap_block, sparse=heatmap_sparse)
+        self.heatmap_levels = heatmap_levels
+        self.population_history = PopulationSeries(self.foodweb.all_species(), window=history_window,
+                                                   flush_path=history_path, flush_every=history_flush_every)
+        self.chart_max_points = chart_max_points
+        self.decomposition_interval = 20
         self.terrain = None
+        self._reset_reproduction()
 
     def setup(self):
         """
         Populate the grid with initial organisms based on food web configuration.
 
-        Organisms are placed randomly avoiding blocked or occupied terrain.
+        Organisms are placed on distinct random cells avoiding blocked, water
+        or occupied terrain (see sample_free_cells).
         Sets up internal reproduction and decomposition parameters.
         """
         level_counts = {
@@ -52,35 +182,40 @@ class SimulationEngine:
             "unknown": 1
         }
 
+        self.spatial_index.rebuild(self.organisms)
+
+        placements = []
         for species in self.foodweb.all_species():
             org_type = self.foodweb.get_type(species)
 
             if org_type == "Producer":
-                for _ in range(4):
-                    while True:
-                        x = random.randint(0, self.grid_size - 1)
-                        y = random.randint(0, self.grid_size - 1)
-                        occupied = any(o.x == x and o.y == y for o in self.organisms)
-                        blocked = self.terrain and (self.terrain.is_water(x, y) or self.terrain.is_blocked(x, y))
-                        if not occupied and not blocked:
-                            break
-                    self.organisms.append(Producer(species, x, y))
+                placements.append((species, None, self.initial_counts.get(species, 4)))
 
             elif org_type == "Consumer":
                 trophic_level = self.foodweb.get_trophic_level(species)
                 count = self.foodweb.organisms[species].get("initial_count", level_counts.get(trophic_level, 1))
-                for _ in range(count):
-                    while True:
-                        x = random.randint(0, self.grid_size - 1)
-                        y = random.randint(0, self.grid_size - 1)
-                        occupied = any(o.x == x and o.y == y for o in self.organisms)
-                        blocked = self.terrain and (self.terrain.is_water(x, y) or self.terrain.is_blocked(x, y))
-                        if not occupied and not blocked:
-                            break
-                    self.organisms.append(Consumer(species, x, y, trophic_level=trophic_level))
-
-        reproduce._foodweb = self.foodweb
-        reproduce._terrain = self.terrain
+                count = self.initial_counts.get(species, count)
+                placements.append((species, trophic_level, count))
+
+        cells = self.sample_free_cells(sum(count for _, _, count in placements))
+        # Bulk creation of many small objects would otherwise trigger repeated
+        # full garbage collections that cost more than the placement itself.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = 0
+            for species, trophic_level, count in placements:
+                for x, y in cells[start:start + count]:
+                    if trophic_level is None:
+                        self._add_organism(Producer(species, x, y))
+                    else:
+                        self._add_organism(Consumer(species, x, y, trophic_level=trophic_level))
+                start += count
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        self._reset_reproduction()
 
         decomposer_species = [
             s for s in self.foodweb.all_species()
@@ -91,67 +226,444 @@ class SimulationEngine:
             default=20
         )
 
+    def _reset_reproduction(self, last_repro=None, last_primary_respawn=None):
+        """
+        Create the context passed to reproduce() (see ReproductionContext) from
+        the current food web, terrain, spatial index and random source, with
+        empty or the given cooldown tables.
+
+        Parameters:
+        last_repro (dict): Step of the last birth per (species, cell) to continue from.
+        last_primary_respawn (dict): Step of the last primary fallback per species.
+        """
+        self._reproduction = ReproductionContext(self.foodweb, self.terrain, self.spatial_index, self.rng,
+                                                 self.repro_thresholds, self.repro_cooldowns)
+        self._reproduction.last_repro = last_repro if last_repro is not None else {}
+        self._reproduction.last_primary_respawn = last_primary_respawn if last_primary_respawn is not None else {}
+
+    def sample_free_cells(self, count):
+        """
+        Draw distinct random cells that are free for placing new organisms.
+
+        The pool of eligible cells (no live organism, no water and no tree) is
+        computed once from the occupancy grid and the terrain masks, and cells
+        are drawn from it without replacement.
+
+        Parameters:
+        count (int): Number of cells to draw.
+
+        Returns:
+        list: List of (x, y) tuples.
+
+        Raises:
+        ValueError: If fewer than `count` eligible cells are available.
+        """
+        eligible = self.spatial_index.occupancy == 0
+        if self.terrain:
+            eligible &= self.terrain.passable
+        pool = np.flatnonzero(eligible)
+        if count > len(pool):
+            raise ValueError(
+                f"Cannot place {count} organisms: only {len(pool)} free cells on the "
+                f"{self.grid_size}x{self.grid_size} grid."
+            )
+        chosen = self.rng.choice(pool, size=count, replace=False)
+        ys, xs = np.divmod(chosen, self.grid_size)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def _bury(self, org, step):
+        """
+        Move a dead organism to the corpse queue and out of the spatial index.
+
+        Parameters:
+        org (Organism): The dead organism.
+        step (int): Step at which the death was detected.
+        """
+        self.corpses.append((step, org))
+        self._buried.add(org.uid)
+        self.spatial_index.remove(org)
+
+    def _add_organism(self, org):
+        """
+        Add an organism to the simulation and to the spatial index. With the
+        arrays backend it is copied into the store and its view is added.
+
+        Parameters:
+        org (Organism): The organism to add.
+        """
+        if self.population is not None:
+            org = self.population.add_organism(org)
+        self.organisms.append(org)
+        self.spatial_index.insert(org)
+
+    def _stride_due(self, step, every):
+        """
+        Decide whether an output with the given stride is due at a step.
+
+        The last step is always due when the output is enabled, so the
+        final state is available whatever the stride.
+
+        Parameters:
+        step (int): Current simulation step.
+        every (int): Output stride in steps; 0 or None disables the output.
+
+        Returns:
+        bool: True if the output should be produced at this step.
+        """
+        if not every:
+            return False
+        if step == self.steps - 1:
+            return True
+        return not self.final_only and step % every == 0
+
+    def _output_due(self, step, every):
+        """
+        Decide whether an image output with the given stride is written at a step.
+        Nothing is written in headless mode (see _stride_due otherwise).
+
+        Parameters:
+        step (int): Current simulation step.
+        every (int): Output stride in steps; 0 or None disables the output.
+
+        Returns:
+        bool: True if the output should be written at this step.
+        """
+        return not self.headless and self._stride_due(step, every)
+
+    def _append_animation_frame(self, shown):
+        """
+        Rasterize the current state and stream it into the animation file.
+        The frame buffer is reused between steps. With the arrays backend the
+        live organisms are read from the store columns.
+
+        Parameters:
+        shown (list): Live organisms and corpses to draw; None with the arrays backend.
+        """
+        if self._animation is None:
+            self._rasterizer = FrameRasterizer(self.grid_size, foodweb=self.foodweb, terrain=self.terrain,
+                                               scale=self.animation_scale)
+            self._animation = AnimationWriter(self.animation_path, fps=self.animation_fps)
+        store = self.population
+        if store is None:
+            self._frame = self._rasterizer.render_organisms(shown, out=self._frame)
+        else:
+            rows = np.flatnonzero(store.alive)
+            corpses = [corpse for _, corpse in self.corpses]
+            xs = np.concatenate([store.x[rows], np.fromiter((c.x for c in corpses), np.int32, len(corpses))])
+            ys = np.concatenate([store.y[rows], np.fromiter((c.y for c in corpses), np.int32, len(corpses))])
+            corpse_ids = np.fromiter((store.species_id_of(c.species) for c in corpses), np.int16, len(corpses))
+            ids = np.concatenate([store.species_id[rows], corpse_ids])
+            alive = np.arange(xs.size) < rows.size
+            self._frame = self._rasterizer.render_columns(xs, ys, ids, alive, species_names=store.species_names,
+                                                          out=self._frame)
+        self._animation.append(self._frame)
+
     def run(self):
         """
         Execute the simulation over the predefined number of steps.
 
         Organisms act each step based on their roles (Producer/Consumer),
         terrain effects are applied, population data is updated, and visual outputs
-        such as organism plots and heatmaps are generated.
+        such as organism plots and heatmaps are generated according to the
+        headless, render_every, chart_every and final_only settings.
+        With output_workers > 0 they are rendered in the background and flushed
+        before run() returns.
+
+        Progress is reported through the ``simulation.engine`` logger: one summary
+        record per step at INFO and the state of every organism at DEBUG.
         """
-        for step in range(self.steps):
-            print(f"\n--- Step {step} ---")
-            living = [org for org in self.organisms if org.alive]
+        if self.event_log:
+            self._events = JsonLinesEventSink(self.event_log)
+        if self.record_path and self.recorder is None:
+            self.recorder = TrajectoryRecorder(self.record_path, self.grid_size, foodweb=self.foodweb,
+                                               terrain=self.terrain, resume_at=self._record_resume)
+            self._record_resume = None
+        if self.output_workers > 0 and not self.headless:
+            self._pipeline = OutputPipeline(self.grid_size, foodweb=self.foodweb, terrain=self.terrain,
+                                            workers=self.output_workers, max_pending=self.output_queue,
+                                            use_processes=self.output_processes)
+        try:
+            while self.current_step < self.steps:
+                self.step()
+        finally:
+            if self._pipeline is not None:
+                self._pipeline.close()
+                self._pipeline = None
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+            if self.recorder is not None:
+                self.recorder.close()
+            self.population_history.close()
 
-            for org in living:
-                if isinstance(org, Consumer):
-                    org.step(self.grid_size, self.organisms, self.foodweb, behavior, self.terrain)
-                elif isinstance(org, Producer):
-                    org.step(self.grid_size)
+        if self._renderer is not None:
+            self._renderer.close()
+            self._renderer = None
+
+        if self._animation is not None:
+            self._animation.close()
+            self._animation = None
+            self._frame = None
+
+        if not self.headless:
+            export_heatmaps(self.heatmaps, levels=self.heatmap_levels)
+
+        if self.metrics_path and self.metrics:
+            self.metrics.write(self.metrics_path)
 
-                if self.terrain:
-                    self.terrain.apply_terrain_effects(org, step)
+    def step(self):
+        """
+        Execute one simulation step (``current_step``) and queue or write its
+        outputs, then advance ``current_step``. A checkpoint is saved afterwards
+        when checkpoint_every is set and due.
+
+        The step runs in the phases listed in simulation.metrics.PHASES; with
+        metrics enabled each phase is timed and the events are counted.
+        """
+        step = self.current_step
+        metrics = self.metrics
+        t = metrics.begin(step)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if self.terrain is not None:
+            # Terrain effects draw from this engine's random source.
+            self.terrain.rng = self.rng
+        store = self.population
+        if store is None:
+            living = [org for org in self.organisms if org.alive]
+        else:
+            live_rows = np.flatnonzero(store.alive)
+            # Producers do nothing in their step and have no terrain effects, so only live consumers are visited.
+            living = store.views(live_rows[store.kind[live_rows] == CONSUMER])
+
+        predations = 0
+        for org in living:
+            if isinstance(org, Consumer):
+                predations += len(org.step(self.grid_size, self.organisms, self.foodweb, behavior, self.terrain,
+                                           index=self.spatial_index, rng=self.rng))
+            elif isinstance(org, Producer):
+                org.step(self.grid_size)
+        metrics.count("predations", predations)
+        t = metrics.lap("behavior", t)
 
-                if 0 <= org.x < self.grid_size and 0 <= org.y < self.grid_size:
-                    self.heatmaps[org.species][org.y, org.x] += 1
+        if self.terrain:
+            for org in living:
+                self.terrain.apply_terrain_effects(org, step)
+        if store is None:
+            self.heatmaps.add_organisms(living)
+        else:
+            ids, xs, ys = store.species_id[live_rows], store.x[live_rows], store.y[live_rows]
+            for sid in np.unique(ids).tolist():
+                mask = ids == sid
+                self.heatmaps.add(store.species_names[sid], xs[mask], ys[mask])
+        t = metrics.lap("terrain", t)
 
-            if self.terrain:
-                self.terrain.update_shelters(self.organisms)
+        if self.terrain:
+            # Organisms buried at earlier steps stay in the list until the next compaction.
+            unburied = [org for org in self.organisms if org.uid not in self._buried]
+            metrics.count("shelter_ejections", self.terrain.update_shelters(unburied, index=self.spatial_index))
+        t = metrics.lap("shelters", t)
 
+        if debug:
             for org in self.organisms:
-                status = "X" if not org.alive else ""
-                print(f"{org} {status}")
+                logger.debug("Step %d: %r%s", step, org, "" if org.alive else " X")
+        t = metrics.lap("logging", t)
 
-            newbies = reproduce(self.organisms, self.grid_size, step)
-            self.organisms.extend(newbies)
+        births = self._reproduction.births
+        births.clear()
+        newbies = reproduce(self.organisms, self.grid_size, step, self._reproduction)
+        for org in newbies:
+            self._add_organism(org)
+        if metrics:
+            for path, count in births.items():
+                metrics.count("births_" + path, count)
+        t = metrics.lap("reproduction", t)
 
+        buried = len(self.corpses)
+        if store is None:
             species_counts = defaultdict(int)
+            survivors = []
             for org in self.organisms:
                 if org.alive:
                     species_counts[org.species] += 1
+                    survivors.append(org)
+                elif org.uid not in self._buried:
+                    self._bury(org, step)
+        else:
+            alive = store.alive
+            counts = np.bincount(store.species_id[alive], minlength=len(store.species_names))
+            species_counts = {store.species_names[sid]: int(counts[sid]) for sid in np.flatnonzero(counts).tolist()}
+            survivors = store.views(np.flatnonzero(alive))
+            for org in store.views(np.flatnonzero(~alive)):
+                if org.uid not in self._buried:
+                    self._bury(org, step)
+        deaths = len(self.corpses) - buried
+        if (step + 1) % self.compact_every == 0:
+            if store is None:
+                self.organisms = survivors
+            else:
+                store.compact()
+                self.organisms = list(store)
+            self._buried.clear()
+
+        self.population_history.append(species_counts)
+        metrics.count("deaths", deaths)
+        t = metrics.lap("census", t)
+
+        logger.info("Step %d: %d alive, %d born, %d died, %d corpses", step, len(survivors),
+                    len(newbies), deaths, len(self.corpses))
+        if self._events is not None:
+            self._events.emit("step", step=step, alive=len(survivors), births=len(newbies),
+                              deaths=deaths, corpses=len(self.corpses), counts=dict(species_counts))
+        t = metrics.lap("logging", t)
+
+        if step > 0 and step % self.decomposition_interval == 0 and self.corpses:
+            died_at, corpse = self.corpses.popleft()
+            metrics.count("decompositions")
+            logger.info("Decomposed: %r (died at step %d)", corpse, died_at)
+            if self._events is not None:
+                self._events.emit("decomposed", step=step, species=corpse.species, x=corpse.x, y=corpse.y,
+                                  died_at=died_at)
+        t = metrics.lap("decomposition", t)
+
+        if self.recorder is not None:
+            self.recorder.record(step, survivors + [corpse for _, corpse in self.corpses])
+        t = metrics.lap("recording", t)
+
+        shown = None
+        if self._output_due(step, self.render_every):
+            shown = survivors + [corpse for _, corpse in self.corpses]
+            if self._pipeline is not None:
+                self._pipeline.submit_frame(take_snapshot(step, shown))
+            else:
+                if self._renderer is None:
+                    self._renderer = FrameRenderer(self.grid_size, foodweb=self.foodweb, terrain=self.terrain)
+                self._renderer.draw(step, shown)
 
-            for species in self.foodweb.all_species():
-                self.population_history[species].append(species_counts.get(species, 0))
+        if self.animation_path and self._stride_due(step, self.render_every):
+            if shown is None and store is None:
+                shown = survivors + [corpse for _, corpse in self.corpses]
+            self._append_animation_frame(shown)
 
-            if step > 0 and step % self.decomposition_interval == 0:
-                for corpse in self.organisms:
-                    if not corpse.alive:
-                        print(f"💀 Decomposed: {corpse}")
-                        self.organisms.remove(corpse)
-                        break
+        if self._output_due(step, self.chart_every):
+            if self._pipeline is not None:
+                self._pipeline.submit_chart(freeze_history(self.population_history), self.chart_max_points)
+            else:
+                export_population_chart(self.population_history, max_points=self.chart_max_points)
+        t = metrics.lap("output", t)
 
-            plot_organisms(step, self.organisms, self.grid_size, foodweb=self.foodweb, terrain=self.terrain)
+        self.current_step += 1
+        if self.checkpoint_path and self.checkpoint_every and self.current_step % self.checkpoint_every == 0:
+            self.save_checkpoint()
+        metrics.lap("checkpoint", t)
+        metrics.end()
 
-            export_population_chart(self.population_history)
+    def get_state(self):
+        """
+        Return a comparable snapshot of the simulation state: two snapshots are
+        equal only if the step, the organisms and the corpses are the same.
+
+        Returns:
+        dict: The current step, a (uid, species, x, y, energy, alive) tuple per
+        organism and a (died at, uid) pair per corpse.
+        """
+        return {
+            "step": self.current_step,
+            "organisms": [(org.uid, org.species, org.x, org.y, org.energy, org.alive) for org in self.organisms],
+            "corpses": [(step, org.uid) for step, org in self.corpses],
+        }
+
+    def get_population_counts(self):
+        """
+        Return the number of live organisms per species.
+
+        Returns:
+        dict: Count for every food web species (0 if none is alive).
+        """
+        counts = {species: 0 for species in self.foodweb.all_species()}
+        for org in self.organisms:
+            if org.alive:
+                counts[org.species] = counts.get(org.species, 0) + 1
+        return counts
+
+    def save_checkpoint(self, path=None):
+        """
+        Save the complete simulation state so that a run can be resumed with
+        load_checkpoint and continue exactly as the uninterrupted run would.
+
+        The checkpoint holds the organisms and corpses, the terrain with its
+        shelter and water bookkeeping, the reproduction cooldown tables, the
+        heatmaps, the population history, the current step and the state of the
+        engine's random source. It is written atomically (see write_checkpoint).
+        A trajectory recording is flushed first and its length is saved, so a
+        resumed run continues it from there.
+
+        Parameters:
+        path (str): Checkpoint file; defaults to checkpoint_path.
+        """
+        path = path or self.checkpoint_path
+        if not path:
+            raise ValueError("No checkpoint path given.")
+        # itertools.count cannot be inspected, so draw the next uid and restart the counter there.
+        next_uid = next(Organism._uids)
+        Organism._uids = itertools.count(next_uid)
+        recorded = None
+        if self.recorder is not None:
+            self.recorder.flush()
+            recorded = (self.recorder.rows_written, self.recorder.steps_recorded)
+        state = {
+            "grid_size": self.grid_size,
+            "current_step": self.current_step,
+            "organisms": self.organisms,
+            "corpses": list(self.corpses),
+            "buried": self._buried,
+            "terrain": self.terrain,
+            "heatmaps": self.heatmaps,
+            "population_history": self.population_history.copy(),
+            "decomposition_interval": self.decomposition_interval,
+            "last_repro": self._reproduction.last_repro,
+            "last_primary_respawn": self._reproduction.last_primary_respawn,
+            "next_uid": next_uid,
+            "rng": self.rng,
+            "recorded": recorded,
+        }
+        write_checkpoint(path, state)
+        logger.info("Checkpoint saved to %s at step %d", path, self.current_step)
+
+    def load_checkpoint(self, path=None):
+        """
+        Restore a state saved by save_checkpoint, instead of calling setup().
+        A following run() continues from the saved step; with record_path set it
+        continues the recording the checkpointed run made there.
+
+        Parameters:
+        path (str): Checkpoint file; defaults to checkpoint_path.
+
+        Raises:
+        ValueError: If the checkpoint was made for another grid size.
+        """
+        path = path or self.checkpoint_path
+        state = read_checkpoint(path)
+        if state["grid_size"] != self.grid_size:
+            raise ValueError(f"Checkpoint grid size {state['grid_size']} does not match {self.grid_size}.")
 
-        for species, heatmap_data in self.heatmaps.items():
-            plt.figure(figsize=(8, 6))
-            plt.imshow(heatmap_data, cmap="YlOrRd", interpolation='bilinear')
-            plt.title(f"Heatmap: {species}")
-            plt.xlabel("X coordinate")
-            plt.ylabel("Y coordinate")
-            plt.colorbar()
-            plt.tight_layout()
-            plt.close()
+        self.current_step = state["current_step"]
+        self.organisms = state["organisms"]
+        if self.population is not None:
+            self.population = PopulationArrays.from_organisms(self.organisms, species_names=self.foodweb.species_names)
+            self.organisms = list(self.population)
+        self.corpses = deque(state["corpses"])
+        self._buried = state["buried"]
+        self.terrain = state["terrain"]
+        self.heatmaps = state["heatmaps"]
+        self.population_history.restore(state["population_history"])
+        self.decomposition_interval = state["decomposition_interval"]
+        self.spatial_index.rebuild(org for org in self.organisms if org.uid not in self._buried)
 
-        export_heatmaps(self.heatmaps)
+        self.rng = state["rng"]
+        self._reset_reproduction(state["last_repro"], state["last_primary_respawn"])
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        self._record_resume = state.get("recorded")
+        Organism._uids = itertools.count(max(state["next_uid"], next(Organism._uids)))
+        logger.info("Checkpoint loaded from %s at step %d", path, self.current_step)
@@ -0,0 +1,104 @@
+"""
+Replicate ensembles of headless simulation runs.
+
+The replicates of one configuration differ only in their seed, drawn as
+independent streams from one master seed (see core.rng.spawn_seeds). They run
+on a process pool and every finished replicate's population history is folded
+into an EnsembleStats object and then dropped, so memory does not grow with the
+number of replicates.
+
+Example::
+
+    python -m simulation.ensemble --replicates 200 --steps 100 --seed 1 --out ensemble.csv
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from core.foodweb import FoodWeb
+from core.rng import spawn_seeds
+from simulation.sweep import run_config
+from statistic_tools.ensemble import EnsembleStats, DEFAULT_QUANTILES
+from statistic_tools.population import export_ensemble_chart
+
+
+def _history(rows):
+    history = {}
+    for step, species, count in rows:
+        history.setdefault(species, []).append(count)
+    return history
+
+
+def _run_replicate(config, foodweb_path, terrain_config_path):
+    return _history(run_config(config, foodweb_path, terrain_config_path))
+
+
+def run_ensemble(config, replicates, seed=None, workers=None, foodweb_path="configs/foodweb_config.json",
+                 terrain_config_path=None, quantiles=DEFAULT_QUANTILES):
+    """
+    Runs replicates of one configuration in parallel and merges their population histories.
+
+    At most two replicates per worker are in flight, so the results waiting to
+    be merged stay bounded too.
+
+    Parameters:
+        config (dict): Engine configuration (see simulation.sweep); "steps"
+            defaults to 30 and any "seed" entry is replaced per replicate.
+        replicates (int): Number of replicates.
+        seed (int): Master seed the replicate seeds are spawned from.
+        workers (int): Number of worker processes; defaults to the CPU count.
+        foodweb_path (str): Path to the food web configuration JSON.
+        terrain_config_path (str): Optional terrain configuration JSON.
+        quantiles (tuple): Quantile probabilities to estimate.
+
+    Returns:
+        EnsembleStats: Statistics over the replicates.
+    """
+    config = dict(config)
+    config.setdefault("steps", 30)
+    species = FoodWeb(foodweb_path).all_species()
+    stats = EnsembleStats(species, config["steps"], quantiles)
+    seeds = iter(spawn_seeds(seed, replicates))
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        while True:
+            for child in seeds:
+                pending.add(pool.submit(_run_replicate, {**config, "seed": child}, foodweb_path,
+                                        terrain_config_path))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stats.add(future.result())
+    return stats
+
+
+def main(argv=None):
+    """
+    Command line entry point, see the module docstring.
+    """
+    parser = argparse.ArgumentParser(description="Run a replicate ensemble of headless simulations.")
+    parser.add_argument("--replicates", type=int, default=100, help="number of replicates")
+    parser.add_argument("--seed", type=int, default=None, help="master seed")
+    parser.add_argument("--steps", type=int, default=30, help="steps per replicate")
+    parser.add_argument("--grid-size", type=int, default=20, help="grid size")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--foodweb", default="configs/foodweb_config.json", help="food web configuration")
+    parser.add_argument("--terrain", default=None, help="terrain configuration (default: generated per seed)")
+    parser.add_argument("--out", default="statistics_plots/ensemble.csv", help="statistics CSV")
+    parser.add_argument("--no-chart", action="store_true", help="do not draw the ensemble chart")
+    args = parser.parse_args(argv)
+
+    stats = run_ensemble({"grid_size": args.grid_size, "steps": args.steps}, args.replicates, seed=args.seed,
+                         workers=args.workers, foodweb_path=args.foodweb, terrain_config_path=args.terrain)
+    stats.write_csv(args.out)
+    if not args.no_chart:
+        export_ensemble_chart(stats.summary(), output_dir=os.path.dirname(args.out) or ".")
+    print(f"✅ {stats.count} replicates merged, statistics in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import json
+import os
+
+
+class JsonLinesEventSink:
+    """
+    Buffered writer of simulation events as JSON lines.
+
+    Every event is one JSON object per line with an ``event`` field naming its
+    kind (e.g. "step", "decomposed") and the event fields next to it. Events are
+    kept in memory and written in batches of ``buffer_size`` lines, so emitting
+    an event costs a dict and a list append rather than a write call.
+
+    Attributes:
+        path (str): Output file path.
+        buffer_size (int): Number of events buffered before a write.
+        events_written (int): Number of events written to the file so far.
+    """
+
+    def __init__(self, path, buffer_size=1000, append=False):
+        """
+        Opens the output file.
+
+        Parameters:
+            path (str): Output file path (e.g. "statistics_plots/events.jsonl").
+            buffer_size (int): Number of events buffered before a write (default is 1000).
+            append (bool): Append to an existing file instead of truncating it.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.buffer_size = max(1, buffer_size)
+        self.events_written = 0
+        self._buffer = []
+        self._fp = open(path, "a" if append else "w", encoding="utf-8")
+
+    def emit(self, event, **fields):
+        """
+        Records one event.
+
+        Parameters:
+            event (str): Kind of the event.
+            **fields: JSON-serializable event fields.
+        """
+        fields["event"] = event
+        self._buffer.append(fields)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered events to the file.
+        """
+        if not self._buffer:
+            return
+        self._fp.write("".join(json.dumps(event, separators=(",", ":")) + "\n" for event in self._buffer))
+        self._fp.flush()
+        self.events_written += len(self._buffer)
+        self._buffer.clear()
+
+    def close(self):
+        """
+        Flushes the remaining events and closes the file.
+        """
+        if self._fp.closed:
+            return
+        self.flush()
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_events(path, event=None):
+    """
+    Reads the events of a JSON-lines event file.
+
+    Parameters:
+        path (str): File written by JsonLinesEventSink.
+        event (str): Only yield events of this kind, if given.
+
+    Yields:
+        dict: One event per line.
+    """
+    with open(path, encoding="utf-8") as fp:
+        for line in fp:
+            record = json.loads(line)
+            if event is None or record.get("event") == event:
+                yield record
@@ -0,0 +1,218 @@
+import csv
+import json
+import os
+import time
+import numpy as np
+
+# Phases of SimulationEngine.step, in execution order.
+PHASES = ("behavior", "terrain", "shelters", "reproduction", "census", "logging", "decomposition",
+          "recording", "output", "checkpoint")
+
+# Event counters. Births are split by the reproduce() path that produced them.
+EVENTS = ("predations", "births_producer_spread", "births_producer_respawn", "births_same_cell",
+          "births_pairing", "births_primary_fallback", "deaths", "shelter_ejections", "decompositions")
+
+
+class SimulationMetrics:
+    """
+    Per-step wall time per phase and event counts of a simulation run.
+
+    Times are taken with ``time.perf_counter_ns``: begin() starts a step and
+    every lap() charges the time since the previous lap to a phase, so a step
+    costs one clock read per phase. The values of the current step are kept in
+    plain lists and copied into preallocated int64 arrays (grown by doubling)
+    when the step ends.
+
+    Attributes:
+        steps (numpy.ndarray): Step numbers, one row per recorded step.
+        times (numpy.ndarray): Nanoseconds per step and phase, columns in PHASES order.
+        counts (numpy.ndarray): Events per step, columns in EVENTS order.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Parameters:
+            capacity (int): Number of steps preallocated.
+        """
+        self._steps = np.zeros(capacity, dtype=np.int64)
+        self._times = np.zeros((capacity, len(PHASES)), dtype=np.int64)
+        self._counts = np.zeros((capacity, len(EVENTS)), dtype=np.int64)
+        self._size = 0
+        self._step = None
+        self._row_times = [0] * len(PHASES)
+        self._row_counts = [0] * len(EVENTS)
+        self._phase = {name: i for i, name in enumerate(PHASES)}
+        self._event = {name: i for i, name in enumerate(EVENTS)}
+
+    def __bool__(self):
+        return True
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def steps(self):
+        return self._steps[:self._size]
+
+    @property
+    def times(self):
+        return self._times[:self._size]
+
+    @property
+    def counts(self):
+        return self._counts[:self._size]
+
+    def begin(self, step):
+        """
+        Starts recording a step.
+
+        Parameters:
+            step (int): Step number.
+
+        Returns:
+            int: Clock reading to pass to the first lap().
+        """
+        self._step = step
+        return time.perf_counter_ns()
+
+    def lap(self, phase, since):
+        """
+        Charges the time since a clock reading to a phase.
+
+        Parameters:
+            phase (str): Name from PHASES.
+            since (int): Clock reading of the previous lap (or of begin()).
+
+        Returns:
+            int: The current clock reading.
+        """
+        now = time.perf_counter_ns()
+        self._row_times[self._phase[phase]] += now - since
+        return now
+
+    def count(self, event, n=1):
+        """
+        Adds n occurrences of an event to the current step.
+
+        Parameters:
+            event (str): Name from EVENTS.
+            n (int): Number of occurrences.
+        """
+        self._row_counts[self._event[event]] += n
+
+    def end(self):
+        """
+        Stores the current step.
+        """
+        if self._size == len(self._steps):
+            capacity = 2 * len(self._steps)
+            self._steps = np.resize(self._steps, capacity)
+            self._times = np.resize(self._times, (capacity, len(PHASES)))
+            self._counts = np.resize(self._counts, (capacity, len(EVENTS)))
+        self._steps[self._size] = self._step
+        self._times[self._size] = self._row_times
+        self._counts[self._size] = self._row_counts
+        self._size += 1
+        self._row_times = [0] * len(PHASES)
+        self._row_counts = [0] * len(EVENTS)
+
+    def phase_time(self, phase):
+        """
+        Returns:
+            numpy.ndarray: Nanoseconds of a phase per recorded step.
+        """
+        return self.times[:, self._phase[phase]]
+
+    def event_count(self, event):
+        """
+        Returns:
+            numpy.ndarray: Occurrences of an event per recorded step.
+        """
+        return self.counts[:, self._event[event]]
+
+    def totals(self):
+        """
+        Returns:
+            dict: Total nanoseconds per phase and total count per event.
+        """
+        totals = dict(zip(PHASES, self.times.sum(axis=0).tolist()))
+        totals.update(zip(EVENTS, self.counts.sum(axis=0).tolist()))
+        return totals
+
+    def records(self):
+        """
+        Yields one dict per recorded step: the step, "<phase>_ns" per phase and
+        the count per event.
+        """
+        columns = ["step"] + [f"{phase}_ns" for phase in PHASES] + list(EVENTS)
+        rows = np.column_stack([self.steps, self.times, self.counts]).tolist()
+        for row in rows:
+            yield dict(zip(columns, row))
+
+    def write_csv(self, path):
+        """
+        Writes one row per step (see records()).
+
+        Parameters:
+            path (str): Output CSV file.
+        """
+        self._write(path, lambda fp: self._csv(fp))
+
+    def write_jsonl(self, path):
+        """
+        Writes one JSON object per step (see records()).
+
+        Parameters:
+            path (str): Output JSON-lines file.
+        """
+        self._write(path, lambda fp: fp.writelines(json.dumps(r) + "\n" for r in self.records()))
+
+    def write(self, path):
+        """
+        Writes JSON lines for a .jsonl or .json path and CSV otherwise.
+
+        Parameters:
+            path (str): Output file.
+        """
+        if path.endswith((".jsonl", ".json")):
+            self.write_jsonl(path)
+        else:
+            self.write_csv(path)
+
+    def _csv(self, fp):
+        writer = None
+        for record in self.records():
+            if writer is None:
+                writer = csv.DictWriter(fp, fieldnames=list(record))
+                writer.writeheader()
+            writer.writerow(record)
+
+    @staticmethod
+    def _write(path, dump):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as fp:
+            dump(fp)
+
+
+class NullMetrics:
+    """
+    Stand-in for SimulationMetrics when instrumentation is off: every call is
+    a no-op, so the engine needs no checks around its laps.
+    """
+
+    def __bool__(self):
+        return False
+
+    def begin(self, step):
+        return 0
+
+    def lap(self, phase, since):
+        return 0
+
+    def count(self, event, n=1):
+        pass
+
+    def end(self):
+        pass
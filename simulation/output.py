@@ -0,0 +1,272 @@
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple
+import numpy as np
+from visualizer.plot import FrameRenderer, terrain_rgb, get_species_colors_for
+from statistic_tools.population import export_population_chart
+from statistic_tools.timeseries import PopulationSeries
+
+
+class StepSnapshot(NamedTuple):
+    """
+    Immutable copy of the state needed to draw one frame.
+
+    The arrays are read-only copies, so the simulation can keep mutating its
+    organisms while a worker renders the snapshot.
+
+    Attributes:
+        step (int): Simulation step.
+        xs (numpy.ndarray): X-coordinates.
+        ys (numpy.ndarray): Y-coordinates.
+        species (numpy.ndarray): Species name of every organism.
+        alive (numpy.ndarray): Alive flag of every organism.
+    """
+    step: int
+    xs: np.ndarray
+    ys: np.ndarray
+    species: np.ndarray
+    alive: np.ndarray
+
+
+def take_snapshot(step, organisms):
+    """
+    Copies positions, species and alive flags of the given organisms.
+
+    Parameters:
+        step (int): Simulation step.
+        organisms (list): Organisms to capture (live ones and corpses).
+
+    Returns:
+        StepSnapshot: The frozen snapshot.
+    """
+    n = len(organisms)
+    xs = np.fromiter((o.x for o in organisms), dtype=np.int32, count=n)
+    ys = np.fromiter((o.y for o in organisms), dtype=np.int32, count=n)
+    alive = np.fromiter((o.alive for o in organisms), dtype=bool, count=n)
+    species = np.array([o.species for o in organisms], dtype=object)
+    for array in (xs, ys, alive, species):
+        array.flags.writeable = False
+    return StepSnapshot(step, xs, ys, species, alive)
+
+
+def freeze_history(population_history):
+    """
+    Copies the population history for a chart job. A PopulationSeries is
+    copied as one array; a dict becomes an immutable mapping of tuples.
+
+    Parameters:
+        population_history (PopulationSeries | dict): Species -> counts per step.
+
+    Returns:
+        PopulationSeries | dict: The copy.
+    """
+    if isinstance(population_history, PopulationSeries):
+        return population_history.copy()
+    return {species: tuple(counts) for species, counts in population_history.items()}
+
+
+# Per-worker state, set up once by _init_worker in every worker process (or thread).
+_worker = threading.local()
+_chart_lock = threading.Lock()
+
+
+def _init_worker(grid_size, output_dir, colors, background):
+    _worker.renderer = FrameRenderer(grid_size, output_dir=output_dir, colors=colors, background=background)
+
+
+def _render_frame(init_args, snapshot):
+    renderer = getattr(_worker, "renderer", None)
+    if renderer is None:
+        _init_worker(*init_args)
+        renderer = _worker.renderer
+    return renderer.draw_arrays(snapshot.step, snapshot.xs, snapshot.ys, snapshot.species, snapshot.alive)
+
+
+def _export_chart(history, output_dir, max_points=None):
+    # pyplot keeps global state, so charts are never drawn concurrently within a process.
+    with _chart_lock:
+        export_population_chart(history, output_dir=output_dir, max_points=max_points)
+
+
+class OutputPipeline:
+    """
+    Background worker pool that renders frames and exports population charts.
+
+    The engine hands immutable snapshots to submit_frame / submit_chart and goes
+    on simulating while the workers draw and encode the PNGs. At most
+    ``max_pending`` jobs are queued or running; further submissions block until a
+    job finishes (backpressure), so memory stays bounded when rendering is slower
+    than simulating. Frames are rendered in parallel; charts overwrite the same
+    file, so at most one chart is exported at a time and only the newest chart
+    submitted meanwhile is exported after it; the charts in between are stale
+    and are dropped (their futures are cancelled).
+
+    Attributes:
+        workers (int): Number of worker processes or threads.
+        max_pending (int): Maximum number of queued or running jobs.
+        frames_dir (str): Directory the frames are saved to.
+        charts_dir (str): Directory the population chart is saved to.
+    """
+
+    def __init__(self, grid_size, foodweb=None, terrain=None, workers=4, max_pending=None,
+                 use_processes=True, frames_dir="frames", charts_dir="statistics_plots"):
+        """
+        Starts the worker pool.
+
+        Parameters:
+            grid_size (int): Size of the simulation grid.
+            foodweb (object): Optional foodweb used for the species colors.
+            terrain (object): Optional terrain drawn as frame background.
+            workers (int): Number of workers (default is 4).
+            max_pending (int): Queue bound; defaults to twice the number of workers.
+            use_processes (bool): Use worker processes (default) instead of threads.
+                Processes render truly in parallel; threads avoid start-up and pickling cost.
+            frames_dir (str): Directory for the frame PNGs (default is "frames").
+            charts_dir (str): Directory for the population chart (default is "statistics_plots").
+        """
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or 2 * self.workers
+        self.frames_dir = frames_dir
+        self.charts_dir = charts_dir
+        colors = get_species_colors_for(foodweb.species_names, foodweb=foodweb) if foodweb else None
+        background = terrain_rgb(terrain, grid_size) if terrain else None
+        self._init_args = (grid_size, frames_dir, colors, background)
+        if use_processes:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=self._init_args)
+        else:
+            self._executor = ThreadPoolExecutor(self.workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._errors = []
+        self._charts_lock = threading.Lock()
+        self._chart_running = False
+        self._next_chart = None
+
+    def _submit(self, fn, *args):
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._pending_lock:
+            self._pending.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            self._errors.append(future.exception())
+        self._slots.release()
+
+    def submit_frame(self, snapshot):
+        """
+        Queues a frame for rendering. Blocks while the queue is full.
+
+        Parameters:
+            snapshot (StepSnapshot): The state to draw.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the path of the saved PNG.
+        """
+        self._raise_errors()
+        return self._submit(_render_frame, self._init_args, snapshot)
+
+    def submit_chart(self, history, max_points=None):
+        """
+        Queues a population chart export. Blocks while the queue is full. A
+        chart still waiting for the previous one to be exported is replaced.
+
+        Parameters:
+            history (PopulationSeries | dict): Frozen population history (see freeze_history).
+            max_points (int): Thin the history to about this many steps (see export_population_chart).
+
+        Returns:
+            concurrent.futures.Future: Resolves when the chart is saved, or is
+            cancelled when a newer chart replaces it.
+        """
+        self._raise_errors()
+        with self._charts_lock:
+            stale, self._next_chart = self._next_chart, None
+        if stale is not None:
+            stale[0].cancel()
+        self._slots.acquire()
+        job = Future()
+        with self._pending_lock:
+            self._pending.add(job)
+        job.add_done_callback(self._done)
+        with self._charts_lock:
+            self._next_chart = (job, history, max_points)
+            idle, self._chart_running = not self._chart_running, True
+        if idle:
+            self._start_next_chart()
+        return job
+
+    def _start_next_chart(self):
+        """
+        Hands the waiting chart, if any, to the workers.
+        """
+        while True:
+            with self._charts_lock:
+                queued, self._next_chart = self._next_chart, None
+                if queued is None:
+                    self._chart_running = False
+                    return
+            job, history, max_points = queued
+            if not job.set_running_or_notify_cancel():
+                continue
+            try:
+                future = self._executor.submit(_export_chart, history, self.charts_dir, max_points)
+            except BaseException as exc:
+                job.set_exception(exc)
+                continue
+            future.add_done_callback(lambda done: self._chart_done(job, done))
+            return
+
+    def _chart_done(self, job, future):
+        # Start the next chart before resolving this one, so flush() keeps waiting for it.
+        self._start_next_chart()
+        if future.exception() is not None:
+            job.set_exception(future.exception())
+        else:
+            job.set_result(future.result())
+
+    def flush(self):
+        """
+        Waits until every queued job has finished.
+
+        Raises:
+            Exception: The first error raised by a worker, if any.
+        """
+        while True:
+            with self._pending_lock:
+                pending = list(self._pending)
+            if not pending:
+                break
+            for future in pending:
+                future.exception()
+        self._raise_errors()
+
+    def _raise_errors(self):
+        if self._errors:
+            error = self._errors[0]
+            self._errors.clear()
+            raise error
+
+    def close(self):
+        """
+        Flushes the queue and shuts the workers down.
+        """
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,809 @@
+"""
+Tiled domain decomposition of one simulation over several worker processes.
+
+The grid is cut into a rectangular layout of tiles (see TileLayout). Every tile
+is owned by a TileWorker, which keeps the organisms standing on its cells and
+runs the same per-organism logic as SimulationEngine on them. A worker only
+sees the rest of the world through its halo: the live organisms of the
+neighbouring tiles within HALO cells of its border (the largest perception
+radius of chase and flee; proximity mating reaches 2 cells, water and shelter
+effects 1 cell). Halos are exchanged before the movement phase and again
+before the reproduction phase of every step.
+
+A PartitionedEngine coordinates the workers. One step runs in four rounds, in
+each of which all workers work in parallel:
+
+1. ``move``: organisms act in uid order, as in the single-process engine,
+   seeing their own tile live and the halo as it was at the start of the step.
+   Terrain effects and shelters are applied. Organisms that ended up on
+   another tile's cell are handed over to that tile, together with their
+   water and shelter bookkeeping. Every meal of a prey that some other tile
+   sees in its halo, eaten there as a halo organism or here, is filed as a
+   claim with the prey's owner.
+2. ``settle``: migrants are added and claims are resolved by the prey's owner.
+   A prey dies once: the claim of the predator with the lowest uid wins, as
+   it acts first in the single-process engine, and the others give the
+   energy of that meal back.
+3. ``breed``: reproduce() runs restricted to the tile (see
+   ReproductionContext.region)
+   with world-wide live counts. Producers spreading onto another tile's cell
+   are handed over. Pairings involving organisms of the border are reported.
+4. ``finish``: a parent can only pair once per step world-wide, so reported
+   pairings are accepted greedily in parent uid order, the order in which the
+   single-process engine visits them; rejected births are undone. Births are
+   added and the next halo is exported.
+
+World-wide rules (producer respawn after extinction, last-primary fallback,
+the decomposer FIFO) are decided by the coordinator from the workers' counts.
+Every worker draws from its own random stream (see core.rng.spawn_rngs) and
+gives its new organisms uids from its own interleaved sequence, passed to
+reproduce() as ReproductionContext.uids, so a run is determined by its seed
+and layout, whether the workers are processes or not.
+
+With a single tile a run is draw-for-draw identical to a SimulationEngine
+that places the population from the second and steps with the third stream
+spawned from the seed, as long as the producers do not die out (their
+respawn draws from the coordinator's first stream).
+
+With several tiles a run deliberately follows the same rules without being
+draw-for-draw identical to the single-tile run. Organisms act in uid order
+within a tile, but the tiles act in parallel, so an interaction across a
+border sees the other side one phase late: a halo organism is met where it
+stood before the phase, and a prey eaten on both sides is settled afterwards
+(a prey dies once, the lowest predator uid keeps the meal, see settle), as
+are pairings across a border (see finish). Making the tiles agree with the
+serial order would mean a synchronisation per organism near a border, which
+defeats the split. tests/test_partition.py covers the cross-border rules
+(halo claims, migration, contested pairings) one by one and checks that
+over 8 seeds the mean population per species of a 3x3 layout stays within
+25% of the single-tile run.
+
+Example::
+
+    engine = PartitionedEngine(grid_size=5000, steps=100, tiles=(4, 2), seed=1)
+    engine.terrain = terrain
+    engine.setup()
+    engine.run()
+"""
+
+import heapq
+import itertools
+import logging
+import multiprocessing
+import pickle
+from bisect import bisect_right
+from collections import Counter, defaultdict, deque
+from operator import attrgetter
+import numpy as np
+from core.organism import Organism, Consumer, Producer
+from core.rng import spawn_rngs
+from core.spatial import SpatialIndex
+import logic.behavior as behavior
+from logic.behavior import PERCEPTION_RADIUS
+from logic.reproduction import (reproduce, ReproductionContext, producer_respawn_cells, respawn_producers,
+                                primary_fallback_cells)
+from simulation.engine import SimulationEngine
+from statistic_tools.heatmap import HeatmapAccumulator, export_heatmaps
+from statistic_tools.timeseries import PopulationSeries
+from statistic_tools.population import export_population_chart
+
+logger = logging.getLogger(__name__)
+
+HALO = PERCEPTION_RADIUS
+
+_uid = attrgetter("uid")
+
+
+class TileLayout:
+    """
+    Rectangular split of the square grid into tiles_x x tiles_y tiles of
+    near-equal size, numbered row by row.
+
+    Attributes:
+        grid_size (int): Size of the grid.
+        tiles_x (int): Number of tile columns.
+        tiles_y (int): Number of tile rows.
+        halo (int): Halo width in cells.
+        count (int): Number of tiles.
+    """
+
+    def __init__(self, grid_size, tiles_x, tiles_y, halo=HALO):
+        """
+        Parameters:
+            grid_size (int): Size of the grid.
+            tiles_x (int): Number of tile columns.
+            tiles_y (int): Number of tile rows.
+            halo (int): Halo width in cells.
+
+        Raises:
+            ValueError: If a tile would be narrower than the halo.
+        """
+        self.grid_size = grid_size
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_y
+        self.halo = halo
+        self.count = tiles_x * tiles_y
+        self._xs = [round(i * grid_size / tiles_x) for i in range(tiles_x + 1)]
+        self._ys = [round(i * grid_size / tiles_y) for i in range(tiles_y + 1)]
+        narrowest = min(min(np.diff(self._xs)), min(np.diff(self._ys)))
+        if narrowest < max(halo, 1):
+            raise ValueError(f"Tiles of a {grid_size}x{grid_size} grid split {tiles_x}x{tiles_y} "
+                             f"would be narrower than the halo ({halo}).")
+
+    def bounds(self, tile):
+        """
+        Returns:
+            tuple: Cells (x0, y0, x1, y1) owned by a tile, end exclusive.
+        """
+        row, col = divmod(tile, self.tiles_x)
+        return self._xs[col], self._ys[row], self._xs[col + 1], self._ys[row + 1]
+
+    def window(self, tile):
+        """
+        Returns:
+            tuple: The tile's bounds grown by the halo and clipped to the grid.
+        """
+        x0, y0, x1, y1 = self.bounds(tile)
+        h, n = self.halo, self.grid_size
+        return max(0, x0 - h), max(0, y0 - h), min(n, x1 + h), min(n, y1 + h)
+
+    def owner(self, x, y):
+        """
+        Returns:
+            int: Index of the tile owning cell (x, y).
+        """
+        return (bisect_right(self._ys, y) - 1) * self.tiles_x + bisect_right(self._xs, x) - 1
+
+    def watchers(self, x, y):
+        """
+        Returns the tiles whose window contains a cell, i.e. the tiles owning a
+        cell within the halo (Chebyshev distance) of it. Sampling the corners and
+        edge midpoints of that box is enough because no tile is narrower than the halo.
+
+        Returns:
+            set: Tile indices, including the owner of the cell.
+        """
+        h, top = self.halo, self.grid_size - 1
+        cols = {bisect_right(self._xs, min(top, max(0, x + d))) - 1 for d in (-h, 0, h)}
+        rows = {bisect_right(self._ys, min(top, max(0, y + d))) - 1 for d in (-h, 0, h)}
+        return {row * self.tiles_x + col for row in rows for col in cols}
+
+
+class TileWorker:
+    """
+    Owner of the organisms of one tile (see the module docstring for the
+    protocol). Its methods are called by PartitionedEngine, in a worker process
+    or in the calling process.
+
+    Attributes:
+        tile (int): Tile index.
+        region (tuple): Owned cells (x0, y0, x1, y1).
+        window (tuple): Owned cells plus halo; covered by the spatial index and the heatmaps.
+        organisms (list): Owned organisms, sorted by uid.
+        corpses (deque): (step, organism) pairs of the dead organisms buried on this tile.
+        heatmaps (HeatmapAccumulator): Visit counts over the window.
+    """
+
+    def __init__(self, tile, layout, foodweb, terrain, organisms, rng, repro_thresholds, repro_cooldowns,
+                 first_uid):
+        """
+        Parameters:
+            tile (int): Tile index.
+            layout (TileLayout): The layout.
+            foodweb (FoodWeb): Food web.
+            terrain (Terrain): This worker's copy of the terrain, or None.
+            organisms (list): Initial organisms on the tile.
+            rng (RandomSource): This worker's random source.
+            repro_thresholds (dict): Reproduction energy threshold per trophic level.
+            repro_cooldowns (dict): Reproduction cooldown per trophic level.
+            first_uid (int): First uid of the interleaved uid sequence shared by all workers;
+                this worker allocates every count-th uid from first_uid + tile.
+        """
+        self.tile = tile
+        self.layout = layout
+        self.grid_size = layout.grid_size
+        self.region = layout.bounds(tile)
+        self.window = layout.window(tile)
+        self.foodweb = foodweb
+        self.terrain = terrain
+        self.rng = rng
+        self.repro_thresholds = repro_thresholds
+        self.repro_cooldowns = repro_cooldowns
+        self.organisms = sorted(organisms, key=_uid)
+        self.corpses = deque()
+        self.spatial_index = SpatialIndex(self.grid_size, self.organisms, bounds=self.window)
+        x0, y0, x1, y1 = self.window
+        self.heatmaps = HeatmapAccumulator(x1 - x0, y1 - y0, origin=(x0, y0))
+        self._uids = itertools.count(first_uid + tile, layout.count)
+        self._reproduction = ReproductionContext(foodweb, terrain, self.spatial_index, rng, repro_thresholds,
+                                                 repro_cooldowns, region=self.region, uids=self._uids)
+        self._ghosts = {}
+        self._exported = set()
+        self._eaten = set()
+        self._pairings = []
+        self._births = []
+
+    def _bind(self):
+        """
+        Point the terrain's random source at this worker.
+        """
+        if self.terrain is not None:
+            self.terrain.rng = self.rng
+
+    def _install_halo(self, halo):
+        """
+        Index the halo organisms sent by the neighbours.
+
+        Parameters:
+            halo (list): (source tile, organisms) pairs.
+
+        Returns:
+            list: The halo organisms sorted by uid.
+        """
+        ghosts = []
+        for source, orgs in halo:
+            for org in orgs:
+                self._ghosts[org.uid] = source
+                self.spatial_index.insert(org)
+            ghosts.extend(orgs)
+        ghosts.sort(key=_uid)
+        return ghosts
+
+    def _remove_halo(self, ghosts):
+        for org in ghosts:
+            self.spatial_index.remove(org)
+        self._ghosts.clear()
+
+    def _export_halo(self):
+        """
+        Collect the live organisms that lie in the windows of other tiles.
+
+        Returns:
+            dict: Destination tile -> organisms.
+        """
+        x0, y0, x1, y1 = self.region
+        h = self.layout.halo
+        strips = defaultdict(list)
+        self._exported = set()
+        for org in self.organisms:
+            if not org.alive or (x0 + h <= org.x < x1 - h and y0 + h <= org.y < y1 - h):
+                continue
+            for tile in self.layout.watchers(org.x, org.y):
+                if tile != self.tile:
+                    strips[tile].append(org)
+                    self._exported.add(org.uid)
+        return dict(strips)
+
+    def _claim_meals(self, predator, meals, claims):
+        """
+        File a claim for every meal of the predator whose prey is a halo
+        organism or one of the organisms exported to the other tiles' halos,
+        which can be eaten there as well.
+        """
+        for prey, gain in meals:
+            source = self._ghosts.get(prey.uid)
+            if source is None and prey.uid in self._exported:
+                source = self.tile
+                self._eaten.add(prey.uid)
+            if source is not None:
+                claims.append([source, prey.uid, predator.uid, self.tile, gain])
+
+    def _emigrate(self):
+        """
+        Hand over the owned organisms standing outside the tile, with their
+        water and shelter bookkeeping.
+
+        Returns:
+            dict: Destination tile -> (organism, water counters, shelter counters) tuples.
+        """
+        x0, y0, x1, y1 = self.region
+        stay, leaving = [], {}
+        for org in self.organisms:
+            if x0 <= org.x < x1 and y0 <= org.y < y1:
+                stay.append(org)
+            else:
+                leaving[org.uid] = org
+        if not leaving:
+            return {}
+        self.organisms = stay
+        water, shelter = defaultdict(dict), defaultdict(dict)
+        if self.terrain is not None:
+            for table, carried in ((self.terrain.water_counters, water), (self.terrain.shelter_occupants, shelter)):
+                for pos, counts in table.items():
+                    for uid in leaving.keys() & counts.keys():
+                        carried[uid][pos] = counts.pop(uid)
+        emigrants = defaultdict(list)
+        for uid, org in leaving.items():
+            self.spatial_index.remove(org)
+            emigrants[self.layout.owner(org.x, org.y)].append((org, water.get(uid, {}), shelter.get(uid, {})))
+        return dict(emigrants)
+
+    def _immigrate(self, immigrants):
+        for org, water, shelter in immigrants:
+            self.organisms.append(org)
+            self.spatial_index.insert(org)
+            if self.terrain is not None:
+                for pos, count in water.items():
+                    self.terrain.water_counters[pos][org.uid] = count
+                for pos, count in shelter.items():
+                    self.terrain.shelter_occupants.setdefault(pos, {})[org.uid] = count
+        if immigrants:
+            self.organisms.sort(key=_uid)
+
+    def export(self):
+        """
+        Returns:
+            dict: Destination tile -> halo organisms, for the first step.
+        """
+        return self._export_halo()
+
+    def move(self, step, halo):
+        """
+        Movement round: organisms act, terrain effects and shelters are applied
+        and migrants leave.
+
+        Parameters:
+            step (int): Current step.
+            halo (list): (source tile, organisms) pairs.
+
+        Returns:
+            tuple: Meal claims [prey owner, prey uid, predator uid, predator
+            owner, energy gained] and the emigrants per destination tile.
+        """
+        self._bind()
+        ghosts = self._install_halo(halo)
+        claims = []
+        border = bool(self._ghosts or self._exported)
+        living = [org for org in self.organisms if org.alive]
+        for org in living:
+            if isinstance(org, Consumer):
+                meals = org.step(self.grid_size, self.organisms, self.foodweb, behavior, self.terrain,
+                                 index=self.spatial_index, rng=self.rng)
+                if meals and border:
+                    self._claim_meals(org, meals, claims)
+            elif isinstance(org, Producer):
+                org.step(self.grid_size)
+        if self.terrain:
+            for org in living:
+                self.terrain.apply_terrain_effects(org, step)
+        self.heatmaps.add_organisms(living)
+        if self.terrain:
+            self.terrain.update_shelters(self.organisms, index=self.spatial_index)
+        self._remove_halo(ghosts)
+
+        emigrants = self._emigrate()
+        moved = {org.uid: tile for tile, group in emigrants.items() for org, _, _ in group}
+        for claim in claims:
+            claim[3] = moved.get(claim[2], self.tile)
+        return claims, emigrants
+
+    def settle(self, claims, immigrants):
+        """
+        Settling round: migrants arrive and meal claims on owned organisms are
+        resolved. A prey eaten here or still alive goes to the claim with the
+        lowest predator uid; the claims on a prey that died otherwise (e.g.
+        starved) are all rejected.
+
+        Parameters:
+            claims (list): (prey uid, predator uid, predator owner, energy gained) tuples.
+            immigrants (list): (organism, water counters, shelter counters) tuples.
+
+        Returns:
+            tuple: Rejected claims as (predator owner, predator uid, energy
+            gained) tuples, live counts per species and the halo per destination tile.
+        """
+        self._bind()
+        self._immigrate(immigrants)
+        rejected = []
+        if claims:
+            by_uid = {org.uid: org for org in self.organisms}
+            by_prey = defaultdict(list)
+            for prey_uid, predator_uid, predator_tile, gain in claims:
+                by_prey[prey_uid].append((predator_uid, predator_tile, gain))
+            for prey_uid, predators in by_prey.items():
+                predators.sort()
+                prey = by_uid.get(prey_uid)
+                if prey_uid in self._eaten:
+                    predators = predators[1:]
+                elif prey is not None and prey.alive:
+                    prey.alive = False
+                    self.spatial_index.update(prey)
+                    predators = predators[1:]
+                rejected.extend((predator_tile, predator_uid, gain) for predator_uid, predator_tile, gain in predators)
+        self._eaten.clear()
+        counts = Counter(org.species for org in self.organisms if org.alive)
+        return rejected, counts, self._export_halo()
+
+    def breed(self, step, halo, refunds, live_counts, producer_cells, primary_cells):
+        """
+        Reproduction round: rejected meals are given back, reproduce() runs on
+        the tile and the dead are buried.
+
+        Parameters:
+            step (int): Current step.
+            halo (list): (source tile, organisms) pairs.
+            refunds (list): (uid, energy gained) of owned predators whose meal claim was rejected.
+            live_counts (dict): World-wide live counts per species.
+            producer_cells (list): Producer respawn cells on this tile (see producer_respawn_cells).
+            primary_cells (list): Last-primary fallback cells on this tile.
+
+        Returns:
+            tuple: Contested pairings as (parent uid, partner uid, token) tuples,
+            births on other tiles per destination, the number of births and
+            deaths, and the (step, uid) key of the oldest corpse or None.
+        """
+        self._bind()
+        if refunds:
+            by_uid = {org.uid: org for org in self.organisms}
+            for uid, gain in refunds:
+                org = by_uid[uid]
+                org.energy -= gain
+                if org.energy <= 0 and org.alive:
+                    org.alive = False
+                    self.spatial_index.update(org)
+
+        ghosts = self._install_halo(halo)
+        world = list(heapq.merge(self.organisms, ghosts, key=_uid))
+        context = self._reproduction
+        context.live_counts = live_counts
+        context.pairings = self._pairings = []
+        newbies = reproduce(world, self.grid_size, step, context)
+        newbies += respawn_producers(context, world, producer_cells)
+        newbies += [Consumer(species, x, y, trophic_level="primary", uid=next(self._uids))
+                    for species, x, y in primary_cells]
+
+        border = self._ghosts.keys() | self._exported
+        contested = [(o1.uid, o2.uid, token) for token, (o1, o2, _, _) in enumerate(self._pairings)
+                     if o1.uid in border or o2.uid in border]
+        self._remove_halo(ghosts)
+
+        x0, y0, x1, y1 = self.region
+        self._births, abroad = [], defaultdict(list)
+        for org in newbies:
+            if x0 <= org.x < x1 and y0 <= org.y < y1:
+                self._births.append(org)
+            else:
+                abroad[self.layout.owner(org.x, org.y)].append((org, {}, {}))
+
+        survivors = []
+        for org in self.organisms:
+            if org.alive:
+                survivors.append(org)
+            else:
+                self.corpses.append((step, org))
+                self.spatial_index.remove(org)
+        deaths = len(self.organisms) - len(survivors)
+        self.organisms = survivors
+        oldest = (self.corpses[0][0], self.corpses[0][1].uid) if self.corpses else None
+        return contested, dict(abroad), len(newbies), deaths, oldest
+
+    def finish(self, rejected, arrivals, decompose):
+        """
+        Final round: rejected pairings are undone, births are added and the
+        next halo is exported.
+
+        Parameters:
+            rejected (list): Tokens of this tile's rejected pairings.
+            arrivals (list): Births from other tiles, as (organism, {}, {}) tuples.
+            decompose (bool): Remove the oldest corpse of this tile.
+
+        Returns:
+            tuple: Live counts per species, the decomposed (step, organism) pair
+            or None, and the halo per destination tile.
+        """
+        self._bind()
+        dropped = set()
+        for token in rejected:
+            parent, _, child, previous = self._pairings[token]
+            key = (parent.species, (child.x, child.y))
+            if previous is None:
+                self._reproduction.last_repro.pop(key, None)
+            else:
+                self._reproduction.last_repro[key] = previous
+            dropped.add(child.uid)
+        births = [org for org in self._births if org.uid not in dropped]
+        self._births, self._pairings = [], []
+        for org in births:
+            self.organisms.append(org)
+            self.spatial_index.insert(org)
+        self._immigrate(arrivals)
+        decomposed = self.corpses.popleft() if decompose else None
+        counts = Counter(org.species for org in self.organisms if org.alive)
+        return counts, decomposed, self._export_halo()
+
+    def collect(self):
+        """
+        Returns:
+            tuple: The owned organisms, the corpses, the window and the heatmaps.
+        """
+        return self.organisms, list(self.corpses), self.window, self.heatmaps
+
+
+def _serve(conn, worker):
+    """
+    Worker process loop: calls the requested TileWorker methods until None arrives.
+    """
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        name, args = message
+        try:
+            result = (True, getattr(worker, name)(*args))
+        except BaseException as exc:
+            result = (False, exc)
+        conn.send(result)
+    conn.close()
+
+
+class _LocalTile:
+    """
+    Runs a TileWorker in the calling process. The worker (with its own copy
+    of the terrain), the arguments and the results are copied through pickle
+    like they are between processes, so both modes behave the same.
+    """
+
+    def __init__(self, worker):
+        self.worker = pickle.loads(pickle.dumps(worker, pickle.HIGHEST_PROTOCOL))
+        self._result = None
+
+    def send(self, name, args):
+        args = pickle.loads(pickle.dumps(args, pickle.HIGHEST_PROTOCOL))
+        result = getattr(self.worker, name)(*args)
+        self._result = pickle.loads(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+
+    def receive(self):
+        result, self._result = self._result, None
+        return result
+
+    def close(self):
+        pass
+
+
+class _ProcessTile:
+    """
+    Runs a TileWorker in a worker process connected by a pipe.
+    """
+
+    def __init__(self, worker, context):
+        self._conn, child = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child, worker), daemon=True)
+        self._process.start()
+        child.close()
+
+    def send(self, name, args):
+        self._conn.send((name, args))
+
+    def receive(self):
+        ok, result = self._conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def close(self):
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join()
+        self._conn.close()
+
+
+class PartitionedEngine:
+    """
+    Runs a simulation on a grid split into tiles, each owned by a worker
+    (see the module docstring).
+
+    Like SimulationEngine, set ``terrain`` before calling setup(); the initial
+    population is placed by a SimulationEngine, so it follows the same rules.
+    After run() (or collect()) ``organisms``, ``corpses`` and ``heatmaps`` hold
+    the world-wide state; ``population_history`` is kept every step.
+    """
+
+    def __init__(self, grid_size=20, steps=30, foodweb_path="configs/foodweb_config.json", tiles=(2, 2),
+                 processes=True, halo=HALO, headless=True, seed=None, initial_counts=None,
+                 repro_thresholds=None, repro_cooldowns=None):
+        """
+        Parameters:
+        grid_size (int): Size of the simulation grid.
+        steps (int): Total number of simulation steps.
+        foodweb_path (str): Path to food web configuration JSON.
+        tiles (tuple): Number of tile columns and rows.
+        processes (bool): Run every tile in its own worker process (default);
+            otherwise the tiles are run one after the other in this process.
+        halo (int): Halo width in cells; defaults to the perception radius.
+        headless (bool): If False, the population chart and the heatmaps are
+            exported after the run. Per-step frames are not supported.
+        seed: Seed of the run (see core.rng.make_rng). The coordinator and the
+            workers get independent streams spawned from it.
+        initial_counts (dict): Initial number of organisms per species.
+        repro_thresholds (dict): Reproduction energy threshold per trophic level.
+        repro_cooldowns (dict): Reproduction cooldown per trophic level.
+        """
+        self.grid_size = grid_size
+        self.steps = steps
+        self.foodweb_path = foodweb_path
+        self.layout = TileLayout(grid_size, tiles[0], tiles[1], halo)
+        self.processes = processes
+        self.headless = headless
+        self.seed = seed
+        self.initial_counts = initial_counts
+        self.repro_thresholds = repro_thresholds
+        self.repro_cooldowns = repro_cooldowns
+        self.terrain = None
+        self.foodweb = None
+        self.rng = None
+        self.current_step = 0
+        self.organisms = []
+        self.corpses = []
+        self.heatmaps = HeatmapAccumulator(grid_size)
+        self.population_history = PopulationSeries()
+        self._tiles = []
+        self._halo = {}
+        self._last_primary_respawn = {}
+
+    def setup(self):
+        """
+        Place the initial population and start the workers.
+        """
+        rngs = spawn_rngs(self.seed, self.layout.count + 2)
+        self.rng = rngs[0]
+        placer = SimulationEngine(self.grid_size, self.steps, self.foodweb_path, headless=True, seed=rngs[1],
+                                  initial_counts=self.initial_counts, repro_thresholds=self.repro_thresholds,
+                                  repro_cooldowns=self.repro_cooldowns)
+        placer.terrain = self.terrain
+        placer.setup()
+        self.foodweb = placer.foodweb
+        self.decomposition_interval = placer.decomposition_interval
+        self._producer_species = [s for s in self.foodweb.all_species() if self.foodweb.get_type(s) == "Producer"]
+
+        by_tile = defaultdict(list)
+        for org in placer.organisms:
+            by_tile[self.layout.owner(org.x, org.y)].append(org)
+        first_uid = next(Organism._uids)
+        context = multiprocessing.get_context()
+        for tile in range(self.layout.count):
+            worker = TileWorker(tile, self.layout, self.foodweb, self.terrain, by_tile[tile], rngs[tile + 2],
+                                placer.repro_thresholds, placer.repro_cooldowns, first_uid)
+            self._tiles.append(_ProcessTile(worker, context) if self.processes else _LocalTile(worker))
+        self._halo = self._route_halo(self._call("export", [()] * self.layout.count))
+
+    def _call(self, name, args):
+        """
+        Call a TileWorker method on every tile, all tiles working at once.
+
+        Parameters:
+            name (str): Method name.
+            args (list): Argument tuple per tile.
+
+        Returns:
+            list: The result per tile.
+        """
+        for tile, tile_args in zip(self._tiles, args):
+            tile.send(name, tile_args)
+        results, error = [], None
+        for tile in self._tiles:
+            try:
+                results.append(tile.receive())
+            except Exception as exc:
+                error = error or exc
+        if error is not None:
+            raise error
+        return results
+
+    def _route_halo(self, exports):
+        halo = defaultdict(list)
+        for source, strips in enumerate(exports):
+            for dest, orgs in strips.items():
+                halo[dest].append((source, orgs))
+        return halo
+
+    def step(self):
+        """
+        Execute one simulation step on all tiles and advance ``current_step``.
+        """
+        step = self.current_step
+        n = self.layout.count
+
+        moved = self._call("move", [(step, self._halo.get(t, [])) for t in range(n)])
+        immigrants, arrived = defaultdict(list), {}
+        for claims, emigrants in moved:
+            for dest, group in emigrants.items():
+                immigrants[dest].extend(group)
+                arrived.update((org.uid, dest) for org, _, _ in group)
+        claims = defaultdict(list)
+        for tile_claims, _ in moved:
+            for prey_tile, prey_uid, predator_uid, predator_tile, gain in tile_claims:
+                claims[arrived.get(prey_uid, prey_tile)].append((prey_uid, predator_uid, predator_tile, gain))
+
+        settled = self._call("settle", [(claims[t], immigrants[t]) for t in range(n)])
+        refunds = defaultdict(list)
+        live_counts = Counter()
+        for rejected, counts, _ in settled:
+            for predator_tile, predator_uid, gain in rejected:
+                refunds[predator_tile].append((predator_uid, gain))
+            live_counts.update(counts)
+        halo = self._route_halo([strips for _, _, strips in settled])
+
+        producer_cells, primary_cells = defaultdict(list), defaultdict(list)
+        if step % 30 == 0 and not any(live_counts[s] for s in self._producer_species):
+            for species, x, y in producer_respawn_cells(self._producer_species, self.grid_size, self.rng):
+                producer_cells[self.layout.owner(x, y)].append((species, x, y))
+        for species, x, y in primary_fallback_cells(live_counts, step, self.foodweb, self.terrain,
+                                                    self._last_primary_respawn):
+            primary_cells[self.layout.owner(x, y)].append((species, x, y))
+
+        bred = self._call("breed", [(step, halo.get(t, []), refunds[t], dict(live_counts), producer_cells[t],
+                                     primary_cells[t]) for t in range(n)])
+        contested, arrivals = [], defaultdict(list)
+        births = deaths = 0
+        oldest = []
+        for tile, (tile_contested, abroad, born, died, head) in enumerate(bred):
+            contested.extend((uid1, uid2, tile, token) for uid1, uid2, token in tile_contested)
+            for dest, group in abroad.items():
+                arrivals[dest].extend(group)
+            births += born
+            deaths += died
+            if head is not None:
+                oldest.append((head, tile))
+        rejected = defaultdict(list)
+        paired = set()
+        for uid1, uid2, tile, token in sorted(contested):
+            if uid1 in paired or uid2 in paired:
+                rejected[tile].append(token)
+                births -= 1
+            else:
+                paired.update((uid1, uid2))
+        decompose = None
+        if step > 0 and step % self.decomposition_interval == 0 and oldest:
+            decompose = min(oldest)[1]
+
+        finished = self._call("finish", [(rejected[t], arrivals[t], t == decompose) for t in range(n)])
+        species_counts = Counter()
+        for counts, decomposed, _ in finished:
+            species_counts.update(counts)
+            if decomposed is not None:
+                logger.info("Decomposed: %r (died at step %d)", decomposed[1], decomposed[0])
+        self._halo = self._route_halo([strips for _, _, strips in finished])
+
+        self.population_history.append({species: species_counts.get(species, 0)
+                                         for species in self.foodweb.all_species()})
+        logger.info("Step %d: %d alive, %d born, %d died", step, sum(species_counts.values()), births, deaths)
+        self.current_step += 1
+
+    def collect(self):
+        """
+        Gather the organisms, corpses and heatmaps of all tiles into
+        ``organisms``, ``corpses`` and ``heatmaps``.
+        """
+        self.organisms, corpses = [], []
+        self.heatmaps = HeatmapAccumulator(self.grid_size)
+        for organisms, tile_corpses, _, heatmaps in self._call("collect", [()] * self.layout.count):
+            self.organisms.extend(organisms)
+            corpses.extend(tile_corpses)
+            self.heatmaps.merge(heatmaps)
+        self.organisms.sort(key=_uid)
+        self.corpses = sorted(corpses, key=lambda c: (c[0], c[1].uid))
+
+    def close(self):
+        """
+        Stop the workers.
+        """
+        for tile in self._tiles:
+            tile.close()
+        self._tiles = []
+
+    def run(self):
+        """
+        Execute the remaining steps, collect the world-wide state and stop the
+        workers. Unless headless, the population chart and the heatmaps are exported.
+        """
+        try:
+            while self.current_step < self.steps:
+                self.step()
+            self.collect()
+        finally:
+            self.close()
+        if not self.headless:
+            export_population_chart(self.population_history)
+            export_heatmaps(self.heatmaps)
@@ -0,0 +1,292 @@
+import json
+import os
+import zlib
+from types import SimpleNamespace
+import numpy as np
+from simulation.recorder import COLUMNS, CHUNKS_FILE, INDEX_DTYPE, INDEX_FILE, META_FILE, TERRAIN_FILE, column_file
+from simulation.output import StepSnapshot
+from visualizer.plot import FrameRenderer, get_species_colors_for
+from statistic_tools.heatmap import export_heatmaps
+from statistic_tools.population import export_population_chart
+
+
+def _map(path, dtype):
+    # np.memmap refuses empty files, so an empty recording maps to an empty array.
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class ChunkedColumn:
+    """
+    Read-only column of a recording, stored as zlib-compressed chunks (see
+    TrajectoryRecorder). Slicing it decompresses only the chunks holding the
+    requested rows; the last decompressed chunk is kept, so reading the steps
+    in order decompresses every chunk once.
+
+    Attributes:
+        dtype (numpy.dtype): Dtype of the values.
+    """
+
+    def __init__(self, path, dtype, row_ends, byte_ends):
+        """
+        Parameters:
+            path (str): Compressed column file.
+            dtype (numpy.dtype): Dtype of the values.
+            row_ends (numpy.ndarray): End row of every chunk.
+            byte_ends (numpy.ndarray): End offset of every chunk in the file.
+        """
+        self.dtype = np.dtype(dtype)
+        self._data = _map(path, np.uint8)
+        self._row_ends = np.asarray(row_ends)
+        self._byte_ends = np.asarray(byte_ends)
+        self._cached = (None, None)
+
+    def __len__(self):
+        return int(self._row_ends[-1]) if len(self._row_ends) else 0
+
+    def _chunk(self, i):
+        if self._cached[0] != i:
+            start = int(self._byte_ends[i - 1]) if i else 0
+            data = zlib.decompress(self._data[start:int(self._byte_ends[i])])
+            self._cached = (i, np.frombuffer(data, dtype=self.dtype))
+        return self._cached[1]
+
+    def __getitem__(self, key):
+        """
+        Returns the values of a slice of rows, or of any other index applied
+        to the whole column.
+        """
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            return self[:][key]
+        start, stop, _ = key.indices(len(self))
+        if start >= stop:
+            return np.empty(0, dtype=self.dtype)
+        first = int(np.searchsorted(self._row_ends, start, side="right"))
+        last = int(np.searchsorted(self._row_ends, stop - 1, side="right"))
+        offset = int(self._row_ends[first - 1]) if first else 0
+        values = [self._chunk(i) for i in range(first, last + 1)]
+        values = values[0] if len(values) == 1 else np.concatenate(values)
+        return values[start - offset:stop - offset]
+
+    def __array__(self, dtype=None, copy=None):
+        values = self[:]
+        return values if dtype is None else values.astype(dtype)
+
+
+class Trajectory:
+    """
+    Read-only, memory-mapped view of a recording made by TrajectoryRecorder.
+
+    Opening a trajectory only maps the column files; the chunks holding rows
+    are decompressed when the rows are accessed (see ChunkedColumn). Looking up
+    a step is a binary search in the step index, so any step can be reached in
+    constant time regardless of the run length. Frames, heatmaps and population
+    charts are regenerated from the recorded rows without running the simulation.
+
+    Attributes:
+        directory (str): Recording directory.
+        grid_size (int): Size of the simulation grid.
+        species_names (list): Species name of every species id.
+        steps (numpy.ndarray): Recorded step numbers, in order.
+        columns (dict): Column name -> ChunkedColumn of all rows.
+        terrain (object): Recorded terrain (grid and types), or None.
+    """
+
+    def __init__(self, directory):
+        """
+        Maps the recording in the given directory.
+
+        Parameters:
+            directory (str): Directory written by TrajectoryRecorder.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as fp:
+            meta = json.load(fp)
+        self.grid_size = meta["grid_size"]
+        self.species_names = list(meta["species"])
+        index = _map(os.path.join(directory, INDEX_FILE), INDEX_DTYPE)
+        # Only expose what meta.json vouches for, in case a writer is still appending.
+        self._index = index[:3 * meta["steps"]].reshape(-1, 3)
+        self.steps = self._index[:, 0]
+        chunks = _map(os.path.join(directory, CHUNKS_FILE), INDEX_DTYPE)
+        chunks = chunks[:meta["chunks"] * (1 + len(COLUMNS))].reshape(-1, 1 + len(COLUMNS))
+        self.columns = {
+            name: ChunkedColumn(os.path.join(directory, column_file(name)), dtype, chunks[:, 0], chunks[:, 1 + i])
+            for i, (name, dtype) in enumerate(COLUMNS.items())
+        }
+        self.terrain = None
+        terrain_path = os.path.join(directory, TERRAIN_FILE)
+        if os.path.exists(terrain_path):
+            self.terrain = SimpleNamespace(grid=np.load(terrain_path, mmap_mode="r"), types=meta["terrain_types"])
+
+    def __len__(self):
+        """
+        Returns:
+            int: Number of recorded steps.
+        """
+        return len(self.steps)
+
+    def rows(self, step):
+        """
+        Returns the row range of a recorded step.
+
+        Parameters:
+            step (int): Simulation step.
+
+        Returns:
+            slice: Rows of the step in every column.
+
+        Raises:
+            KeyError: If the step was not recorded.
+        """
+        i = int(np.searchsorted(self.steps, step))
+        if i == len(self.steps) or self.steps[i] != step:
+            raise KeyError(f"Step {step} is not in the recording.")
+        _, start, count = self._index[i]
+        return slice(int(start), int(start + count))
+
+    def _row_span(self, start=None, stop=None):
+        """
+        Returns the positions in the step index and the row range of the
+        recorded steps with start <= step < stop.
+        """
+        first = 0 if start is None else int(np.searchsorted(self.steps, start))
+        last = len(self.steps) if stop is None else int(np.searchsorted(self.steps, stop))
+        if first >= last:
+            return first, last, slice(0, 0)
+        row_start = int(self._index[first, 1])
+        row_stop = int(self._index[last - 1, 1] + self._index[last - 1, 2])
+        return first, last, slice(row_start, row_stop)
+
+    def state(self, step):
+        """
+        Returns the recorded columns of one step.
+
+        Parameters:
+            step (int): Simulation step.
+
+        Returns:
+            dict: Column name -> array of the step's rows.
+        """
+        rows = self.rows(step)
+        return {name: column[rows] for name, column in self.columns.items()}
+
+    def snapshot(self, step):
+        """
+        Returns one step as a StepSnapshot, the input of the frame renderers.
+
+        Parameters:
+            step (int): Simulation step.
+
+        Returns:
+            StepSnapshot: Positions, species names and alive flags of the step.
+        """
+        state = self.state(step)
+        names = np.array(self.species_names, dtype=object)
+        return StepSnapshot(step, np.asarray(state["x"]), np.asarray(state["y"]),
+                            names[state["species"]], np.asarray(state["alive"]))
+
+    def population_history(self, start=None, stop=None):
+        """
+        Counts the live organisms of every species at every recorded step.
+
+        Parameters:
+            start (int): First step (inclusive); the first recorded step if None.
+            stop (int): Last step (exclusive); past the last recorded step if None.
+
+        Returns:
+            dict: Species -> list of counts, one per recorded step in the range,
+            in the format of SimulationEngine.population_history.
+        """
+        first, last, rows = self._row_span(start, stop)
+        n_species = len(self.species_names)
+        counts = self._index[first:last, 2]
+        step_of_row = np.repeat(np.arange(last - first), counts)
+        alive = np.asarray(self.columns["alive"][rows])
+        keys = step_of_row[alive] * n_species + self.columns["species"][rows][alive]
+        table = np.bincount(keys, minlength=(last - first) * n_species).reshape(last - first, n_species)
+        return {name: table[:, sid].tolist() for sid, name in enumerate(self.species_names)}
+
+    def heatmaps(self, start=None, stop=None):
+        """
+        Counts how often live organisms of every species stood on each cell.
+
+        Parameters:
+            start (int): First step (inclusive); the first recorded step if None.
+            stop (int): Last step (exclusive); past the last recorded step if None.
+
+        Returns:
+            dict: Species -> count grid indexed [y, x], for the species seen in the range.
+        """
+        _, _, rows = self._row_span(start, stop)
+        g = self.grid_size
+        alive = np.asarray(self.columns["alive"][rows])
+        species = self.columns["species"][rows][alive].astype(np.int64)
+        cells = self.columns["y"][rows][alive].astype(np.int64) * g + self.columns["x"][rows][alive]
+        grids = np.bincount(species * g * g + cells, minlength=len(self.species_names) * g * g)
+        grids = grids.reshape(len(self.species_names), g, g)
+        return {name: grids[sid] for sid, name in enumerate(self.species_names) if grids[sid].any()}
+
+    def render_frames(self, start=None, stop=None, every=1, output_dir="frames", foodweb=None):
+        """
+        Regenerates the organism frames (as written by plot_organisms) of a step range.
+
+        Parameters:
+            start (int): First step (inclusive); the first recorded step if None.
+            stop (int): Last step (exclusive); past the last recorded step if None.
+            every (int): Render every N-th recorded step of the range (default is 1).
+            output_dir (str): Directory to save the PNGs (default is "frames").
+            foodweb (object): Optional foodweb for the species colors.
+
+        Returns:
+            list: Paths of the saved PNGs.
+        """
+        first, last, _ = self._row_span(start, stop)
+        colors = get_species_colors_for(self.species_names, foodweb=foodweb)
+        renderer = FrameRenderer(self.grid_size, output_dir=output_dir, terrain=self.terrain, colors=colors)
+        paths = []
+        try:
+            for step in self.steps[first:last:max(1, every)]:
+                snapshot = self.snapshot(int(step))
+                paths.append(renderer.draw_arrays(snapshot.step, snapshot.xs, snapshot.ys,
+                                                  snapshot.species, snapshot.alive))
+        finally:
+            renderer.close()
+        return paths
+
+    def export_heatmaps(self, start=None, stop=None, output_dir="statistics_plots"):
+        """
+        Regenerates the heatmap images of a step range (see export_heatmaps).
+
+        Parameters:
+            start (int): First step (inclusive); the first recorded step if None.
+            stop (int): Last step (exclusive); past the last recorded step if None.
+            output_dir (str): Output directory (default is "statistics_plots").
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        export_heatmaps(self.heatmaps(start, stop), output_dir=output_dir)
+
+    def export_population_chart(self, start=None, stop=None, output_dir="statistics_plots"):
+        """
+        Regenerates the population chart of a step range (see export_population_chart).
+
+        Parameters:
+            start (int): First step (inclusive); the first recorded step if None.
+            stop (int): Last step (exclusive); past the last recorded step if None.
+            output_dir (str): Output directory (default is "statistics_plots").
+        """
+        export_population_chart(self.population_history(start, stop), output_dir=output_dir)
+
+
+def open_trajectory(directory):
+    """
+    Opens a recording for replay.
+
+    Parameters:
+        directory (str): Directory written by TrajectoryRecorder.
+
+    Returns:
+        Trajectory: The memory-mapped recording.
+    """
+    return Trajectory(directory)
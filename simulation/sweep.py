@@ -0,0 +1,217 @@
+"""
+Parameter sweeps over headless simulation runs.
+
+A parameter grid maps parameter names to lists of values; every combination is
+one run configuration. Names are engine parameters (``grid_size``, ``steps``,
+``seed``, ...) or dotted names setting one entry of a dict parameter, e.g.
+``initial_counts.Rabbit``, ``repro_thresholds.primary`` or
+``repro_cooldowns.secondary``. Runs are fanned out over a process pool and their
+population histories are appended to one tidy CSV table with one row per
+configuration, step and species. Configurations whose hash is already in the
+table are skipped, so an interrupted sweep resumes where it stopped.
+
+Example::
+
+    python -m simulation.sweep grid.json --out sweep.csv --workers 8
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core.terrain import Terrain
+from simulation.engine import SimulationEngine
+
+DICT_PARAMS = ("initial_counts", "repro_thresholds", "repro_cooldowns")
+RESULT_COLUMNS = ("step", "species", "count")
+
+
+def expand_grid(grid):
+    """
+    Expands a parameter grid into the list of its configurations.
+
+    Parameters:
+        grid (dict): Parameter name -> list of values (a single value is used as is).
+
+    Returns:
+        list: One dict of flat parameter names per combination, in grid order.
+    """
+    names = list(grid)
+    values = [v if isinstance(v, (list, tuple)) else [v] for v in grid.values()]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def config_hash(config):
+    """
+    Returns a stable short hash of a configuration.
+
+    Parameters:
+        config (dict): Flat configuration.
+
+    Returns:
+        str: 16 hex digits.
+    """
+    text = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def engine_kwargs(config):
+    """
+    Turns a flat configuration into SimulationEngine keyword arguments.
+
+    Parameters:
+        config (dict): Flat configuration with optional dotted names.
+
+    Returns:
+        dict: Keyword arguments, with dotted names gathered into dicts.
+
+    Raises:
+        ValueError: If a dotted name does not refer to a dict parameter.
+    """
+    kwargs = {}
+    for name, value in config.items():
+        if "." in name:
+            param, key = name.split(".", 1)
+            if param not in DICT_PARAMS:
+                raise ValueError(f"Unknown dict parameter in sweep: {param}")
+            kwargs.setdefault(param, {})[key] = value
+        else:
+            kwargs[name] = value
+    return kwargs
+
+
+def run_config(config, foodweb_path="configs/foodweb_config.json", terrain_config_path=None):
+    """
+    Runs one headless simulation and returns its population history as tidy rows.
+
+    Without a terrain configuration the terrain is generated from the run's seed,
+    like mainsimulation.main.simulation does.
+
+    Parameters:
+        config (dict): Flat configuration (see expand_grid).
+        foodweb_path (str): Path to the food web configuration JSON.
+        terrain_config_path (str): Optional terrain configuration JSON.
+
+    Returns:
+        list: (step, species, count) tuples.
+    """
+    logging.getLogger("simulation").setLevel(logging.WARNING)
+    kwargs = engine_kwargs(config)
+    kwargs.setdefault("grid_size", 20)
+    engine = SimulationEngine(foodweb_path=foodweb_path, headless=True, **kwargs)
+    terrain = Terrain(engine.grid_size, rng=engine.rng)
+    if terrain_config_path and os.path.exists(terrain_config_path):
+        terrain.load_from_config(terrain_config_path)
+    else:
+        terrain.generate_water()
+        terrain.generate_trees()
+        terrain.generate_hills()
+        terrain.generate_shelters()
+    engine.terrain = terrain
+    engine.setup()
+    engine.run()
+    return [(step, species, count)
+            for species, counts in engine.population_history.items()
+            for step, count in enumerate(counts)]
+
+
+def _run_job(config, foodweb_path, terrain_config_path):
+    return config, run_config(config, foodweb_path, terrain_config_path)
+
+
+def completed_hashes(path):
+    """
+    Reads the configuration hashes already present in a result table.
+
+    Parameters:
+        path (str): CSV written by run_sweep.
+
+    Returns:
+        set: The hashes, empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline="", encoding="utf-8") as fp:
+        return {row["config_hash"] for row in csv.DictReader(fp)}
+
+
+def run_sweep(grid, output_path, workers=None, foodweb_path="configs/foodweb_config.json",
+              terrain_config_path=None):
+    """
+    Runs every configuration of a parameter grid on a process pool.
+
+    The rows of each finished run are appended to ``output_path`` at once, with
+    the columns config_hash, the grid parameters, step, species and count.
+    Configurations already in the file are not run again.
+
+    Parameters:
+        grid (dict): Parameter grid (see expand_grid).
+        output_path (str): Result CSV file.
+        workers (int): Number of worker processes; defaults to the CPU count.
+        foodweb_path (str): Path to the food web configuration JSON.
+        terrain_config_path (str): Optional terrain configuration JSON.
+
+    Returns:
+        int: Number of configurations run (skipped ones not included).
+
+    Raises:
+        ValueError: If output_path holds results of a grid with other parameters.
+    """
+    configs = expand_grid(grid)
+    params = list(grid)
+    header = ["config_hash", *params, *RESULT_COLUMNS]
+    done = completed_hashes(output_path)
+    if os.path.exists(output_path):
+        with open(output_path, newline="", encoding="utf-8") as fp:
+            existing = next(csv.reader(fp), None)
+        if existing and existing != header:
+            raise ValueError(f"{output_path} has columns {existing}, expected {header}.")
+    todo = [config for config in configs if config_hash(config) not in done]
+    if not todo:
+        return 0
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    write_header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+    with open(output_path, "a", newline="", encoding="utf-8") as fp, \
+            ProcessPoolExecutor(workers) as pool:
+        writer = csv.writer(fp)
+        if write_header:
+            writer.writerow(header)
+        futures = [pool.submit(_run_job, config, foodweb_path, terrain_config_path) for config in todo]
+        for future in as_completed(futures):
+            config, rows = future.result()
+            key = config_hash(config)
+            values = [config[name] for name in params]
+            writer.writerows([key, *values, *row] for row in rows)
+            fp.flush()
+    return len(todo)
+
+
+def main(argv=None):
+    """
+    Command line entry point, see the module docstring.
+    """
+    parser = argparse.ArgumentParser(description="Run a parameter sweep of headless simulations.")
+    parser.add_argument("grid", help="JSON file mapping parameter names to lists of values")
+    parser.add_argument("--out", default="statistics_plots/sweep.csv", help="result CSV (appended, resumable)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--foodweb", default="configs/foodweb_config.json", help="food web configuration")
+    parser.add_argument("--terrain", default=None, help="terrain configuration (default: generated per seed)")
+    args = parser.parse_args(argv)
+
+    with open(args.grid, encoding="utf-8") as fp:
+        grid = json.load(fp)
+    total = len(expand_grid(grid))
+    ran = run_sweep(grid, args.out, workers=args.workers, foodweb_path=args.foodweb,
+                    terrain_config_path=args.terrain)
+    print(f"✅ {ran} of {total} configurations run, results in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import csv
+import os
+import numpy as np
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def quantile_label(p):
+    """
+    Returns the column name of a quantile, e.g. 'q05' for 0.05 and 'q50' for the median.
+    """
+    return f"q{round(p * 100):02d}"
+
+
+class WelfordAccumulator:
+    """
+    Online mean and variance of equally shaped arrays (Welford's algorithm).
+
+    Every added array is one observation; statistics are kept element-wise, so
+    memory is that of three arrays whatever the number of observations. Partial
+    accumulators (e.g. from different workers) can be combined with merge().
+
+    Attributes:
+        count (int): Number of observations.
+        mean (numpy.ndarray): Element-wise mean.
+        m2 (numpy.ndarray): Element-wise sum of squared deviations from the mean.
+    """
+
+    def __init__(self, shape):
+        """
+        Parameters:
+            shape (tuple): Shape of the observations.
+        """
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def add(self, x):
+        """
+        Adds one observation.
+
+        Parameters:
+            x (numpy.ndarray): Observation of the accumulator's shape.
+        """
+        x = np.asarray(x, dtype=float)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other):
+        """
+        Adds all observations of another accumulator (Chan et al. pairwise update).
+
+        Parameters:
+            other (WelfordAccumulator): Accumulator of the same shape.
+        """
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * (other.count / total)
+        self.m2 += other.m2 + delta ** 2 * (self.count * other.count / total)
+        self.count = total
+
+    def variance(self, ddof=1):
+        """
+        Returns:
+            numpy.ndarray: Element-wise variance (NaN with fewer than ddof + 1 observations).
+        """
+        if self.count <= ddof:
+            return np.full(self.mean.shape, np.nan)
+        return self.m2 / (self.count - ddof)
+
+
+class P2Quantiles:
+    """
+    Streaming quantile estimates of equally shaped arrays (P-square algorithm).
+
+    The P-square algorithm of Jain and Chlamtac keeps five markers per quantile
+    and moves them with piecewise-parabolic interpolation as observations
+    arrive, so no observation is stored. Here all quantiles and all elements of
+    the observations are updated at once with array operations. Until five
+    observations are seen the exact sample quantiles are returned.
+
+    Attributes:
+        quantiles (numpy.ndarray): The estimated probabilities.
+        count (int): Number of observations.
+    """
+
+    def __init__(self, shape, quantiles=DEFAULT_QUANTILES):
+        """
+        Parameters:
+            shape (tuple): Shape of the observations.
+            quantiles (tuple): Probabilities to estimate, in (0, 1).
+        """
+        self.quantiles = np.asarray(quantiles, dtype=float)
+        self.shape = tuple(shape)
+        self.count = 0
+        self._first = []
+        p = self.quantiles.reshape((-1,) + (1,) * len(self.shape))
+        ones = np.ones((len(self.quantiles),) + self.shape)
+        self._desired = np.stack([ones, 1 + 2 * p * ones, 1 + 4 * p * ones, 3 + 2 * p * ones, 5 * ones])
+        self._increments = np.stack([0 * ones, p / 2 * ones, p * ones, (1 + p) / 2 * ones, ones])
+        self._heights = None
+        self._positions = None
+
+    def add(self, x):
+        """
+        Adds one observation.
+
+        Parameters:
+            x (numpy.ndarray): Observation of the estimator's shape.
+        """
+        x = np.broadcast_to(np.asarray(x, dtype=float), self.shape)
+        self.count += 1
+        if self._heights is None:
+            self._first.append(np.array(x))
+            if len(self._first) == 5:
+                initial = np.sort(np.stack(self._first), axis=0)
+                self._heights = np.repeat(initial[:, None], len(self.quantiles), axis=1)
+                self._positions = np.stack([np.full(self._heights.shape[1:], i + 1.0) for i in range(5)])
+                self._first = []
+            return
+
+        q, n = self._heights, self._positions
+        x = np.broadcast_to(x, q.shape[1:])
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+        k = (x >= q[1]).astype(int) + (x >= q[2]) + (x >= q[3])
+        for i in range(1, 5):
+            n[i] += k < i
+        self._desired += self._increments
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i in (1, 2, 3):
+                d = self._desired[i] - n[i]
+                move = ((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1))
+                if not move.any():
+                    continue
+                s = np.sign(d)
+                parabolic = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                neighbour_q = np.where(s > 0, q[i + 1], q[i - 1])
+                neighbour_n = np.where(s > 0, n[i + 1], n[i - 1])
+                linear = q[i] + s * (neighbour_q - q[i]) / (neighbour_n - n[i])
+                inside = (q[i - 1] < parabolic) & (parabolic < q[i + 1])
+                q[i] = np.where(move, np.where(inside, parabolic, linear), q[i])
+                n[i] = np.where(move, n[i] + s, n[i])
+
+    def estimates(self):
+        """
+        Returns:
+            numpy.ndarray: Estimates of shape (len(quantiles),) + shape; NaN before
+            the first observation.
+        """
+        if self._heights is not None:
+            return self._heights[2].copy()
+        if not self._first:
+            return np.full((len(self.quantiles),) + self.shape, np.nan)
+        return np.quantile(np.stack(self._first), self.quantiles, axis=0)
+
+
+class EnsembleStats:
+    """
+    Per-step population statistics over an ensemble of replicate runs.
+
+    Population histories are added one replicate at a time and folded into a
+    WelfordAccumulator (mean, variance) and a P2Quantiles estimator, both over
+    a (species, step) array. Memory is O(species x steps) regardless of the
+    number of replicates.
+
+    Attributes:
+        species (list): Species in row order.
+        steps (int): Number of steps per replicate.
+        quantiles (tuple): Estimated quantile probabilities.
+        moments (WelfordAccumulator): Mean and variance accumulator.
+        bands (P2Quantiles): Quantile estimator.
+    """
+
+    def __init__(self, species, steps, quantiles=DEFAULT_QUANTILES):
+        """
+        Parameters:
+            species (list): Species names.
+            steps (int): Number of steps per replicate.
+            quantiles (tuple): Quantile probabilities to estimate.
+        """
+        self.species = list(species)
+        self.steps = steps
+        self.quantiles = tuple(quantiles)
+        shape = (len(self.species), steps)
+        self.moments = WelfordAccumulator(shape)
+        self.bands = P2Quantiles(shape, quantiles)
+
+    @property
+    def count(self):
+        """
+        Returns:
+            int: Number of replicates added.
+        """
+        return self.moments.count
+
+    def add(self, population_history):
+        """
+        Adds the population history of one replicate.
+
+        Parameters:
+            population_history (dict): Species -> list of counts per step. Missing
+                species count as 0.
+
+        Raises:
+            ValueError: If a history does not have ``steps`` entries.
+        """
+        counts = np.zeros((len(self.species), self.steps))
+        for row, species in enumerate(self.species):
+            history = population_history.get(species)
+            if history is None:
+                continue
+            if len(history) != self.steps:
+                raise ValueError(f"History of {species} has {len(history)} steps, expected {self.steps}.")
+            counts[row] = history
+        self.moments.add(counts)
+        self.bands.add(counts)
+
+    def summary(self):
+        """
+        Returns the statistics per species.
+
+        Returns:
+            dict: Species -> {"mean", "var", "std", and one key per quantile label
+            (e.g. "q05")} -> numpy array over steps.
+        """
+        variance = self.moments.variance()
+        estimates = self.bands.estimates()
+        result = {}
+        for row, species in enumerate(self.species):
+            stats = {"mean": self.moments.mean[row], "var": variance[row], "std": np.sqrt(variance[row])}
+            for i, p in enumerate(self.quantiles):
+                stats[quantile_label(p)] = estimates[i, row]
+            result[species] = stats
+        return result
+
+    def write_csv(self, path):
+        """
+        Writes the statistics as a tidy table with one row per step and species.
+
+        Parameters:
+            path (str): Output CSV file.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        summary = self.summary()
+        labels = ["mean", "var", "std"] + [quantile_label(p) for p in self.quantiles]
+        with open(path, "w", newline="", encoding="utf-8") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(["step", "species", "replicates", *labels])
+            for species, stats in summary.items():
+                for step in range(self.steps):
+                    writer.writerow([step, species, self.count, *(float(stats[label][step]) for label in labels)])
+
+
+def read_ensemble_csv(path):
+    """
+    Reads a table written by EnsembleStats.write_csv back into the summary format.
+
+    Parameters:
+        path (str): CSV file.
+
+    Returns:
+        dict: Species -> statistic name -> numpy array over steps.
+    """
+    columns = {}
+    with open(path, newline="", encoding="utf-8") as fp:
+        for row in csv.DictReader(fp):
+            stats = columns.setdefault(row["species"], {})
+            for name, value in row.items():
+                if name not in ("step", "species", "replicates"):
+                    stats.setdefault(name, []).append(float(value))
+    return {species: {name: np.array(values) for name, values in stats.items()}
+            for species, stats in columns.items()}
@@ -4,24 +4,274 @@ import os
 import matplotlib.pyplot as plt
 import numpy as np
 from IPython.display import Image, display
+from collections.abc import Mapping
 
-def export_heatmaps(heatmaps, output_dir="statistics_plots"):
+
+def downsample_heatmap(grid, factor):
+    """
+    Sums the counts of factor x factor blocks of a heatmap. Grids whose size is
+    not a multiple of factor are padded with zeros.
+
+    Parameters:
+        grid (numpy.ndarray): Count grid indexed [y, x].
+        factor (int): Block edge length.
+
+    Returns:
+        numpy.ndarray: Grid of ceil(height / factor) x ceil(width / factor) block sums.
+    """
+    grid = np.asarray(grid)
+    if factor == 1:
+        return grid
+    pad_y, pad_x = -grid.shape[0] % factor, -grid.shape[1] % factor
+    if pad_y or pad_x:
+        grid = np.pad(grid, ((0, pad_y), (0, pad_x)))
+    height, width = grid.shape[0] // factor, grid.shape[1] // factor
+    return grid.reshape(height, factor, width, factor).sum(axis=(1, 3))
+
+
+class HeatmapAccumulator(Mapping):
+    """
+    Visit counts per species and cell, added a whole population at a time.
+
+    Counts are ``uint32``. Dense storage keeps one grid per species at
+    ``block`` resolution, i.e. every block x block square of cells shares one
+    counter, which divides the memory by block squared. Sparse storage keeps
+    only the visited cells as sorted (key, count) arrays and suits huge grids
+    of which organisms visit a small part; new visits are buffered and merged
+    in batches.
+
+    As a mapping it gives species -> count grid indexed [y, x] at block
+    resolution, so it can be used wherever a dict of grids was.
+
+    Attributes:
+        width (int): Width of the covered area in cells.
+        height (int): Height of the covered area in cells.
+        origin (tuple): Grid coordinates (x, y) of the area's first cell.
+        block (int): Cells per counter along each axis.
+        sparse (bool): Whether the sparse storage is used.
+        species (list): Species seen so far, in the order of their codes.
+    """
+
+    def __init__(self, width, height=None, origin=(0, 0), block=1, sparse=False):
+        """
+        Parameters:
+            width (int): Width of the covered area in cells.
+            height (int): Height of the covered area; defaults to width.
+            origin (tuple): Grid coordinates (x, y) of the area's first cell.
+            block (int): Cells per counter along each axis (default is 1).
+            sparse (bool): Keep only the visited cells (default is False).
+        """
+        if block < 1:
+            raise ValueError(f"Heatmap block must be at least 1, got {block}.")
+        self.width = width
+        self.height = width if height is None else height
+        self.origin = tuple(origin)
+        self.block = block
+        self.sparse = sparse
+        self.species = []
+        self._codes = {}
+        self._shape = (-(-self.height // block), -(-self.width // block))
+        self._dense = np.zeros((0,) + self._shape, dtype=np.uint32)
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._counts = np.zeros(0, dtype=np.uint32)
+        self._pending = []
+        self._pending_size = 0
+
+    def __getitem__(self, species):
+        code = self._codes[species]
+        if self.sparse:
+            return self._sparse_grid(code, 1)
+        return self._dense[code]
+
+    def __iter__(self):
+        return iter(self.species)
+
+    def __len__(self):
+        return len(self.species)
+
+    @property
+    def shape(self):
+        """
+        Returns:
+            tuple: Shape (rows, columns) of a species grid.
+        """
+        return self._shape
+
+    def add_organisms(self, organisms):
+        """
+        Counts one visit of every organism at its cell. Organisms outside the
+        covered area are ignored.
+
+        Parameters:
+            organisms (list): Organisms with species, x and y.
+        """
+        n = len(organisms)
+        if not n:
+            return
+        xs = np.fromiter((org.x for org in organisms), np.int64, n)
+        ys = np.fromiter((org.y for org in organisms), np.int64, n)
+        self._add(self._encode([org.species for org in organisms]), xs, ys)
+
+    def add(self, species, xs, ys, counts=None):
+        """
+        Counts visits of one species.
+
+        Parameters:
+            species (str): Species name.
+            xs (numpy.ndarray): Grid x coordinates.
+            ys (numpy.ndarray): Grid y coordinates.
+            counts (numpy.ndarray): Visits per coordinate; one each if None.
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        codes = np.full(len(xs), self._code(species), dtype=np.int64)
+        self._add(codes, xs, np.asarray(ys, dtype=np.int64), counts)
+
+    def add_grid(self, species, grid, origin=(0, 0)):
+        """
+        Adds a full-resolution count grid of one species.
+
+        Parameters:
+            species (str): Species name.
+            grid (numpy.ndarray): Counts indexed [y, x].
+            origin (tuple): Grid coordinates (x, y) of the grid's first cell.
+        """
+        ys, xs = np.nonzero(grid)
+        self.add(species, xs + origin[0], ys + origin[1], np.asarray(grid)[ys, xs])
+
+    def merge(self, other):
+        """
+        Adds the counts of a full-resolution accumulator, e.g. of one tile of a
+        partitioned run.
+
+        Parameters:
+            other (HeatmapAccumulator): Accumulator with block 1.
+
+        Raises:
+            ValueError: If other is block-decimated.
+        """
+        if other.block != 1:
+            raise ValueError("Only full-resolution heatmaps can be merged.")
+        for species in other:
+            self.add_grid(species, other[species], other.origin)
+
+    def downsampled(self, species, factor):
+        """
+        Returns the grid of a species with factor x factor blocks summed (see
+        downsample_heatmap), without building the full grid of sparse storage.
+
+        Parameters:
+            species (str): Species name.
+            factor (int): Block edge length, relative to this accumulator's block.
+
+        Returns:
+            numpy.ndarray: The downsampled grid.
+        """
+        code = self._codes[species]
+        if self.sparse:
+            return self._sparse_grid(code, factor)
+        return downsample_heatmap(self._dense[code], factor)
+
+    def _code(self, species):
+        code = self._codes.get(species)
+        if code is None:
+            code = self._codes[species] = len(self.species)
+            self.species.append(species)
+            if not self.sparse:
+                self._dense = np.concatenate([self._dense, np.zeros((1,) + self._shape, dtype=np.uint32)])
+        return code
+
+    def _encode(self, names):
+        codes = self._codes
+        try:
+            return np.fromiter(map(codes.__getitem__, names), np.int64, len(names))
+        except KeyError:
+            for species in dict.fromkeys(names):
+                self._code(species)
+            return np.fromiter(map(codes.__getitem__, names), np.int64, len(names))
+
+    def _add(self, codes, xs, ys, counts=None):
+        xs = xs - self.origin[0]
+        ys = ys - self.origin[1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        if not inside.all():
+            codes, xs, ys = codes[inside], xs[inside], ys[inside]
+            if counts is not None:
+                counts = np.asarray(counts)[inside]
+        if self.block > 1:
+            xs //= self.block
+            ys //= self.block
+        rows, columns = self._shape
+        keys = (codes * rows + ys) * columns + xs
+        counts = np.ones(len(keys), dtype=np.uint32) if counts is None else np.asarray(counts, dtype=np.uint32)
+        if not self.sparse:
+            np.add.at(self._dense.reshape(-1), keys, counts)
+            return
+        self._pending.append((keys, counts))
+        self._pending_size += len(keys)
+        if self._pending_size > max(len(self._keys), 1 << 16):
+            self._compact()
+
+    def _compact(self):
+        if not self._pending:
+            return
+        keys = np.concatenate([self._keys] + [k for k, _ in self._pending])
+        counts = np.concatenate([self._counts] + [c for _, c in self._pending])
+        self._keys, inverse = np.unique(keys, return_inverse=True)
+        self._counts = np.zeros(len(self._keys), dtype=np.uint32)
+        np.add.at(self._counts, inverse, counts)
+        self._pending = []
+        self._pending_size = 0
+
+    def _sparse_grid(self, code, factor):
+        self._compact()
+        rows, columns = self._shape
+        first = code * rows * columns
+        lo, hi = np.searchsorted(self._keys, [first, first + rows * columns])
+        ys, xs = np.divmod(self._keys[lo:hi] - first, columns)
+        out_rows, out_columns = -(-rows // factor), -(-columns // factor)
+        cells = (ys // factor) * out_columns + xs // factor
+        grid = np.bincount(cells, weights=self._counts[lo:hi], minlength=out_rows * out_columns)
+        return grid.astype(np.uint32 if factor == 1 else np.uint64).reshape(out_rows, out_columns)
+
+    def __getstate__(self):
+        self._compact()
+        return self.__dict__.copy()
+
+
+def export_heatmaps(heatmaps, output_dir="statistics_plots", levels=1):
     """
     During the simulation, the system keeps track of how often each species (e.g., rabbit, fox) appears at different positions on the map. Based on this data, it generates heatmaps—visual representations where color intensity reflects how frequently individuals of a species were present at certain locations.
     The program creates one heatmap per species, then saves each heatmap as a separate PNG image file in a predefined folder (e.g., statistics_plots). This allows the user to later inspect the spatial behavior of each species—seeing, for instance, where rabbits were most active or where foxes tended to cluster.
+    With levels > 1 a pyramid of coarser images is written as well: level k sums 2**k x 2**k blocks of the heatmap into heatmap_<species>_level<k>.png, which keeps the images of huge grids readable.
+
+    Parameters:
+        heatmaps (dict | HeatmapAccumulator): Species -> count grid indexed [y, x].
+        output_dir (str): Output directory (default is "statistics_plots").
+        levels (int): Number of pyramid levels, the full heatmap included (default is 1).
     """
-    for species, heatmap_data in heatmaps.items():
-        plt.figure(figsize=(8, 6))
-        flipped = np.flipud(heatmap_data)
-        plt.imshow(flipped, cmap="YlOrRd", interpolation='bilinear')
-        plt.title(f"Heatmap: {species}")
-        plt.xlabel("X coordinate")
-        plt.ylabel("Y coordinate")
-        plt.colorbar()
-        plt.tight_layout()
-        filepath = os.path.join(output_dir, f"heatmap_{species}.png")
-        plt.savefig(filepath)
-        plt.close()
+    os.makedirs(output_dir, exist_ok=True)
+    block = getattr(heatmaps, "block", 1)
+    for species in heatmaps:
+        for level in range(max(1, levels)):
+            factor = 2 ** level
+            if isinstance(heatmaps, HeatmapAccumulator):
+                heatmap_data = heatmaps.downsampled(species, factor)
+            else:
+                heatmap_data = downsample_heatmap(heatmaps[species], factor)
+            scale = block * factor
+            extent = None if scale == 1 else (0, heatmap_data.shape[1] * scale, 0, heatmap_data.shape[0] * scale)
+            plt.figure(figsize=(8, 6))
+            flipped = np.flipud(heatmap_data)
+            plt.imshow(flipped, cmap="YlOrRd", interpolation='bilinear', extent=extent)
+            plt.title(f"Heatmap: {species}" if scale == 1 else f"Heatmap: {species} ({scale}x{scale} cells)")
+            plt.xlabel("X coordinate")
+            plt.ylabel("Y coordinate")
+            plt.colorbar()
+            plt.tight_layout()
+            name = f"heatmap_{species}.png" if level == 0 else f"heatmap_{species}_level{level}.png"
+            filepath = os.path.join(output_dir, name)
+            plt.savefig(filepath)
+            plt.close()
 
 def display_heatmap(species: str, path: str = "statistics_plots") -> None:
     """
@@ -4,29 +4,29 @@ import numpy as np
 from scipy.interpolate import make_interp_spline
 from matplotlib.ticker import MaxNLocator
 from IPython.display import Image, display
+from statistic_tools.timeseries import PopulationSeries
 
 
-def export_population_chart(population_history, output_dir="statistics_plots"):
+def export_population_chart(population_history, output_dir="statistics_plots", max_points=None):
     """
     This function is designed to visualize how the population size of each species changed over time during the simulation. Each species is associated with a list that tracks the number of living individuals at every simulation step. Using this data, the function generates a line chart: each species is represented by a distinct colored line showing how its population increased, decreased, or remained stable over time.
-    The parameter population_history is a dictionary where the keys are species names (e.g., "Fox", "Rabbit"), and the values are lists of integers representing the population size at each step.
+    The parameter population_history is a dictionary where the keys are species names (e.g., "Fox", "Rabbit"), and the values are lists of integers representing the population size at each step. A PopulationSeries (see statistic_tools.timeseries) is read directly, without copying it into lists.
     The output_dir parameter specifies the folder where the generated chart (typically in PNG format) should be saved.
+    The optional max_points parameter thins very long histories to about that many evenly spaced steps before they are smoothed, so the chart costs the same however long the run was.
     """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
     plt.figure(figsize=(6, 6))
-    
-    for species, counts in population_history.items():
-        x = np.arange(len(counts))
-        if len(x) >= 4:  
-            spline = make_interp_spline(x, counts, k=3)  # cubic spline
-            x_smooth = np.linspace(x.min(), x.max(), 300)
-            y_smooth = spline(x_smooth)
-            plt.plot(x_smooth, y_smooth, label=species, linewidth=2)
-        else:
-            plt.plot(x, counts, label=species, linewidth=2)
-   
+
+    series = PopulationSeries.from_history(population_history)
+    x, counts = series.decimated(max_points)
+    if len(x) >= 4:
+        spline = make_interp_spline(x, counts, k=3, axis=1)  # cubic spline of all species at once
+        x = np.linspace(x.min(), x.max(), 300)
+        counts = spline(x)
+    for species, y in zip(series.species, counts):
+        plt.plot(x, y, label=species, linewidth=2)
 
     plt.title("Population")
     plt.xlabel("Time")
@@ -39,6 +39,36 @@ def export_population_chart(population_history, output_dir="statistics_plots"):
     plt.savefig(os.path.join(output_dir, "population_chart.png"))
     plt.close()
 
+def export_ensemble_chart(summary, output_dir="statistics_plots", outer_band=("q05", "q95"),
+                          inner_band=("q25", "q75"), filename="ensemble_chart.png"):
+    """
+    This function draws the population curves of a replicate ensemble: for every species the mean count per step is plotted as a line, surrounded by shaded quantile bands (by default a light 5-95% band and a darker 25-75% band) that show how much the replicates spread around the mean.
+    The parameter summary is a dictionary as returned by EnsembleStats.summary() or read_ensemble_csv(): species names map to dictionaries holding the "mean" series and the quantile series (e.g. "q05", "q95"). Bands whose series are missing are skipped.
+    The chart is saved as ensemble_chart.png in output_dir.
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    plt.figure(figsize=(6, 6))
+
+    for species, stats in summary.items():
+        mean = np.asarray(stats["mean"])
+        x = np.arange(len(mean))
+        line, = plt.plot(x, mean, label=species, linewidth=2)
+        for band, alpha in ((outer_band, 0.15), (inner_band, 0.3)):
+            if band and band[0] in stats and band[1] in stats:
+                plt.fill_between(x, stats[band[0]], stats[band[1]], color=line.get_color(), alpha=alpha, linewidth=0)
+
+    plt.title("Population (ensemble)")
+    plt.xlabel("Time")
+    plt.ylabel("Species number")
+    plt.gca().xaxis.set_major_locator(MaxNLocator(integer=True))
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, filename))
+    plt.close()
+
 def display_population_chart(path: str = "statistics_plots/population_chart.png") -> None:
     """
     This function is intended to display the population chart image (population_chart.png) that was saved after the simulation — if the file actually exists in the specified folder (typically statistics_plots/). The chart visually represents how the population of each species changed over time during the simulation — showing the number of living individuals per species at each simulation step.
@@ -0,0 +1,353 @@
+import csv
+import os
+from collections.abc import Mapping
+import numpy as np
+
+# Bytes reserved for the header of a streamed .npy file, so the step count can
+# be rewritten in place as chunks are appended.
+_NPY_HEADER_BYTES = 4096
+
+
+class PopulationSeries(Mapping):
+    """
+    Population count per species and step, stored as a ``species x steps``
+    int32 array.
+
+    By default the array grows by doubling, so appending a step is amortized
+    constant time. With a window only the last ``window`` steps are kept in a
+    ring buffer and memory stays fixed however long the run is. Steps can be
+    streamed to a CSV or ``.npy`` file in chunks of ``flush_every`` steps; in
+    windowed mode steps are flushed before the ring buffer overwrites them, so
+    the file holds the complete history.
+
+    As a mapping it gives species -> list of the retained counts, the format of
+    the former ``population_history`` dict.
+
+    Attributes:
+        species (list): Species names, in row order.
+        start (int): First retained step.
+        stop (int): Number of steps appended.
+        window (int): Retained steps in windowed mode, None when growing.
+        flush_path (str): File the steps are streamed to, or None.
+    """
+
+    def __init__(self, species=(), capacity=1024, window=None, flush_path=None, flush_every=256):
+        """
+        Parameters:
+            species (list): Species known in advance; others are added on first append.
+            capacity (int): Steps preallocated when growing.
+            window (int): Keep only the last window steps in memory (ring buffer).
+            flush_path (str): Optional .npy or CSV file receiving every step.
+            flush_every (int): Steps per flushed chunk (capped at window).
+        """
+        if window is not None and window < 1:
+            raise ValueError(f"History window must be at least 1, got {window}.")
+        self.species = list(species)
+        self.window = window
+        self.flush_path = flush_path
+        self.flush_every = max(1, min(flush_every, window) if window else flush_every)
+        self.stop = 0
+        self._rows = {name: i for i, name in enumerate(self.species)}
+        self._data = np.zeros((len(self.species), window or max(1, capacity)), dtype=np.int32)
+        self._flushed = 0
+        self._file = None
+        self._started = False
+
+    @classmethod
+    def from_history(cls, population_history, **kwargs):
+        """
+        Builds a series from a mapping of species -> counts per step.
+
+        Parameters:
+            population_history (dict): Species -> list of counts, all of one length.
+            **kwargs: Further PopulationSeries arguments.
+
+        Returns:
+            PopulationSeries: The series.
+
+        Raises:
+            ValueError: If the species have different numbers of steps.
+        """
+        if isinstance(population_history, PopulationSeries):
+            return population_history
+        lengths = {len(counts) for counts in population_history.values()}
+        if len(lengths) > 1:
+            raise ValueError("All species of a population history need the same number of steps.")
+        steps = max(lengths, default=0)
+        series = cls(population_history, capacity=max(1, steps), **kwargs)
+        series.extend(np.array([population_history[name] for name in series.species], dtype=np.int32)
+                      .reshape(len(series.species), steps))
+        return series
+
+    @property
+    def start(self):
+        if self.window is None:
+            return 0
+        return max(0, self.stop - self.window)
+
+    def __getitem__(self, species):
+        return self._data[self._rows[species], self._columns(self.start, self.stop)].tolist()
+
+    def __iter__(self):
+        return iter(self.species)
+
+    def __len__(self):
+        return len(self.species)
+
+    def append(self, counts):
+        """
+        Appends one step.
+
+        Parameters:
+            counts (dict | list): Count per species, missing species counting 0,
+                or counts in the order of ``species``.
+        """
+        if isinstance(counts, Mapping):
+            for name in counts:
+                if name not in self._rows:
+                    self._add_species(name)
+            counts = [counts.get(name, 0) for name in self.species]
+        self._reserve(1)
+        self._data[:, self.stop % self._data.shape[1]] = counts
+        self.stop += 1
+        if self.flush_path and self.stop - self._flushed >= self.flush_every:
+            self.flush()
+
+    def extend(self, counts):
+        """
+        Appends several steps.
+
+        Parameters:
+            counts (numpy.ndarray): Counts of shape (species, steps), rows in ``species`` order.
+        """
+        counts = np.asarray(counts).reshape(len(self.species), -1)
+        size = self.flush_every if self.flush_path else (self.window or counts.shape[1])
+        for offset in range(0, counts.shape[1], max(1, size)):
+            chunk = counts[:, offset:offset + size]
+            self._reserve(chunk.shape[1])
+            self._data[:, self._columns(self.stop, self.stop + chunk.shape[1])] = chunk
+            self.stop += chunk.shape[1]
+            if self.flush_path and self.stop - self._flushed >= self.flush_every:
+                self.flush()
+
+    def array(self, start=None, stop=None):
+        """
+        Returns the counts of a range of retained steps.
+
+        Parameters:
+            start (int): First step (inclusive); the first retained step if None.
+            stop (int): Last step (exclusive); the number of steps if None.
+
+        Returns:
+            numpy.ndarray: Read-only counts of shape (species, steps).
+        """
+        start = self.start if start is None else max(start, self.start)
+        stop = self.stop if stop is None else min(stop, self.stop)
+        counts = self._data[:, self._columns(start, max(start, stop))]
+        counts.flags.writeable = False
+        return counts
+
+    def decimated(self, max_points=None):
+        """
+        Returns the retained steps, thinned to at most about max_points evenly
+        spaced steps (the last step is always kept). Only the selected columns
+        are read.
+
+        Parameters:
+            max_points (int): Maximum number of steps; all steps if None.
+
+        Returns:
+            tuple: Step numbers (numpy.ndarray) and counts of shape (species, steps).
+        """
+        steps = np.arange(self.start, self.stop)
+        if max_points and len(steps) > max_points:
+            stride = -(-len(steps) // max_points)
+            last = steps[-1]
+            steps = steps[::stride]
+            if steps[-1] != last:
+                steps = np.append(steps, last)
+        return steps, self._data[:, steps % self._data.shape[1]]
+
+    def copy(self):
+        """
+        Returns:
+            PopulationSeries: In-memory copy of the retained steps, without flush file.
+        """
+        series = PopulationSeries(self.species, capacity=max(1, self.stop - self.start), window=self.window)
+        series.stop = self.start
+        series.extend(self.array())
+        return series
+
+    def restore(self, other):
+        """
+        Replaces the steps with those of another series, e.g. of a checkpoint.
+        An existing flush file is cut back to the steps before the retained
+        ones, which are written again, so the file continues from the
+        checkpoint step.
+
+        Parameters:
+            other (PopulationSeries | dict): Series or species -> counts per step.
+        """
+        other = PopulationSeries.from_history(other)
+        self.close()
+        self.species = list(other.species)
+        self._rows = {name: i for i, name in enumerate(self.species)}
+        self._data = np.zeros((len(self.species), self.window or max(1, other.stop - other.start)), dtype=np.int32)
+        self.stop = other.start
+        self._flushed = other.start
+        self._started = False
+        if self.flush_path and os.path.exists(self.flush_path):
+            self._truncate(other.start)
+        self.extend(other.array())
+
+    def flush(self):
+        """
+        Writes the steps appended since the last flush to the flush file.
+        """
+        if not self.flush_path or self._flushed >= self.stop:
+            return
+        counts = self.array(self._flushed, self.stop)
+        if self._file is None:
+            self._open()
+        if self._npy:
+            rows = np.zeros(counts.shape[1], dtype=self._dtype)
+            rows["step"] = np.arange(self._flushed, self.stop)
+            for name, row in zip(self.species, counts):
+                rows[name] = row
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(rows.tobytes())
+            self._rows_written += len(rows)
+            self._file.seek(0)
+            self._file.write(_npy_header(self._dtype, self._rows_written))
+        else:
+            steps = np.arange(self._flushed, self.stop)
+            csv.writer(self._file).writerows(np.column_stack([steps, counts.T]).tolist())
+        self._file.flush()
+        self._flushed = self.stop
+
+    def close(self):
+        """
+        Flushes the remaining steps and closes the flush file.
+        """
+        if self.flush_path:
+            self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        directory = os.path.dirname(self.flush_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._npy = self.flush_path.endswith(".npy")
+        if self._started:
+            # Reopened after close(): keep appending to the file.
+            self._file = open(self.flush_path, "r+b") if self._npy else open(self.flush_path, "a", newline="",
+                                                                               encoding="utf-8")
+        elif self._npy:
+            self._dtype = np.dtype([("step", "<i8")] + [(name, "<i4") for name in self.species])
+            self._rows_written = 0
+            self._file = open(self.flush_path, "w+b")
+            self._file.write(_npy_header(self._dtype, 0))
+        else:
+            self._file = open(self.flush_path, "w", newline="", encoding="utf-8")
+            csv.writer(self._file).writerow(["step"] + self.species)
+        self._started = True
+
+    def _truncate(self, step):
+        # Drops the rows from step on, so the next flush appends after the rest.
+        self._npy = self.flush_path.endswith(".npy")
+        if self._npy:
+            with open(self.flush_path, "r+b") as fp:
+                np.lib.format.read_magic(fp)
+                shape, _, dtype = np.lib.format.read_array_header_1_0(fp)
+                fp.seek(_NPY_HEADER_BYTES)
+                first = np.frombuffer(fp.read(dtype.itemsize), dtype=dtype)["step"]
+                species = [name for name in dtype.names if name != "step"]
+                self._check_species(species)
+                rows = min(shape[0], max(0, step - int(first[0]))) if len(first) else 0
+                fp.truncate(_NPY_HEADER_BYTES + rows * dtype.itemsize)
+                fp.seek(0)
+                fp.write(_npy_header(dtype, rows))
+            self._dtype = dtype
+            self._rows_written = rows
+        else:
+            with open(self.flush_path, "r+b") as fp:
+                header = fp.readline().decode("utf-8").rstrip("\r\n").split(",")
+                self._check_species(header[1:])
+                while True:
+                    position = fp.tell()
+                    line = fp.readline()
+                    if not line.strip() or int(line.split(b",", 1)[0]) >= step:
+                        break
+                fp.truncate(position)
+        self._started = True
+
+    def _check_species(self, species):
+        if species != self.species:
+            raise ValueError(f"Flush file {self.flush_path} holds species {species}, expected {self.species}.")
+
+    def _columns(self, start, stop):
+        if self.window is None:
+            return slice(start, stop)
+        return np.arange(start, stop) % self._data.shape[1]
+
+    def _add_species(self, name):
+        if self._started:
+            raise ValueError(f"Cannot add species {name!r} after steps were flushed to {self.flush_path}.")
+        self._rows[name] = len(self.species)
+        self.species.append(name)
+        self._data = np.concatenate([self._data, np.zeros((1, self._data.shape[1]), dtype=np.int32)])
+
+    def _reserve(self, steps):
+        if self.window is not None or self.stop + steps <= self._data.shape[1]:
+            return
+        capacity = max(2 * self._data.shape[1], self.stop + steps)
+        data = np.zeros((len(self.species), capacity), dtype=np.int32)
+        data[:, :self.stop] = self._data[:, :self.stop]
+        self._data = data
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_file"] = None
+        state["flush_path"] = None
+        return state
+
+
+def _npy_header(dtype, rows):
+    header = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (rows,)}
+    text = repr(header).encode("latin1")
+    prefix = b"\x93NUMPY\x01\x00"
+    length = _NPY_HEADER_BYTES - len(prefix) - 2
+    if len(text) + 1 > length:
+        raise ValueError("Too many species for a streamed .npy population history.")
+    return prefix + length.to_bytes(2, "little") + text.ljust(length - 1) + b"\n"
+
+
+def load_population_series(path):
+    """
+    Reads a population history streamed by PopulationSeries.
+
+    Parameters:
+        path (str): .npy or CSV flush file.
+
+    Returns:
+        PopulationSeries: The series, starting at the first step in the file.
+    """
+    if path.endswith(".npy"):
+        rows = np.load(path)
+        species = [name for name in rows.dtype.names if name != "step"]
+        steps = rows["step"]
+        counts = np.array([rows[name] for name in species], dtype=np.int32).reshape(len(species), -1)
+    else:
+        with open(path, newline="", encoding="utf-8") as fp:
+            species = next(csv.reader(fp))[1:]
+            table = np.loadtxt(fp, delimiter=",", dtype=np.int64, ndmin=2).reshape(-1, len(species) + 1)
+        steps = table[:, 0]
+        counts = table[:, 1:].T.astype(np.int32)
+    first = int(steps[0]) if len(steps) else 0
+    # A file that starts later (e.g. after resuming a windowed run) is loaded as a window.
+    series = PopulationSeries(species, capacity=max(1, len(steps)), window=len(steps) if first else None)
+    series.stop = first
+    series.extend(counts)
+    return series
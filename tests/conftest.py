@@ -0,0 +1,42 @@
+import logging
+import pytest
+from core.terrain import Terrain
+from simulation.engine import SimulationEngine
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def _seeded_engine(seed, **kwargs):
+    logging.getLogger("simulation").setLevel(logging.WARNING)
+    engine = SimulationEngine(grid_size=20, steps=40, foodweb_path=FOODWEB_PATH, headless=True, seed=seed, **kwargs)
+    terrain = Terrain(20, rng=engine.rng)
+    terrain.generate_water()
+    terrain.generate_trees()
+    terrain.generate_shelters()
+    engine.terrain = terrain
+    engine.setup()
+    return engine
+
+
+def _engine_state(engine):
+    return ([(o.species, o.x, o.y, o.energy, o.alive) for o in engine.organisms],
+            [(step, o.species, o.x, o.y) for step, o in engine.corpses],
+            dict(engine.population_history))
+
+
+@pytest.fixture
+def seeded_engine():
+    """
+    Returns a factory of headless 20x20 engines, 40 steps long, seeded with the
+    given seed on a terrain with water, trees and shelters, set up and ready to run.
+    """
+    return _seeded_engine
+
+
+@pytest.fixture
+def engine_state():
+    """
+    Returns a function giving the comparable state of an engine: its organisms,
+    its corpses and its population history.
+    """
+    return _engine_state
@@ -0,0 +1,34 @@
+from benchmarks.cli import main
+from benchmarks.history import compare, load_history, make_entry
+from benchmarks.scenarios import Scenario, build_engine, parse_scenario
+from benchmarks.timing import run_scenario
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def test_scenario_engine_has_requested_population_and_terrain():
+    scenario = parse_scenario("40:200:0.25:3")
+    assert scenario == Scenario(40, 200, 0.25, 3) and scenario.name == "g40-n200-d0.25"
+    engine = build_engine(scenario, FOODWEB_PATH)
+    assert abs(len(engine.organisms) - 200) <= 2
+    assert (engine.terrain.grid != 0).sum() == 400
+
+
+def test_compare_flags_only_drops_beyond_threshold():
+    results = run_scenario(Scenario(20, 60, 0.1, 3), FOODWEB_PATH, repeat=1)
+    assert set(results) == {"run", "reproduce", "behavior", "update_shelters"}
+    baseline = make_entry({"g20-n60-d0.1": results})
+    slower = make_entry({"g20-n60-d0.1": {"run": {"seconds": 9, "steps_per_sec": results["run"]["steps_per_sec"] * 0.8,
+                                                  "agent_steps_per_sec": results["run"]["agent_steps_per_sec"] * 0.95}}})
+    regressions = compare(baseline, slower, threshold=0.1)
+    assert [(r.phase, r.metric) for r in regressions] == [("run", "steps_per_sec")]
+    assert round(regressions[0].change, 2) == -0.2
+
+
+def test_cli_appends_history_and_compares(tmp_path):
+    history = str(tmp_path / "history.json")
+    args = ["--history", history, "run", "--scenario", "20:60:0.1:3", "--repeat", "1", "--phases", "reproduce"]
+    assert main(args + ["--label", "first"]) == 0
+    assert main(args) == 0
+    assert [entry["label"] for entry in load_history(history)] == ["first", None]
+    assert main(["--history", history, "compare", "--baseline", "first", "--threshold", "100"]) == 0
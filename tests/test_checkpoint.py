@@ -0,0 +1,24 @@
+import pytest
+from simulation.engine import SimulationEngine
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+@pytest.mark.parametrize("backend", ["objects", "arrays"])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, seeded_engine, engine_state, backend):
+    reference = seeded_engine(7)
+    reference.run()
+
+    path = str(tmp_path / "run.ckpt")
+    interrupted = seeded_engine(7, checkpoint_path=path, checkpoint_every=15, backend=backend)
+    for _ in range(20):
+        interrupted.step()
+    resumed = SimulationEngine(grid_size=20, steps=40, foodweb_path=FOODWEB_PATH, headless=True, seed=123,
+                               backend=backend)
+    resumed.load_checkpoint(path)
+    assert resumed.current_step == 15
+    resumed.run()
+
+    assert engine_state(resumed) == engine_state(reference)
+    for species, grid in reference.heatmaps.items():
+        assert (resumed.heatmaps[species] == grid).all()
@@ -1,8 +1,9 @@
 # tests/test_engine.py
 
 import pytest
+import simulation.engine as engine_module
 from simulation.engine import SimulationEngine
-from simulation.organism import Organism
+from core.organism import Organism, Producer
 
 def test_simulation_initialization():
     engine = SimulationEngine()
@@ -10,14 +11,14 @@ def test_simulation_initialization():
     assert isinstance(engine.organisms, list)
 
 def test_simulation_step_advances_state():
-    engine = SimulationEngine()
+    engine = SimulationEngine(headless=True)
     initial_state = engine.get_state()
     engine.step()
     new_state = engine.get_state()
     assert initial_state != new_state
 
 def test_organism_movement():
-    engine = SimulationEngine()
+    engine = SimulationEngine(headless=True)
     engine.step()
     for organism in engine.organisms:
         assert 0 <= organism.x < engine.grid_size
@@ -31,3 +32,97 @@ def test_population_counts():
         assert isinstance(species, str)
         assert isinstance(count, int)
         assert count >= 0
+
+
+class _FrameLog:
+    def __init__(self):
+        self.steps = []
+        self.frames = []
+
+    def draw(self, step, organisms):
+        self.steps.append(step)
+        self.frames.append(list(organisms))
+
+    def close(self):
+        pass
+
+def test_corpses_are_decomposed_in_death_order():
+    engine = SimulationEngine(headless=True, seed=1)
+    carrots = [Producer("Carrot", x, 0) for x in range(3)]
+    for carrot in carrots:
+        engine._add_organism(carrot)
+    engine.decomposition_interval = 2
+    carrots[1].alive = False
+    engine.step()
+    carrots[0].alive = False
+    engine.step()
+    assert list(engine.corpses) == [(0, carrots[1]), (1, carrots[0])]
+    assert carrots[0] not in engine.organisms and not engine.spatial_index.is_occupied(0, 0)
+    engine.step()
+    assert list(engine.corpses) == [(1, carrots[0])]
+
+def test_compaction_stride_leaves_the_run_unchanged(seeded_engine):
+    every_step, strided = seeded_engine(4), seeded_engine(4, compact_every=7)
+    strided.headless, strided.chart_every = False, 0
+    strided._renderer = _FrameLog()
+    kept_dead = False
+    for _ in range(40):
+        every_step.step()
+        strided.step()
+        kept_dead |= any(not org.alive for org in strided.organisms)
+        assert [(o.species, o.x, o.y, o.energy) for o in strided.organisms if o.alive] == \
+               [(o.species, o.x, o.y, o.energy) for o in every_step.organisms]
+        assert [step for step, _ in strided.corpses] == [step for step, _ in every_step.corpses]
+    assert kept_dead
+    assert dict(strided.population_history) == dict(every_step.population_history)
+    for shown in strided._renderer.frames:
+        assert len({id(org) for org in shown}) == len(shown)
+    shown = strided._renderer.frames[-1]
+    assert sum(org.alive for org in shown) == sum(org.alive for org in strided.organisms)
+    assert len(shown) - sum(org.alive for org in shown) == len(strided.corpses)
+
+def test_sampled_cells_are_distinct_and_free(seeded_engine):
+    engine = seeded_engine(3)
+    cells = engine.sample_free_cells(100)
+    assert len(set(cells)) == 100
+    for x, y in cells:
+        assert engine.terrain.passable[y, x] and not engine.spatial_index.is_occupied(x, y)
+
+def test_seeded_placement_is_reproducible(seeded_engine):
+    first, second = seeded_engine(11), seeded_engine(11)
+    assert [(o.species, o.x, o.y) for o in first.organisms] == [(o.species, o.x, o.y) for o in second.organisms]
+    assert first.sample_free_cells(20) == second.sample_free_cells(20)
+
+def test_overfull_placement_raises():
+    engine = SimulationEngine(grid_size=4, headless=True, initial_counts={"Carrot": 17})
+    with pytest.raises(ValueError):
+        engine.setup()
+    free = SimulationEngine(grid_size=4, headless=True)
+    with pytest.raises(ValueError):
+        free.sample_free_cells(17)
+
+def _run_outputs(monkeypatch, **kwargs):
+    engine = SimulationEngine(steps=10, **kwargs)
+    charts, heatmaps = [], []
+    monkeypatch.setattr(engine_module, "export_population_chart",
+                        lambda history, max_points=None: charts.append(engine.current_step))
+    monkeypatch.setattr(engine_module, "export_heatmaps", lambda *args, **kwargs: heatmaps.append(args))
+    frames = engine._renderer = _FrameLog()
+    engine.setup()
+    engine.run()
+    return frames.steps, charts, len(heatmaps)
+
+@pytest.mark.parametrize("render_every, chart_every, frames, charts", [
+    (1, 1, list(range(10)), list(range(10))),
+    (3, 4, [0, 3, 6, 9], [0, 4, 8, 9]),
+    (0, 5, [], [0, 5, 9]),
+    (4, 0, [0, 4, 8, 9], []),
+])
+def test_output_strides(monkeypatch, render_every, chart_every, frames, charts):
+    assert _run_outputs(monkeypatch, render_every=render_every, chart_every=chart_every) == (frames, charts, 1)
+
+def test_final_only_writes_the_last_step(monkeypatch):
+    assert _run_outputs(monkeypatch, final_only=True) == ([9], [9], 1)
+
+def test_headless_writes_no_images(monkeypatch):
+    assert _run_outputs(monkeypatch, headless=True) == ([], [], 0)
@@ -0,0 +1,33 @@
+import numpy as np
+from statistic_tools.ensemble import EnsembleStats, P2Quantiles, WelfordAccumulator, read_ensemble_csv
+from statistic_tools.population import export_ensemble_chart
+from simulation.ensemble import run_ensemble
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def test_streaming_statistics_match_batch_statistics():
+    data = np.random.default_rng(0).normal(size=(1000, 2, 3)) * [1, 2, 3]
+    moments, partial, bands = WelfordAccumulator((2, 3)), WelfordAccumulator((2, 3)), P2Quantiles((2, 3), (0.25, 0.5))
+    for i, x in enumerate(data):
+        (moments if i < 600 else partial).add(x)
+        bands.add(x)
+    moments.merge(partial)
+    assert moments.count == 1000
+    assert np.allclose(moments.mean, data.mean(axis=0))
+    assert np.allclose(moments.variance(), data.var(axis=0, ddof=1))
+    assert np.abs(bands.estimates() - np.quantile(data, (0.25, 0.5), axis=0)).max() < 0.25
+
+
+def test_ensemble_run_writes_and_plots_bands(tmp_path):
+    stats = run_ensemble({"grid_size": 15, "steps": 5}, replicates=6, seed=3, workers=2, foodweb_path=FOODWEB_PATH)
+    assert stats.count == 6
+    stats.write_csv(str(tmp_path / "ensemble.csv"))
+    summary = read_ensemble_csv(str(tmp_path / "ensemble.csv"))
+    assert len(summary["Rabbit"]["mean"]) == 5
+    assert (summary["Rabbit"]["q05"] <= summary["Rabbit"]["q95"]).all()
+    export_ensemble_chart(summary, output_dir=str(tmp_path))
+    assert (tmp_path / "ensemble_chart.png").exists()
+
+    again = run_ensemble({"grid_size": 15, "steps": 5}, replicates=6, seed=3, workers=1, foodweb_path=FOODWEB_PATH)
+    assert np.allclose(again.moments.mean, stats.moments.mean)
@@ -0,0 +1,56 @@
+import json
+import numpy as np
+import pytest
+from core.foodweb import FoodWeb
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def _config_with_undeclared_species(tmp_path):
+    with open(FOODWEB_PATH) as f:
+        config = json.load(f)
+    # Grass is only eaten and Hawk only hunts: neither is declared under "organisms".
+    config["predation"]["Rabbit"].append("Grass")
+    config["predation"]["Hawk"] = ["Rabbit", "Fox"]
+    path = tmp_path / "foodweb.json"
+    path.write_text(json.dumps(config))
+    return str(path), config["predation"]
+
+
+@pytest.mark.parametrize("undeclared", [False, True])
+def test_predation_matrix_matches_config_for_every_pair(tmp_path, undeclared):
+    if undeclared:
+        path, predation = _config_with_undeclared_species(tmp_path)
+    else:
+        path = FOODWEB_PATH
+        with open(path) as f:
+            predation = json.load(f)["predation"]
+    foodweb = FoodWeb(path)
+    names = foodweb.species_names
+    assert set(names) == set(foodweb.all_species()) | set(predation) | {p for prey in predation.values() for p in prey}
+
+    for predator in names:
+        eaten = set(predation.get(predator, []))
+        pid = foodweb.species_id(predator)
+        assert {names[i] for i in foodweb.prey_ids(pid)} == eaten
+        assert {names[i] for i in foodweb.predator_ids(pid)} == {p for p, prey in predation.items() if predator in prey}
+        for prey in names:
+            expected = prey in eaten
+            assert foodweb.predation_matrix[pid, foodweb.species_id(prey)] == expected
+            assert foodweb.is_prey_id(pid, foodweb.species_id(prey)) == expected
+            assert foodweb.is_prey(predator, prey) == expected
+            assert (prey in foodweb.prey_set(predator)) == expected
+            assert (predator in foodweb.predator_set(prey)) == expected
+
+    ids = np.arange(len(names))
+    predators, prey = np.meshgrid(ids, ids, indexing="ij")
+    assert (foodweb.is_prey_id(predators, prey) == foodweb.predation_matrix).all()
+
+
+def test_species_missing_from_config_have_no_relations():
+    foodweb = FoodWeb(FOODWEB_PATH)
+    assert not foodweb.is_prey("Wolf", "Rabbit") and not foodweb.is_prey("Fox", "Wolf")
+    assert foodweb.prey_set("Wolf") == frozenset() and foodweb.predator_set("Wolf") == frozenset()
+    assert foodweb.get_predators("Wolf") == []
+    with pytest.raises(KeyError):
+        foodweb.species_id("Wolf")
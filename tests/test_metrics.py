@@ -0,0 +1,45 @@
+import csv
+import json
+from benchmarks.scenarios import Scenario, build_engine
+from simulation.engine import SimulationEngine
+from simulation.metrics import EVENTS, PHASES, SimulationMetrics
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def test_metrics_record_every_step_and_match_the_population():
+    engine = build_engine(Scenario(30, 300, 0.1, steps=25), FOODWEB_PATH, seed=2)
+    engine.metrics = SimulationMetrics(capacity=4)
+    start = len(engine.organisms)
+    engine.run()
+
+    metrics = engine.metrics
+    assert metrics.steps.tolist() == list(range(25))
+    assert metrics.times.shape == (25, len(PHASES)) and (metrics.times >= 0).all()
+    assert (metrics.phase_time("behavior") > 0).all()
+
+    totals = metrics.totals()
+    births = sum(totals[event] for event in EVENTS if event.startswith("births_"))
+    alive = sum(counts[-1] for counts in engine.population_history.values())
+    assert start + births - totals["deaths"] == alive
+    assert totals["deaths"] == len(engine.corpses) + totals["decompositions"]
+    assert totals["predations"] <= totals["deaths"]
+
+
+def test_metrics_are_off_by_default_and_written_after_run(tmp_path):
+    engine = SimulationEngine(grid_size=15, steps=4, foodweb_path=FOODWEB_PATH, headless=True, seed=1)
+    assert not engine.metrics
+
+    for name in ("metrics.csv", "metrics.jsonl"):
+        path = tmp_path / name
+        engine = SimulationEngine(grid_size=15, steps=4, foodweb_path=FOODWEB_PATH, headless=True, seed=1,
+                                  metrics_path=str(path))
+        engine.setup()
+        engine.run()
+        if name.endswith(".csv"):
+            with open(path, newline="") as fp:
+                rows = list(csv.DictReader(fp))
+        else:
+            rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [int(row["step"]) for row in rows] == [0, 1, 2, 3]
+        assert set(rows[0]) == {"step", *(f"{phase}_ns" for phase in PHASES), *EVENTS}
@@ -0,0 +1,48 @@
+from core.organism import Consumer, Producer
+from core.foodweb import FoodWeb
+from core.terrain import Terrain
+from simulation.output import OutputPipeline, take_snapshot, freeze_history
+from simulation.events import JsonLinesEventSink, read_events
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def test_snapshot_is_frozen_copy():
+    rabbit = Consumer("Rabbit", 2, 3)
+    snapshot = take_snapshot(0, [rabbit, Producer("Carrot", 1, 1)])
+    rabbit.x = 5
+    assert snapshot.xs.tolist() == [2, 1] and snapshot.species.tolist() == ["Rabbit", "Carrot"]
+    assert not snapshot.xs.flags.writeable
+
+
+def test_pipeline_renders_frames_and_chart(tmp_path):
+    frames, charts = tmp_path / "frames", tmp_path / "charts"
+    organisms = [Consumer("Rabbit", 1, 1), Producer("Carrot", 2, 2)]
+    with OutputPipeline(10, foodweb=FoodWeb(FOODWEB_PATH), terrain=Terrain(10), workers=2, max_pending=1,
+                        use_processes=False, frames_dir=str(frames), charts_dir=str(charts)) as pipeline:
+        for step in range(3):
+            pipeline.submit_frame(take_snapshot(step, organisms))
+        pipeline.submit_chart(freeze_history({"Rabbit": [1, 1, 1]}))
+    assert sorted(p.name for p in frames.iterdir()) == ["step_000.png", "step_001.png", "step_002.png"]
+    assert (charts / "population_chart.png").exists()
+
+
+def test_pipeline_drops_stale_charts_but_exports_the_newest(tmp_path):
+    with OutputPipeline(10, workers=2, max_pending=4, use_processes=False,
+                        charts_dir=str(tmp_path)) as pipeline:
+        charts = [pipeline.submit_chart(freeze_history({"Rabbit": [1] * (step + 2)})) for step in range(6)]
+    assert all(chart.done() for chart in charts)
+    assert not charts[0].cancelled() and not charts[-1].cancelled()
+    assert (tmp_path / "population_chart.png").exists()
+
+
+def test_event_sink_buffers_json_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with JsonLinesEventSink(str(path), buffer_size=2) as sink:
+        sink.emit("step", step=0, counts={"Rabbit": 3})
+        assert sink.events_written == 0
+        sink.emit("step", step=1, counts={})
+        assert sink.events_written == 2
+        sink.emit("decomposed", step=2, species="Fox")
+    assert [e["step"] for e in read_events(str(path), "step")] == [0, 1]
+    assert list(read_events(str(path), "decomposed"))[0]["species"] == "Fox"
@@ -0,0 +1,177 @@
+import copy
+import logging
+import numpy as np
+import pytest
+from core.foodweb import FoodWeb
+from core.organism import Organism, Consumer
+from core.rng import make_rng, spawn_rngs
+from core.terrain import Terrain
+from simulation.engine import SimulationEngine
+from simulation.partition import PartitionedEngine, TileLayout, TileWorker
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+INITIAL_COUNTS = {"Rabbit": 40, "Fox": 10, "Carrot": 80}
+
+
+def _terrain():
+    terrain = Terrain(30, rng=make_rng(5))
+    terrain.generate_water()
+    terrain.generate_trees()
+    terrain.generate_shelters()
+    return terrain
+
+
+def _engine(processes, tiles=(2, 2), seed=3):
+    logging.getLogger("simulation").setLevel(logging.WARNING)
+    engine = PartitionedEngine(grid_size=30, steps=25, foodweb_path=FOODWEB_PATH, tiles=tiles, processes=processes,
+                               seed=seed, initial_counts=INITIAL_COUNTS)
+    engine.terrain = _terrain()
+    engine.setup()
+    return engine
+
+
+def test_layout_owner_and_watchers():
+    layout = TileLayout(30, 3, 2)
+    assert layout.bounds(4) == (10, 15, 20, 30)
+    assert layout.owner(10, 15) == 4 and layout.owner(9, 14) == 0
+    assert layout.watchers(15, 20) == {4}
+    assert layout.watchers(11, 16) == {0, 1, 3, 4}
+    with pytest.raises(ValueError):
+        TileLayout(10, 5, 1)
+
+
+def test_worker_processes_match_in_process_tiles():
+    local = _engine(processes=False)
+    local.run()
+    remote = _engine(processes=True)
+    remote.run()
+    assert dict(remote.population_history) == dict(local.population_history)
+    assert [(o.species, o.x, o.y, o.energy) for o in remote.organisms] == \
+           [(o.species, o.x, o.y, o.energy) for o in local.organisms]
+
+    uids = [o.uid for o in local.organisms]
+    assert len(uids) == len(set(uids))
+    assert len(local.organisms) == sum(counts[-1] for counts in local.population_history.values())
+    assert sum(grid.sum() for grid in local.heatmaps.values()) > 0
+
+
+def test_prey_claimed_twice_feeds_the_lowest_uid():
+    layout = TileLayout(20, 2, 1)
+    rabbit = Consumer("Rabbit", 12, 3)
+    worker = TileWorker(1, layout, FoodWeb(FOODWEB_PATH), None, [rabbit], make_rng(0), {}, {}, 1000)
+    rejected, counts, _ = worker.settle([(rabbit.uid, 7, 0, 20), (rabbit.uid, 5, 1, 12)], [])
+    assert not rabbit.alive
+    assert rejected == [(0, 7, 20)]
+    assert counts == {}
+
+
+def test_border_prey_eaten_on_its_own_tile_goes_to_the_lowest_uid():
+    layout = TileLayout(20, 2, 1)
+    fox = Consumer("Fox", 10, 3, trophic_level="secondary")
+    rabbit = Consumer("Rabbit", 10, 3)
+    fox.energy = fox.max_energy - 5
+    worker = TileWorker(1, layout, FoodWeb(FOODWEB_PATH), None, [rabbit, fox], make_rng(0), {}, {}, 1000)
+    assert rabbit in worker.export()[0]
+    claims, _ = worker.move(0, [])
+    assert not rabbit.alive
+    assert claims == [[1, rabbit.uid, fox.uid, 1, 5]]
+
+    # A predator of the neighbouring tile with a lower uid ate the same rabbit
+    # as a halo organism: it wins and the local fox gives its 5 energy back.
+    rejected, _, _ = worker.settle([(rabbit.uid, fox.uid, 1, 5), (rabbit.uid, 3, 0, 20)], [])
+    assert rejected == [(1, fox.uid, 5)]
+    energy = fox.energy
+    worker.breed(1, [], [(fox.uid, 5)], {"Fox": 1}, [], [])
+    assert fox.energy == energy - 5
+
+
+def test_meal_of_a_halo_prey_is_claimed_with_its_owner():
+    layout = TileLayout(20, 2, 1)
+    foodweb = FoodWeb(FOODWEB_PATH)
+    rabbit = Consumer("Rabbit", 10, 3)
+    fox = Consumer("Fox", 9, 3, trophic_level="secondary")
+    fox.energy = 30
+    west = TileWorker(0, layout, foodweb, None, [fox], make_rng(0), {}, {}, 1000)
+    east = TileWorker(1, layout, foodweb, None, [rabbit], make_rng(1), {}, {}, 1000)
+
+    # The hungry fox chases the halo copy of the rabbit onto the east tile,
+    # eats it there and is handed over to that tile with its claim.
+    claims, emigrants = west.move(0, [(1, [copy.copy(rabbit)])])
+    assert claims == [[1, rabbit.uid, fox.uid, 1, 20]]
+    assert rabbit.alive and west.organisms == [] and fox not in west.spatial_index.at(fox.x, fox.y)
+    assert [org for org, _, _ in emigrants[1]] == [fox]
+
+    rejected, counts, _ = east.settle([(rabbit.uid, fox.uid, 1, 20)], emigrants[1])
+    assert rejected == [] and not rabbit.alive
+    assert east.organisms == [rabbit, fox] and counts == {"Fox": 1}
+
+
+def test_migrants_carry_their_water_and_shelter_counters():
+    layout = TileLayout(20, 2, 1)
+    foodweb = FoodWeb(FOODWEB_PATH)
+    rabbit = Consumer("Rabbit", 9, 3)
+    west = TileWorker(0, layout, foodweb, Terrain(20), [rabbit], make_rng(0), {}, {}, 1000)
+    east = TileWorker(1, layout, foodweb, Terrain(20), [], make_rng(1), {}, {}, 1000)
+    west.terrain.water_counters[(9, 3)][rabbit.uid] = 2
+    west.terrain.shelter_occupants[(10, 3)] = {rabbit.uid: 4}
+
+    rabbit.x = 10
+    emigrants = west._emigrate()
+    assert emigrants == {1: [(rabbit, {(9, 3): 2}, {(10, 3): 4})]}
+    assert not west.terrain.water_counters[(9, 3)] and not west.terrain.shelter_occupants[(10, 3)]
+
+    east.settle([], emigrants[1])
+    assert east.organisms == [rabbit] and east.spatial_index.at(10, 3) == [rabbit]
+    assert east.terrain.water_counters[(9, 3)] == {rabbit.uid: 2}
+    assert east.terrain.shelter_occupants[(10, 3)] == {rabbit.uid: 4}
+
+
+def test_rejected_border_pairing_is_undone_and_births_use_the_tile_uids():
+    layout = TileLayout(20, 2, 1)
+    rabbit, partner = Consumer("Rabbit", 11, 3), Consumer("Rabbit", 9, 3)
+    worker = TileWorker(1, layout, FoodWeb(FOODWEB_PATH), None, [rabbit], make_rng(0), {}, {}, 1000)
+    first_uid = next(Organism._uids)
+
+    contested, abroad, born, _, _ = worker.breed(0, [(0, [partner])], [], {"Rabbit": 2, "Carrot": 50}, [], [])
+    assert contested == [(rabbit.uid, partner.uid, 0)] and abroad == {} and born == 1
+    child = worker._births[0]
+    # Tile 1 of 2 allocates uids 1001, 1003, ...; the process-wide sequence is untouched.
+    assert (child.x, child.y, child.uid) == (10, 3, 1001)
+    assert next(Organism._uids) == first_uid + 1
+
+    counts, _, _ = worker.finish([0], [], False)
+    assert worker.organisms == [rabbit] and counts == {"Rabbit": 1}
+    assert worker._reproduction.last_repro == {}
+
+
+def test_single_tile_matches_simulation_engine():
+    # A single tile runs the per-organism logic of SimulationEngine in the same
+    # order; the population is placed from the second and the tile steps with
+    # the third stream spawned from the seed.
+    partitioned = _engine(processes=False, tiles=(1, 1))
+    partitioned.run()
+    _, placement, tile = spawn_rngs(3, 3)
+    engine = SimulationEngine(30, 25, FOODWEB_PATH, headless=True, seed=placement, initial_counts=INITIAL_COUNTS)
+    engine.terrain = _terrain()
+    engine.setup()
+    engine.rng = tile
+    engine._reset_reproduction()
+    for _ in range(25):
+        engine.step()
+    assert dict(partitioned.population_history) == dict(engine.population_history)
+    assert [(o.species, o.x, o.y, o.energy) for o in partitioned.organisms] == \
+           [(o.species, o.x, o.y, o.energy) for o in engine.organisms if o.alive]
+
+
+def test_tiled_populations_stay_within_tolerance_of_single_tile():
+    # Tiles see each other one phase late, so a tiled run is compared to the
+    # single-tile run over several seeds: the mean population per species over
+    # the run agrees within 25%.
+    def mean_populations(tiles, seed):
+        engine = _engine(processes=False, tiles=tiles, seed=seed)
+        engine.run()
+        return engine.population_history.array()[:3].mean(axis=1)
+
+    single = np.mean([mean_populations((1, 1), seed) for seed in range(8)], axis=0)
+    tiled = np.mean([mean_populations((3, 3), seed) for seed in range(8)], axis=0)
+    assert np.all(np.abs(tiled - single) <= 0.25 * single)
@@ -0,0 +1,79 @@
+import numpy as np
+import imageio.v3 as iio
+import pytest
+from core.organism import Producer, Consumer
+from core.population import PopulationArrays, OrganismView
+from simulation.engine import SimulationEngine
+
+
+def test_views_read_and_write_through():
+    store = PopulationArrays.from_organisms([Consumer("Fox", 1, 2, trophic_level="secondary"), Producer("Carrot", 3, 4)])
+    fox, carrot = store[0], store[1]
+    assert (fox.species, fox.x, fox.y, fox.trophic_level) == ("Fox", 1, 2, "secondary")
+    assert carrot.species == "Carrot" and carrot.is_producer
+    fox.x = 7
+    assert store.x[0] == 7
+
+
+def test_step_decays_energy_and_kills_consumers():
+    store = PopulationArrays(capacity=2)
+    store.add("Rabbit", 5, 5, energy=1)
+    store.add("Rabbit", 5, 5, energy=50)
+    store.add("Carrot", 0, 0, speed=0, kind=0)
+    store.step(10, rng=np.random.default_rng(0))
+    assert list(store.energy) == [0, 49, 100]
+    assert list(store.alive) == [False, True, True]
+    assert (store.x[2], store.y[2]) == (0, 0)
+    assert np.all((store.x >= 0) & (store.x < 10))
+
+
+def test_compact_and_round_trip():
+    store = PopulationArrays.from_organisms([Consumer("Rabbit", i, i) for i in range(5)])
+    store.alive[[1, 3]] = False
+    assert list(store.compact()) == [0, 2, 4]
+    organisms = store.to_organisms()
+    assert [(o.x, o.y) for o in organisms] == [(0, 0), (2, 2), (4, 4)]
+
+
+def test_compact_detaches_the_views_of_dropped_rows():
+    store = PopulationArrays.from_organisms([Consumer("Rabbit", i, i) for i in range(4)])
+    views = list(store)
+    views[1].alive = False
+    store.compact()
+    assert list(store) == [views[0], views[2], views[3]]
+    assert (views[2].x, views[3].x) == (2, 3)
+    views[2].x = 9
+    assert store.x[1] == 9
+    assert (views[1].x, views[1].alive) == (1, False)
+
+
+def test_views_are_producers_and_consumers():
+    fox, carrot = Consumer("Fox", 1, 2, trophic_level="secondary"), Producer("Carrot", 3, 4)
+    store = PopulationArrays.from_organisms([fox, carrot])
+    assert isinstance(store[0], Consumer) and isinstance(store[1], Producer)
+    assert store[1].is_edible and not hasattr(store[1], "trophic_level")
+    assert [org.uid for org in store.to_organisms()] == [fox.uid, carrot.uid]
+
+
+def test_engine_backends_give_the_same_run(seeded_engine, engine_state):
+    objects, arrays = seeded_engine(9), seeded_engine(9, backend="arrays")
+    objects.run()
+    arrays.run()
+    assert isinstance(arrays.organisms[0], OrganismView) and len(arrays.population) == len(arrays.organisms)
+    assert engine_state(arrays) == engine_state(objects)
+    for species, grid in objects.heatmaps.items():
+        assert (arrays.heatmaps[species] == grid).all()
+
+
+def test_engine_backends_animate_the_same_frames(seeded_engine, tmp_path):
+    paths = [str(tmp_path / f"{backend}.gif") for backend in ("objects", "arrays")]
+    for backend, path in zip(("objects", "arrays"), paths):
+        engine = seeded_engine(4, backend=backend, animation_path=path, animation_scale=2, compact_every=5)
+        engine.run()
+    objects, arrays = (iio.imread(path, index=None) for path in paths)
+    assert objects.shape[0] == 40 and (objects == arrays).all()
+
+
+def test_engine_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        SimulationEngine(backend="columns")
@@ -0,0 +1,109 @@
+import json
+import logging
+import numpy as np
+import pytest
+from core.organism import Consumer
+from core.terrain import Terrain
+from simulation.engine import SimulationEngine
+from simulation.recorder import COLUMNS, INDEX_FILE, META_FILE, TrajectoryRecorder, column_file
+from simulation.replay import Trajectory
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def _load(directory, name):
+    return np.asarray(Trajectory(str(directory)).columns[name])
+
+
+def test_recording_matches_population_history(tmp_path):
+    logging.getLogger("simulation").setLevel(logging.WARNING)
+    engine = SimulationEngine(grid_size=15, steps=12, foodweb_path=FOODWEB_PATH, headless=True,
+                              record_path=str(tmp_path))
+    engine.terrain = Terrain(15)
+    engine.setup()
+    engine.run()
+
+    meta = json.loads((tmp_path / META_FILE).read_text())
+    index = np.fromfile(tmp_path / INDEX_FILE, dtype=np.int64).reshape(-1, 3)
+    assert meta["steps"] == 12 and index[:, 0].tolist() == list(range(12))
+    assert meta["rows"] == index[-1, 1] + index[-1, 2] == len(_load(tmp_path, "x"))
+
+    species, alive = _load(tmp_path, "species"), _load(tmp_path, "alive")
+    for step, start, count in index:
+        rows = slice(start, start + count)
+        for name, counts in engine.population_history.items():
+            sid = meta["species"].index(name)
+            assert np.count_nonzero(alive[rows] & (species[rows] == sid)) == counts[step]
+
+
+def test_chunks_are_compressed_and_decompressed_on_demand(tmp_path):
+    organisms = [Consumer("Rabbit", x, 3) for x in range(100)]
+    with TrajectoryRecorder(str(tmp_path), 100, buffer_rows=250) as recorder:
+        for step in range(10):
+            for org in organisms:
+                org.energy -= 1
+            recorder.record(step, organisms)
+    meta = json.loads((tmp_path / META_FILE).read_text())
+    assert meta["rows"] == 1000 and meta["chunks"] == 4
+    raw = sum(1000 * np.dtype(dtype).itemsize for dtype in COLUMNS.values())
+    assert sum((tmp_path / column_file(name)).stat().st_size for name in COLUMNS) < raw / 4
+
+    trajectory = Trajectory(str(tmp_path))
+    energy = trajectory.columns["energy"]
+    assert len(energy) == 1000 and np.asarray(energy).tolist() == [99 - step for step in range(10) for _ in range(100)]
+    # Step 5 lies in the second chunk (rows 300-599), which is the only one decompressed.
+    assert trajectory.state(5)["x"].tolist() == list(range(100))
+    assert energy[trajectory.rows(5)].tolist() == [94] * 100 and energy._cached[0] == 1
+    assert energy[250:350].tolist() == [97] * 50 + [96] * 50
+
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(str(tmp_path), 100, resume_at=(450, 5))
+
+
+def test_replay_regenerates_history_and_frames(tmp_path):
+    logging.getLogger("simulation").setLevel(logging.WARNING)
+    engine = SimulationEngine(grid_size=15, steps=10, foodweb_path=FOODWEB_PATH, headless=True,
+                              record_path=str(tmp_path / "rec"))
+    engine.terrain = Terrain(15)
+    engine.setup()
+    engine.run()
+
+    trajectory = Trajectory(str(tmp_path / "rec"))
+    assert len(trajectory) == 10
+    assert trajectory.population_history() == dict(engine.population_history)
+    assert trajectory.population_history(3, 6) == {k: v[3:6] for k, v in engine.population_history.items()}
+    heatmaps = trajectory.heatmaps(0, 1)
+    assert sum(int(grid.sum()) for grid in heatmaps.values()) == sum(v[0] for v in engine.population_history.values())
+
+    snapshot = trajectory.snapshot(4)
+    assert set(snapshot.species[snapshot.alive]) <= set(engine.foodweb.species_names)
+    paths = trajectory.render_frames(8, output_dir=str(tmp_path / "frames"))
+    assert [p.rsplit("/", 1)[1] for p in paths] == ["step_008.png", "step_009.png"]
+
+
+def test_resumed_run_continues_the_recording(tmp_path):
+    def engine(steps, **kwargs):
+        logging.getLogger("simulation").setLevel(logging.WARNING)
+        engine = SimulationEngine(grid_size=15, steps=steps, foodweb_path=FOODWEB_PATH, headless=True, seed=4,
+                                  **kwargs)
+        engine.terrain = Terrain(15)
+        return engine
+
+    reference = engine(20, record_path=str(tmp_path / "reference"))
+    reference.setup()
+    reference.run()
+
+    checkpoint = str(tmp_path / "run.ckpt")
+    interrupted = engine(16, record_path=str(tmp_path / "rec"), checkpoint_path=checkpoint, checkpoint_every=10)
+    interrupted.setup()
+    interrupted.run()
+    resumed = engine(20, record_path=str(tmp_path / "rec"))
+    resumed.load_checkpoint(checkpoint)
+    resumed.run()
+
+    trajectory, expected = Trajectory(str(tmp_path / "rec")), Trajectory(str(tmp_path / "reference"))
+    assert trajectory.steps.tolist() == list(range(20))
+    assert [trajectory.rows(step) for step in range(20)] == [expected.rows(step) for step in range(20)]
+    for name in COLUMNS:
+        if name != "uid":
+            assert np.array_equal(trajectory.columns[name], expected.columns[name])
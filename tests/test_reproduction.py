@@ -0,0 +1,36 @@
+from core.organism import Consumer, Producer
+from core.foodweb import FoodWeb
+from core.terrain import Terrain
+from logic.reproduction import reproduce, ReproductionContext
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def _context():
+    return ReproductionContext(foodweb=FoodWeb(FOODWEB_PATH))
+
+
+def test_proximity_pair_spawns_at_midpoint():
+    context = _context()
+    carrots = [Producer("Carrot", 19, y) for y in range(10)]
+    rabbits = [Consumer("Rabbit", 2, 2), Consumer("Rabbit", 4, 2), Consumer("Rabbit", 10, 10)]
+    newborns = reproduce(rabbits + carrots, 20, 1, context)
+    assert [(o.species, o.x, o.y) for o in newborns] == [("Rabbit", 3, 2)]
+    assert context.births == {"pairing": 1} and context.last_repro == {("Rabbit", (3, 2)): 1}
+
+
+def test_dead_consumers_do_not_pair():
+    carrots = [Producer("Carrot", 19, y) for y in range(10)]
+    rabbits = [Consumer("Rabbit", 2, 2), Consumer("Rabbit", 4, 2), Consumer("Rabbit", 10, 10)]
+    rabbits[1].alive = False
+    assert reproduce(rabbits + carrots, 20, 1, _context()) == []
+
+
+def test_last_primary_respawns_in_first_placed_shelter():
+    terrain = Terrain(20)
+    terrain.load_from_config("configs/terrain_config.json")
+    context = ReproductionContext(foodweb=FoodWeb(FOODWEB_PATH), terrain=terrain)
+    carrots = [Producer("Carrot", 19, y) for y in range(10)]
+    newborns = reproduce([Consumer("Rabbit", 2, 2)] + carrots, 20, 1, context)
+    assert [(o.species, o.x, o.y) for o in newborns] == [("Rabbit", 15, 6)]
+    assert context.births == {"primary_fallback": 1}
@@ -0,0 +1,26 @@
+import numpy as np
+from core.rng import RandomSource, make_rng, spawn_rngs, jumped_rngs
+
+
+def test_same_seed_reproduces_run(seeded_engine, engine_state):
+    first, second, other = seeded_engine(5), seeded_engine(5), seeded_engine(6)
+    for engine in (first, second, other):
+        engine.run()
+    assert engine_state(first) == engine_state(second)
+    assert engine_state(first) != engine_state(other)
+
+
+def test_spawned_and_jumped_streams_are_distinct_and_reproducible():
+    for make in (spawn_rngs, jumped_rngs):
+        draws = [[rng.randint(0, 2**32) for _ in range(8)] for rng in make(42, 4)]
+        assert len({tuple(d) for d in draws}) == 4
+        assert draws == [[rng.randint(0, 2**32) for _ in range(8)] for rng in make(42, 4)]
+    rng = make_rng(1)
+    assert make_rng(rng) is rng and isinstance(make_rng(None).generator, np.random.Generator)
+
+
+def test_random_source_serves_block_draws_in_range():
+    rng = RandomSource(3, block_size=5)
+    values = [rng.randint(-1, 1) for _ in range(300)]
+    assert set(values) == {-1, 0, 1}
+    assert RandomSource(3, block_size=5).random() == RandomSource(3).random()
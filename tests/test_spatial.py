@@ -0,0 +1,90 @@
+import pickle
+import random
+from core.organism import Organism, Consumer
+from core.foodweb import FoodWeb
+from core.spatial import SpatialIndex
+import logic.behavior as behavior
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def test_within_matches_linear_scan():
+    random.seed(1)
+    orgs = [Organism("Rabbit", random.randint(0, 29), random.randint(0, 29)) for _ in range(200)]
+    orgs[0].alive = False
+    index = SpatialIndex(30, orgs)
+    for _ in range(20):
+        x, y = random.randint(0, 29), random.randint(0, 29)
+        expected = {id(o) for o in orgs if o.alive and abs(o.x - x) + abs(o.y - y) <= 3}
+        assert {id(o) for o in index.within(x, y, 3)} == expected
+
+
+def test_update_moves_organism_between_cells():
+    org = Organism("Fox", 2, 2)
+    index = SpatialIndex(10, [org])
+    org.x, org.y = 5, 6
+    index.update(org)
+    assert index.at(2, 2) == []
+    assert index.at(5, 6) == [org]
+    index.remove(org)
+    assert len(index) == 0
+
+
+def test_eat_if_possible_uses_index():
+    foodweb = FoodWeb(FOODWEB_PATH)
+    fox = Consumer("Fox", 4, 4, trophic_level="secondary")
+    rabbit = Consumer("Rabbit", 4, 4)
+    far_rabbit = Consumer("Rabbit", 8, 8)
+    fox.energy = fox.max_energy - 5
+    index = SpatialIndex(10, [fox, rabbit, far_rabbit])
+    assert behavior.eat_if_possible(fox, [], foodweb, index=index) == [(rabbit, 5)]
+    assert not rabbit.alive
+    assert far_rabbit.alive
+
+
+def test_flee_reacts_only_to_indexed_predators_in_range():
+    foodweb = FoodWeb(FOODWEB_PATH)
+    rabbit = Consumer("Rabbit", 5, 5)
+    fox = Consumer("Fox", 9, 9, trophic_level="secondary")
+    index = SpatialIndex(10, [rabbit, fox])
+    behavior.flee(rabbit, [], foodweb, index=index, grid_size=10)
+    assert (rabbit.x, rabbit.y) == (5, 5)
+    fox.x, fox.y = 7, 5
+    index.update(fox)
+    behavior.flee(rabbit, [], foodweb, index=index, grid_size=10)
+    assert (rabbit.x, rabbit.y) != (5, 5)
+
+
+def test_occupancy_tracks_moves_deaths_and_removals():
+    a = Organism("Rabbit", 1, 1)
+    b = Organism("Rabbit", 1, 1)
+    index = SpatialIndex(5, [a, b])
+    assert index.occupancy[1, 1] == 2
+    a.alive = False
+    index.update(a)
+    b.x = 3
+    index.update(b)
+    assert not index.is_occupied(1, 1) and index.is_occupied(3, 1)
+    index.remove(a)
+    index.remove(b)
+    assert index.occupancy.sum() == 0
+
+
+def test_windowed_index_counts_only_cells_inside_the_window():
+    inside = Organism("Rabbit", 4, 5)
+    outside = Organism("Rabbit", 9, 9)
+    index = SpatialIndex(10, [inside, outside], bounds=(3, 3, 7, 7))
+    assert index.occupancy.shape == (4, 4) and index.occupancy[2, 1] == 1
+    assert index.is_occupied(4, 5) and not index.is_occupied(9, 9)
+    assert index.within(9, 9, 0) == [outside]
+    inside.x = 8
+    index.update(inside)
+    assert index.occupancy.sum() == 0
+
+
+def test_index_survives_pickling():
+    org = Organism("Fox", 2, 2)
+    index, copied = pickle.loads(pickle.dumps((SpatialIndex(10, [org]), org)))
+    copied.x = 6
+    index.update(copied)
+    assert index.at(6, 2) == [copied] and index.at(2, 2) == []
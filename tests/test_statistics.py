@@ -2,7 +2,8 @@ import pytest
 import os
 import numpy as np
 from statistic_tools.population import export_population_chart, display_population_chart
-from statistic_tools.heatmap import export_heatmaps, display_heatmap
+from statistic_tools.heatmap import HeatmapAccumulator, downsample_heatmap, export_heatmaps, display_heatmap
+from simulation.engine import SimulationEngine
 
 
 def test_export_population_chart(tmp_path):
@@ -46,3 +47,55 @@ def test_display_heatmap_does_not_crash(tmp_path):
         display_heatmap("rabbit", path=str(output_dir))
     except Exception:
         pytest.fail("display_heatmap crashed unexpectedly")
+
+
+def test_heatmap_accumulator_storages_agree():
+    rng = np.random.default_rng(0)
+    xs, ys = rng.integers(-2, 52, 5000), rng.integers(0, 40, 5000)
+    species = rng.choice(["rabbit", "fox"], 5000)
+    inside = (xs >= 0) & (xs < 50)
+    expected = {}
+    for name in ("rabbit", "fox"):
+        grid = np.zeros((40, 50), dtype=int)
+        np.add.at(grid, (ys[inside & (species == name)], xs[inside & (species == name)]), 1)
+        expected[name] = grid
+
+    dense = HeatmapAccumulator(50, 40)
+    sparse = HeatmapAccumulator(50, 40, sparse=True)
+    blocks = HeatmapAccumulator(50, 40, block=4)
+    for accumulator in (dense, sparse, blocks):
+        for name in ("rabbit", "fox"):
+            accumulator.add(name, xs[species == name], ys[species == name])
+    for name, grid in expected.items():
+        assert dense[name].dtype == np.uint32
+        assert (dense[name] == grid).all() and (sparse[name] == grid).all()
+        assert blocks[name].shape == (10, 13)
+        assert (blocks[name] == downsample_heatmap(grid, 4)).all()
+        assert (sparse.downsampled(name, 4) == blocks[name]).all()
+
+
+def test_heatmap_accumulator_merges_tiles():
+    tile = HeatmapAccumulator(5, 5, origin=(10, 5))
+    tile.add("fox", [10, 14, 15], [5, 9, 9])
+    world = HeatmapAccumulator(20)
+    world.merge(tile)
+    assert world["fox"].sum() == 2 and world["fox"][5, 10] == 1 and world["fox"][9, 14] == 1
+
+
+def test_engine_heatmap_options_and_pyramid_export(tmp_path):
+    engines = [SimulationEngine(grid_size=20, steps=10, foodweb_path="configs/foodweb_config.json",
+                                headless=True, seed=4, **options)
+               for options in ({}, {"heatmap_sparse": True}, {"heatmap_block": 5})]
+    for engine in engines:
+        engine.setup()
+        engine.run()
+    dense, sparse, blocks = (engine.heatmaps for engine in engines)
+    assert set(dense) == set(sparse) == set(blocks)
+    for species in dense:
+        assert (sparse[species] == dense[species]).all()
+        assert (blocks[species] == downsample_heatmap(dense[species], 5)).all()
+
+    export_heatmaps(dense, output_dir=str(tmp_path), levels=3)
+    species = next(iter(dense))
+    for name in (f"heatmap_{species}.png", f"heatmap_{species}_level1.png", f"heatmap_{species}_level2.png"):
+        assert (tmp_path / name).exists()
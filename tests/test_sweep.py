@@ -0,0 +1,25 @@
+import csv
+from simulation.sweep import expand_grid, engine_kwargs, run_sweep
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def test_expand_grid_and_dotted_parameters():
+    configs = expand_grid({"grid_size": [10, 20], "repro_cooldowns.primary": [1, 3], "steps": 5})
+    assert len(configs) == 4 and configs[0] == {"grid_size": 10, "repro_cooldowns.primary": 1, "steps": 5}
+    assert engine_kwargs(configs[3]) == {"grid_size": 20, "repro_cooldowns": {"primary": 3}, "steps": 5}
+
+
+def test_sweep_writes_tidy_table_and_resumes(tmp_path):
+    out = str(tmp_path / "sweep.csv")
+    grid = {"grid_size": [15], "steps": [4], "seed": [1, 2], "initial_counts.Rabbit": [3]}
+    assert run_sweep(grid, out, workers=2, foodweb_path=FOODWEB_PATH) == 2
+    with open(out, newline="") as fp:
+        rows = list(csv.DictReader(fp))
+    assert list(rows[0]) == ["config_hash", "grid_size", "steps", "seed", "initial_counts.Rabbit",
+                             "step", "species", "count"]
+    assert len({row["config_hash"] for row in rows}) == 2
+    assert all(int(row["count"]) <= 3 for row in rows if row["species"] == "Rabbit" and row["step"] == "0")
+
+    grid["seed"].append(3)
+    assert run_sweep(grid, out, workers=2, foodweb_path=FOODWEB_PATH) == 1
@@ -0,0 +1,44 @@
+import numpy as np
+from core.terrain import Terrain, PLAIN, SHELTER
+
+TERRAIN_PATH = "configs/terrain_config.json"
+
+
+def test_load_from_config_fills_grid_and_masks():
+    terrain = Terrain(20)
+    terrain.load_from_config(TERRAIN_PATH)
+    assert terrain.get_type(3, 3) == "water" and terrain.is_water(6, 4)
+    assert terrain.is_blocked(5, 5) and not terrain.passable[5, 5]
+    assert terrain.is_shelter(15, 6) and terrain.is_hill(12, 12)
+    assert terrain.map[(4, 5)] == "shelter"
+    assert not terrain.is_water(-1, 3) and terrain.get_type(25, 0) == "plain"
+
+
+def test_masks_support_fancy_indexing():
+    terrain = Terrain(20)
+    terrain.load_from_config(TERRAIN_PATH)
+    xs = np.array([3, 5, 0])
+    ys = np.array([3, 5, 0])
+    assert list(terrain.water[ys, xs]) == [True, False, False]
+    assert list(terrain.passable[ys, xs]) == [False, False, True]
+
+
+def test_random_generation_only_overwrites_plain():
+    terrain = Terrain(40)
+    terrain.generate_water()
+    water = terrain.water.copy()
+    terrain.generate_trees()
+    terrain.generate_hills()
+    terrain.generate_shelters()
+    assert np.array_equal(terrain.water, water)
+    assert terrain.blocked.any() and terrain.shelter.any()
+
+
+def test_shelters_keep_placement_order():
+    terrain = Terrain(20)
+    terrain.load_from_config(TERRAIN_PATH)
+    assert terrain.shelters == [(15, 6), (4, 5)]
+    terrain.grid[2, 7] = SHELTER
+    terrain.grid[5, 4] = PLAIN
+    terrain.refresh_masks()
+    assert terrain.shelters == [(15, 6), (7, 2)]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from simulation.engine import SimulationEngine
+from statistic_tools.population import export_population_chart
+from statistic_tools.timeseries import PopulationSeries, load_population_series
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def test_series_grows_and_adds_species():
+    series = PopulationSeries(["rabbit"], capacity=2)
+    for step in range(5):
+        series.append({"rabbit": step, **({"fox": 1} if step >= 3 else {})})
+    assert series.stop == 5 and series.species == ["rabbit", "fox"]
+    assert dict(series) == {"rabbit": [0, 1, 2, 3, 4], "fox": [0, 0, 0, 1, 1]}
+    assert series.array(1, 3).tolist() == [[1, 2], [0, 0]]
+    assert PopulationSeries.from_history(dict(series)).array().tolist() == series.array().tolist()
+
+
+@pytest.mark.parametrize("suffix", ["csv", "npy"])
+def test_windowed_series_streams_every_step(tmp_path, suffix):
+    path = str(tmp_path / f"history.{suffix}")
+    series = PopulationSeries(["rabbit", "fox"], window=10, flush_path=path, flush_every=64)
+    for step in range(95):
+        series.append([step, 2 * step])
+    assert series.start == 85 and series["rabbit"] == list(range(85, 95))
+    series.close()
+
+    loaded = load_population_series(path)
+    assert loaded.species == ["rabbit", "fox"] and loaded.stop == 95
+    assert loaded["fox"] == [2 * step for step in range(95)]
+
+
+@pytest.mark.parametrize("suffix", ["csv", "npy"])
+def test_restored_series_appends_from_checkpoint(tmp_path, suffix):
+    path = str(tmp_path / f"history.{suffix}")
+    series = PopulationSeries(["rabbit", "fox"], window=10, flush_path=path, flush_every=8)
+    for step in range(60):
+        series.append([step, 2 * step])
+    checkpoint = series.copy()
+    for step in range(60, 95):
+        series.append([step, 2 * step])
+    series.close()
+
+    resumed = PopulationSeries(["rabbit", "fox"], window=10, flush_path=path, flush_every=8)
+    resumed.restore(checkpoint)
+    for step in range(60, 70):
+        resumed.append([-step, 0])
+    resumed.close()
+
+    loaded = load_population_series(path)
+    assert loaded.stop == 70
+    assert loaded["rabbit"] == list(range(60)) + [-step for step in range(60, 70)]
+
+
+def test_decimated_keeps_last_step():
+    series = PopulationSeries.from_history({"rabbit": list(range(1000))})
+    steps, counts = series.decimated(100)
+    assert len(steps) <= 101 and steps[0] == 0 and steps[-1] == 999
+    assert (counts[0] == steps).all()
+
+
+def test_engine_history_window_file_and_chart(tmp_path):
+    path = str(tmp_path / "history.csv")
+    full = SimulationEngine(grid_size=20, steps=30, foodweb_path=FOODWEB_PATH, headless=True, seed=5)
+    windowed = SimulationEngine(grid_size=20, steps=30, foodweb_path=FOODWEB_PATH, headless=True, seed=5,
+                                history_window=8, history_path=path, history_flush_every=4)
+    for engine in (full, windowed):
+        engine.setup()
+        engine.run()
+    assert dict(load_population_series(path)) == dict(full.population_history)
+    assert {k: v[-8:] for k, v in full.population_history.items()} == dict(windowed.population_history)
+
+    export_population_chart(windowed.population_history, output_dir=str(tmp_path), max_points=5)
+    assert (tmp_path / "population_chart.png").exists()
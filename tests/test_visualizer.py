@@ -0,0 +1,103 @@
+import numpy as np
+import imageio.v3 as iio
+from PIL import Image
+from core.organism import Consumer, Producer
+from core.foodweb import FoodWeb
+from core.terrain import Terrain
+from visualizer.plot import FrameRenderer
+from visualizer.animation import AnimationWriter
+from visualizer.raster import FrameRasterizer, rasterize_frame, hex_to_rgb8
+
+FOODWEB_PATH = "configs/foodweb_config.json"
+
+
+def test_frame_renderer_saves_frames(tmp_path):
+    foodweb = FoodWeb(FOODWEB_PATH)
+    renderer = FrameRenderer(10, output_dir=str(tmp_path), foodweb=foodweb, terrain=Terrain(10))
+    organisms = [Consumer("Rabbit", 1, 1), Producer("Carrot", 1, 1)]
+    organisms[1].alive = False
+    renderer.draw(0, organisms)
+    renderer.draw(1, organisms[:1])
+    renderer.close()
+    assert (tmp_path / "step_000.png").exists() and (tmp_path / "step_001.png").exists()
+
+
+def test_frame_renderer_keeps_species_colors_without_foodweb(tmp_path):
+    renderer = FrameRenderer(10, output_dir=str(tmp_path), terrain=Terrain(10))
+    renderer.draw(0, [Consumer("Rabbit", 1, 1)])
+    rabbit = renderer._colors["Rabbit"]
+    renderer.draw(1, [Consumer("Fox", 2, 2), Consumer("Rabbit", 1, 1)])
+    renderer.close()
+    assert renderer._colors["Rabbit"] == rabbit
+    assert renderer._colors["Fox"] != rabbit
+
+
+def test_rasterizer_paints_species_colors_bottom_up():
+    foodweb = FoodWeb(FOODWEB_PATH)
+    terrain = Terrain(10)
+    terrain.grid[9, 9] = 1
+    terrain.refresh_masks()
+    fox = Consumer("Fox", 0, 0, trophic_level="secondary")
+    image = rasterize_frame([fox], grid_size=10, foodweb=foodweb, terrain=terrain, scale=4)
+    assert image.shape == (40, 40, 3) and image.dtype == np.uint8
+    assert (image[38, 1] == hex_to_rgb8(foodweb.get_color("Fox"))).all()
+    assert (image[0, 39] == hex_to_rgb8("#add8e6")).all()
+
+
+def test_rasterizer_marks_dead_organisms():
+    rasterizer = FrameRasterizer(5, scale=3, species_names=["Rabbit"])
+    image = rasterizer.render(np.array([2]), np.array([2]), np.array([0]), np.array([False]))
+    assert (image[6, 6] == (128, 128, 128)).all()
+
+
+def test_rasterizer_renders_columns_through_species_lut():
+    foodweb = FoodWeb(FOODWEB_PATH)
+    rasterizer = FrameRasterizer(10, foodweb=foodweb, scale=2)
+    organisms = [Consumer("Fox", 1, 2), Producer("Carrot", 3, 4), Consumer("Rabbit", 5, 6), Consumer("Wolf", 7, 8)]
+    organisms[2].alive = False
+    expected = rasterizer.render_organisms(organisms).copy()
+    # Ids numbered like a recording, in an order unrelated to the palette.
+    names = ["Wolf", "Rabbit", "Carrot", "Fox"]
+    image = rasterizer.render_columns(
+        np.array([o.x for o in organisms]), np.array([o.y for o in organisms]),
+        np.array([names.index(o.species) for o in organisms]), np.array([o.alive for o in organisms]),
+        species_names=names)
+    assert (image == expected).all()
+    assert rasterizer.species_lut(names) is rasterizer.species_lut(list(names))
+
+
+def test_animation_writer_streams_gif_frames(tmp_path):
+    rasterizer = FrameRasterizer(10, foodweb=FoodWeb(FOODWEB_PATH), scale=3)
+    rabbit = Consumer("Rabbit", 0, 0)
+    frames = []
+    with AnimationWriter(str(tmp_path / "run.gif"), fps=5) as writer:
+        for x in range(3):
+            rabbit.x = x
+            frames.append(rasterizer.render_organisms([rabbit]))
+            writer.append(frames[-1])
+    assert writer.frames_written == 3
+    decoded = iio.imread(tmp_path / "run.gif", index=None)
+    assert decoded.shape[0] == 3
+    for image, frame in zip(decoded, frames):
+        assert (image[..., :3] == frame).all()
+
+
+def test_gif_stream_writes_every_frame_as_it_arrives(tmp_path):
+    path = tmp_path / "run.gif"
+    writer = AnimationWriter(str(path), fps=5)
+    sizes = []
+    for value in range(4):
+        writer.append(np.full((30, 30, 3), 60 * value, dtype=np.uint8))
+        sizes.append(path.stat().st_size)
+        assert not any(isinstance(kept, (list, np.ndarray, Image.Image)) for kept in vars(writer._writer).values())
+    writer.close()
+    assert sizes == sorted(set(sizes))
+    decoded = iio.imread(path, index=None)
+    assert decoded.shape == (4, 30, 30, 3) and (decoded[3][..., :3] == 180).all()
+
+
+def test_animation_writer_without_frames_leaves_no_gif(tmp_path):
+    writer = AnimationWriter(str(tmp_path / "empty.gif"))
+    writer.close()
+    assert writer.frames_written == 0
+    assert not (tmp_path / "empty.gif").exists()
@@ -0,0 +1,127 @@
+import os
+import importlib.util
+import warnings
+import numpy as np
+import imageio
+from PIL import Image, GifImagePlugin
+
+
+def ffmpeg_available():
+    """
+    Checks whether imageio's ffmpeg plugin (imageio-ffmpeg) is installed.
+
+    Returns:
+        bool: True if MP4 output is supported.
+    """
+    return importlib.util.find_spec("imageio_ffmpeg") is not None
+
+
+class AnimationWriter:
+    """
+    Streaming animation sink.
+
+    Frames (RGB ``uint8`` arrays, e.g. from FrameRasterizer) are handed over as
+    they arrive, encoded and appended to the file straight away, so peak memory
+    is one frame regardless of the run length. No GIF file is created when no
+    frame was appended. GIF output is always available; MP4 output is used when
+    imageio's ffmpeg plugin is installed, otherwise the writer falls back to GIF
+    next to the requested path.
+
+    Attributes:
+        output_path (str): Path of the file being written.
+        format (str): 'gif' or 'mp4'.
+        fps (int): Frames per second.
+        frames_written (int): Number of frames appended so far.
+    """
+
+    def __init__(self, output_path="statistics_plots/animation.gif", fps=4, format=None):
+        """
+        Opens the output file.
+
+        Parameters:
+            output_path (str): Where to save the animation.
+            fps (int): Frames per second.
+            format (str): 'gif' or 'mp4'; guessed from the file extension if None.
+        """
+        format = (format or os.path.splitext(output_path)[1].lstrip(".") or "gif").lower()
+        if format == "mp4" and not ffmpeg_available():
+            warnings.warn("imageio-ffmpeg is not installed, writing a GIF animation instead of MP4.")
+            output_path = os.path.splitext(output_path)[0] + ".gif"
+            format = "gif"
+        if format not in ("gif", "mp4"):
+            raise ValueError(f"Unsupported animation format: {format}")
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.output_path = output_path
+        self.format = format
+        self.fps = fps
+        self.frames_written = 0
+        if format == "mp4":
+            self._writer = imageio.get_writer(output_path, format="FFMPEG", mode="I", fps=fps, macro_block_size=1)
+        else:
+            self._writer = _GifStream(output_path, fps)
+
+    def append(self, frame):
+        """
+        Encodes one frame and appends it to the animation.
+
+        Parameters:
+            frame (numpy.ndarray): RGB or RGBA uint8 image. All frames must have the same size.
+        """
+        frame = np.asarray(frame)
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = frame[..., :3]
+        self._writer.append_data(np.ascontiguousarray(frame, dtype=np.uint8))
+        self.frames_written += 1
+
+    def close(self):
+        """
+        Finishes the file. Further appends are not allowed.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _GifStream:
+    """
+    Streaming GIF sink for AnimationWriter.
+
+    Every frame is reduced to a palette image and encoded by Pillow as soon as
+    it arrives; its image block, with its own colour table, is appended to the
+    file and the frame is dropped. The file is opened with the first frame and
+    finished with the GIF trailer on close, so nothing is written when no frame
+    was appended.
+    """
+
+    def __init__(self, path, fps):
+        self._path = path
+        self._duration = 1000 / fps
+        self._file = None
+        self._size = None
+
+    def append_data(self, frame):
+        image = Image.fromarray(frame).quantize(colors=256)
+        if self._file is None:
+            header, _ = GifImagePlugin.getheader(image, info={"loop": 0})
+            self._file = open(self._path, "wb")
+            self._file.writelines(header)
+            self._size = image.size
+        elif image.size != self._size:
+            raise ValueError(f"Frame size {image.size} differs from the first frame {self._size}.")
+        self._file.writelines(GifImagePlugin.getdata(image, duration=self._duration, include_color_table=True))
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.write(b";")
+            self._file.close()
+            self._file = None
@@ -1,11 +1,207 @@
 import matplotlib.pyplot as plt
-import matplotlib.cm as cm
 import matplotlib.colors as mcolors
-from collections import defaultdict
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import os
 import imageio
 import numpy as np
 from IPython.display import Image
+from visualizer.animation import AnimationWriter
+
+# Háttérszínek terrain típusokhoz
+TERRAIN_COLORS = {
+    "tree": "#2e8b57",     # sötétzöld
+    "water": "#add8e6",    # világoskék
+    "hill": "#7d705c",     # barnás
+    "shelter": "#d3d3d3",  # világosszürke
+    "plain": "#a1cca3"     # halványzöld
+}
+
+
+class FrameRenderer:
+    """
+    Reusable renderer for simulation frames.
+
+    The figure, the axes and the terrain background are created once: the terrain
+    is drawn as a single ``imshow`` image and organisms as one scatter collection
+    per species (plus one for dead organisms), whose offsets and colours are
+    updated on every frame. The per-frame cost therefore depends on the number of
+    organisms, not on the grid area or on figure setup.
+
+    Attributes:
+        grid_size (int): Size of the simulation grid.
+        output_dir (str): Directory the frames are saved to.
+        foodweb (object): Optional foodweb object to map species to consistent colors.
+        fig (matplotlib.figure.Figure): The reused figure.
+        ax (matplotlib.axes.Axes): The reused axes.
+    """
+
+    def __init__(self, grid_size=20, output_dir="frames", foodweb=None, terrain=None, scale=0.3, max_inches=30,
+                 colors=None, background=None):
+        """
+        Creates the figure and draws the static terrain background.
+
+        Parameters:
+            grid_size (int): Size of the simulation grid (default is 20).
+            output_dir (str): Directory to save the output PNGs (default is "frames").
+            foodweb (object): Optional foodweb object to map species to consistent colors.
+            terrain (object): Optional terrain object to render environmental backgrounds.
+            scale (float): Figure inches per grid cell (default is 0.3).
+            max_inches (float): Upper limit of the figure side in inches (default is 30).
+            colors (dict): Optional precomputed species -> color mapping.
+            background (numpy.ndarray): Optional precomputed terrain image (see terrain_rgb),
+                used instead of the terrain object.
+        """
+        self.grid_size = grid_size
+        self.output_dir = output_dir
+        self.foodweb = foodweb
+        self._colors = dict(colors or {})
+        self._collections = {}
+
+        side = min(grid_size * scale, max_inches)
+        self.fig = Figure(figsize=(side, side))
+        FigureCanvasAgg(self.fig)
+        ax = self.ax = self.fig.gca()
+        ax.set_facecolor(TERRAIN_COLORS["plain"])
+        ax.grid(True, color=TERRAIN_COLORS["plain"])
+        ax.set_xlim(0, grid_size)
+        ax.set_ylim(0, grid_size)
+        if grid_size <= 50:
+            ax.set_xticks(range(0, grid_size + 1))
+            ax.set_yticks(range(0, grid_size + 1))
+        ax.grid(True)
+
+        if background is None and terrain:
+            background = terrain_rgb(terrain, grid_size)
+        if background is not None:
+            ax.imshow(background, origin="lower", extent=(0, grid_size, 0, grid_size),
+                      interpolation="nearest", aspect="auto", zorder=0)
+
+        self._dead = ax.scatter([], [], marker="x", c="gray", s=100, zorder=2)
+        self._title = ax.set_title("")
+
+    def _collection(self, species):
+        collection = self._collections.get(species)
+        if collection is None:
+            collection = self.ax.scatter([], [], marker="o", s=100, zorder=2)
+            self._collections[species] = collection
+        return collection
+
+    def draw(self, step, organisms):
+        """
+        Renders and saves the frame of one step from a list of organisms.
+
+        Parameters:
+            step (int): The simulation step number.
+            organisms (list): List of organism objects with species, coordinates, and alive status.
+
+        Returns:
+            str: Path of the saved PNG.
+        """
+        xs = np.fromiter((o.x for o in organisms), dtype=np.int64, count=len(organisms))
+        ys = np.fromiter((o.y for o in organisms), dtype=np.int64, count=len(organisms))
+        alive = np.fromiter((o.alive for o in organisms), dtype=bool, count=len(organisms))
+        species = np.array([o.species for o in organisms], dtype=object)
+        return self.draw_arrays(step, xs, ys, species, alive)
+
+    def draw_arrays(self, step, xs, ys, species, alive):
+        """
+        Renders and saves the frame of one step from coordinate arrays.
+
+        If multiple organisms are at the same position, they are slightly offset
+        to be visible. Dead organisms are marked with 'x'.
+
+        Parameters:
+            step (int): The simulation step number.
+            xs (numpy.ndarray): X-coordinates.
+            ys (numpy.ndarray): Y-coordinates.
+            species (numpy.ndarray): Species name of every organism.
+            alive (numpy.ndarray): Alive flag of every organism.
+
+        Returns:
+            str: Path of the saved PNG.
+        """
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+
+        offset = 0.1 * stack_ranks(xs, ys, self.grid_size)
+        points = np.column_stack([xs + 0.5 + offset, ys + 0.5 + offset])
+
+        self._dead.set_offsets(points[~alive] if len(points) else np.empty((0, 2)))
+        names = list(dict.fromkeys(species[alive].tolist()))
+        missing = [name for name in names if name not in self._colors]
+        if missing and self.foodweb:
+            self._colors.update(get_species_colors_for(missing, foodweb=self.foodweb))
+        elif missing:
+            # Continue the palette so species already drawn keep their colour.
+            cmap = plt.get_cmap('tab10')
+            for i, name in enumerate(missing, start=len(self._colors)):
+                self._colors[name] = mcolors.to_hex(cmap(i % cmap.N))
+        for name in names:
+            self._collection(name)
+        for name, collection in self._collections.items():
+            mask = alive & (species == name)
+            collection.set_offsets(points[mask] if mask.any() else np.empty((0, 2)))
+            collection.set_color(self._colors.get(name, "black"))
+
+        self._title.set_text(f"Step {step}")
+        path = f"{self.output_dir}/step_{step:03d}.png"
+        self.fig.savefig(path)
+        return path
+
+    def close(self):
+        """
+        Releases the figure.
+        """
+        self.fig.clear()
+
+
+def terrain_rgb(terrain, grid_size):
+    """
+    Builds an RGB image of the terrain, indexed [y, x], using TERRAIN_COLORS.
+
+    Parameters:
+        terrain (object): Terrain object with a type grid, or at least get_type(x, y).
+        grid_size (int): Size of the simulation grid.
+
+    Returns:
+        numpy.ndarray: Float RGB array of shape (grid_size, grid_size, 3).
+    """
+    if getattr(terrain, "grid", None) is not None:
+        lut = np.array([mcolors.to_rgb(TERRAIN_COLORS.get(t, "#ffffff")) for t in terrain.types])
+        return lut[terrain.grid]
+    rgb = np.ones((grid_size, grid_size, 3))
+    for x in range(grid_size):
+        for y in range(grid_size):
+            rgb[y, x] = mcolors.to_rgb(TERRAIN_COLORS.get(terrain.get_type(x, y), "#ffffff"))
+    return rgb
+
+
+def stack_ranks(xs, ys, grid_size):
+    """
+    Returns, for every organism, how many organisms before it in the list share
+    its position. Used to offset stacked markers.
+
+    Parameters:
+        xs (numpy.ndarray): X-coordinates.
+        ys (numpy.ndarray): Y-coordinates.
+        grid_size (int): Size of the simulation grid.
+
+    Returns:
+        numpy.ndarray: Integer rank of every organism within its cell.
+    """
+    n = len(xs)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    key = np.asarray(ys, dtype=np.int64) * grid_size + np.asarray(xs, dtype=np.int64)
+    order = np.argsort(key, kind="stable")
+    sorted_key = key[order]
+    starts = np.r_[True, sorted_key[1:] != sorted_key[:-1]]
+    first = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[order] = np.arange(n) - first
+    return ranks
+
 
 def plot_organisms(step, organisms, grid_size=20, output_dir="frames", foodweb=None, terrain=None):
     """
@@ -14,6 +210,7 @@ def plot_organisms(step, organisms, grid_size=20, output_dir="frames", foodweb=N
     This function visualizes the environment and all organisms present at the specified step.
     It overlays terrain types and animal positions using colored markers. If multiple organisms
     are at the same position, they are slightly offset to be visible. Dead organisms are marked with 'x'.
+    For a sequence of frames, reuse a FrameRenderer instead.
 
     Parameters:
         step (int): The simulation step number.
@@ -23,60 +220,9 @@ def plot_organisms(step, organisms, grid_size=20, output_dir="frames", foodweb=N
         foodweb (object): Optional foodweb object to map species to consistent colors.
         terrain (object): Optional terrain object to render environmental backgrounds.
     """
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
-    scale = 0.3  # 1 rácsmezőhöz ennyi inch jusson
-    figsize = (grid_size * scale, grid_size * scale)
-    plt.figure(figsize=figsize)
-    ax = plt.gca()
-    ax.set_facecolor("#a1cca3")         # halványzöld
-    ax.grid(True, color="#a1cca3")      # rácsvonalak halványzöld
-    ax.set_xlim(0, grid_size)
-    ax.set_ylim(0, grid_size)
-    ax.set_xticks(range(0, grid_size + 1))
-    ax.set_yticks(range(0, grid_size + 1))
-    ax.grid(True)
-
-    # Háttérszínek terrain típusokhoz
-    terrain_colors = {
-        "tree": "#2e8b57",     # sötétzöld
-        "water": "#add8e6",    # világoskék
-        "hill": "#7d705c",     # barnás
-        "shelter": "#d3d3d3",  # világosszürke
-        "plain": "#a1cca3"     # halványzöld
-    }
-
-    # Terep kirajzolása háttérként
-    if terrain:
-        for x in range(grid_size):
-            for y in range(grid_size):
-                ttype = terrain.get_type(x, y)
-                rect = plt.Rectangle((x, y), 1, 1, color=terrain_colors.get(ttype, "#ffffff"), zorder=0)
-                ax.add_patch(rect)
-
-    # Színek fajonként
-    color_map = get_species_colors(organisms, foodweb=foodweb)
-    position_counts = defaultdict(int)
-
-    # Élőlények kirajzolása
-    for org in organisms:
-        pos = (org.x, org.y)
-        i = position_counts[pos]
-        position_counts[pos] += 1
-
-        offset = 0.1 * i
-        if not org.alive:
-            marker = "x"
-            color = "gray"
-        else:
-            marker = "o"
-            color = color_map.get(org.species, "black")
-        ax.plot(org.x + 0.5 + offset, org.y + 0.5 + offset, marker, color=color, markersize=10, zorder=1)
-
-    plt.title(f"Step {step}")
-    plt.savefig(f"{output_dir}/step_{step:03d}.png")
-    plt.close()
+    renderer = FrameRenderer(grid_size, output_dir=output_dir, foodweb=foodweb, terrain=terrain)
+    renderer.draw(step, organisms)
+    renderer.close()
 
 def get_species_colors(organisms, foodweb=None):
     """
@@ -89,20 +235,37 @@ def get_species_colors(organisms, foodweb=None):
         organisms (list): List of organism objects containing a .species attribute.
         foodweb (object, optional): Object with a get_color(species) method.
 
+    Returns:
+        dict[str, str]: Mapping from species name to hex color code.
+    """
+    return get_species_colors_for([org.species for org in organisms], foodweb=foodweb)
+
+def get_species_colors_for(species_names, foodweb=None):
+    """
+    Assigns consistent colors to the given species names, like get_species_colors.
+
+    Parameters:
+        species_names (list): Species names.
+        foodweb (object, optional): Object with a get_color(species) method.
+
     Returns:
         dict[str, str]: Mapping from species name to hex color code.
     """
     if foodweb:
-        return {org.species: foodweb.get_color(org.species) for org in organisms}
+        return {sp: foodweb.get_color(sp) for sp in species_names}
     else:
-        species = list({org.species for org in organisms})
-        cmap = cm.get_cmap('tab10', len(species))
+        species = list(dict.fromkeys(species_names))
+        cmap = plt.get_cmap('tab10', max(1, len(species)))
         return {sp: mcolors.to_hex(cmap(i)) for i, sp in enumerate(species)}
     
 
 def create_animation(frame_folder: str = "frames", output_path: str = "statistics_plots/animation.gif", fps: int = 4, frame_range: tuple[int, int] = None) -> None:
     """
-    Creates an animated GIF from PNG frame images in the given folder.
+    Creates an animation from PNG frame images in the given folder.
+
+    Frames are read from disk and handed to an AnimationWriter one at a time,
+    so only a single frame is held in memory. The format follows the extension
+    of output_path (GIF, or MP4 when imageio-ffmpeg is installed).
 
     Parameters:
         frame_folder: Directory containing .png frames
@@ -110,25 +273,21 @@ def create_animation(frame_folder: str = "frames", output_path: str = "statistic
         fps: Frames per second
         frame_range: Tuple (start, end) to limit frames, or None for all
     """
-    images = []
     frame_files = sorted([f for f in os.listdir(frame_folder) if f.endswith(".png")])
 
     if frame_range:
         start, end = frame_range
         frame_files = frame_files[start:end]
 
-    for filename in frame_files:
-        img_path = os.path.join(frame_folder, filename)
-        images.append(imageio.imread(img_path))
-
-    if not images:
+    if not frame_files:
         print("No frames found to create animation.")
         return
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    imageio.mimsave(output_path, images, fps=fps)
-    print(f"✅ Animation saved to {output_path}")
-    return Image(output_path)
+    with AnimationWriter(output_path, fps=fps) as writer:
+        for filename in frame_files:
+            writer.append(imageio.imread(os.path.join(frame_folder, filename)))
+    print(f"✅ Animation saved to {writer.output_path}")
+    return Image(writer.output_path)
 
 def compose_frames_side_by_side(frame_indices: list[int], frame_folder: str = "frames", output_path: str = "statistics_plots/frames_side_by_side.png") -> None:
     """
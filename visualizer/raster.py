@@ -0,0 +1,236 @@
+import numpy as np
+import imageio
+import matplotlib.colors as mcolors
+from visualizer.plot import TERRAIN_COLORS, get_species_colors_for
+
+DEAD_COLOR = (128, 128, 128)
+
+
+def hex_to_rgb8(color):
+    """
+    Converts a matplotlib color specification to an RGB uint8 triple.
+
+    Parameters:
+        color (str): Color such as '#fa7b05' or 'gray'.
+
+    Returns:
+        numpy.ndarray: Array of 3 uint8 values.
+    """
+    return np.round(np.array(mcolors.to_rgb(color)) * 255).astype(np.uint8)
+
+
+class FrameRasterizer:
+    """
+    Pure-NumPy frame renderer that bypasses matplotlib.
+
+    Terrain and organisms are written straight into an RGB ``uint8`` array of
+    shape (grid_size * scale, grid_size * scale, 3), with y = 0 at the bottom
+    like the matplotlib frames. Every grid cell becomes a ``scale`` x ``scale``
+    pixel block: live organisms are a filled square in their species colour and
+    dead organisms a gray cross. The scaled terrain background is computed once
+    and copied for every frame.
+
+    Attributes:
+        grid_size (int): Size of the simulation grid.
+        scale (int): Pixels per grid cell.
+        species_names (list): Species in palette order.
+        palette (numpy.ndarray): RGB uint8 color of every species, shape (n, 3).
+    """
+
+    def __init__(self, grid_size, foodweb=None, terrain=None, scale=4, species_names=None):
+        """
+        Prepares the palette and the terrain background.
+
+        Parameters:
+            grid_size (int): Size of the simulation grid.
+            foodweb (object): Optional foodweb; its get_color() and species ids are used.
+            terrain (object): Optional terrain object drawn as background.
+            scale (int): Pixels per grid cell (default is 4).
+            species_names (list): Species in palette order. Defaults to the foodweb
+                species ids order when a foodweb is given.
+        """
+        self.grid_size = grid_size
+        self.scale = max(1, int(scale))
+        self.foodweb = foodweb
+        if species_names is None:
+            species_names = list(getattr(foodweb, "species_names", []))
+        self.species_names = []
+        self._species_index = {}
+        self._luts = {}
+        self.palette = np.zeros((0, 3), dtype=np.uint8)
+        self._add_species(species_names)
+
+        cells = np.empty((grid_size, grid_size, 3), dtype=np.uint8)
+        if terrain is not None and getattr(terrain, "grid", None) is not None:
+            lut = np.array([hex_to_rgb8(TERRAIN_COLORS.get(t, "#ffffff")) for t in terrain.types], dtype=np.uint8)
+            cells[:] = lut[terrain.grid]
+        elif terrain is not None:
+            for x in range(grid_size):
+                for y in range(grid_size):
+                    cells[y, x] = hex_to_rgb8(TERRAIN_COLORS.get(terrain.get_type(x, y), "#ffffff"))
+        else:
+            cells[:] = hex_to_rgb8(TERRAIN_COLORS["plain"])
+        # Flip so that y = 0 is the bottom row, then blow every cell up to scale x scale pixels.
+        self.background = np.repeat(np.repeat(cells[::-1], self.scale, axis=0), self.scale, axis=1)
+
+        s = self.scale
+        if s >= 3:
+            live = np.zeros((s, s), dtype=bool)
+            live[1:s - 1, 1:s - 1] = True
+            dead = np.eye(s, dtype=bool) | np.fliplr(np.eye(s, dtype=bool))
+        else:
+            live = np.ones((s, s), dtype=bool)
+            dead = live
+        self._live_stamp = np.argwhere(live)
+        self._dead_stamp = np.argwhere(dead)
+
+    def _add_species(self, names):
+        new = [name for name in dict.fromkeys(names) if name not in self._species_index]
+        if not new:
+            return
+        for name in new:
+            self._species_index[name] = len(self.species_names)
+            self.species_names.append(name)
+        colors = get_species_colors_for(self.species_names, foodweb=self.foodweb)
+        self.palette = np.array([hex_to_rgb8(colors[name]) for name in self.species_names], dtype=np.uint8)
+
+    def species_indices(self, species):
+        """
+        Maps species names to palette indices, registering unknown species.
+
+        Parameters:
+            species (list): Species name of every organism.
+
+        Returns:
+            numpy.ndarray: Palette index of every organism.
+        """
+        self._add_species(species)
+        index = self._species_index
+        return np.fromiter((index[name] for name in species), dtype=np.int64, count=len(species))
+
+    def species_lut(self, species_names):
+        """
+        Returns the lookup table from the species ids of another numbering
+        (e.g. a recording's or a PopulationArrays store's) to palette indices,
+        registering unknown species. Tables are cached per species list.
+
+        Parameters:
+            species_names (list): Species name of every id of that numbering.
+
+        Returns:
+            numpy.ndarray: Palette index of every species id.
+        """
+        key = tuple(species_names)
+        lut = self._luts.get(key)
+        if lut is None:
+            self._add_species(key)
+            lut = self._luts[key] = np.array([self._species_index[name] for name in key], dtype=np.int64)
+        return lut
+
+    def render(self, xs, ys, species_idx, alive=None, out=None):
+        """
+        Rasterizes one frame from coordinate arrays.
+
+        Parameters:
+            xs (numpy.ndarray): X-coordinates.
+            ys (numpy.ndarray): Y-coordinates.
+            species_idx (numpy.ndarray): Palette index (species id) of every organism.
+            alive (numpy.ndarray): Optional alive flags; all alive if omitted.
+            out (numpy.ndarray): Optional preallocated output array to reuse.
+
+        Returns:
+            numpy.ndarray: RGB uint8 image of shape (grid_size * scale, grid_size * scale, 3).
+        """
+        if out is None:
+            out = self.background.copy()
+        else:
+            np.copyto(out, self.background)
+        g, s = self.grid_size, self.scale
+        blocks = out.reshape(g, s, g, s, 3)
+        xs = np.asarray(xs, dtype=np.int64)
+        rows = g - 1 - np.asarray(ys, dtype=np.int64)
+        species_idx = np.asarray(species_idx, dtype=np.int64)
+        alive = np.ones(len(xs), dtype=bool) if alive is None else np.asarray(alive, dtype=bool)
+
+        dead = ~alive
+        if dead.any():
+            dead_rows, dead_xs = rows[dead], xs[dead]
+            for u, v in self._dead_stamp:
+                blocks[dead_rows, u, dead_xs, v] = DEAD_COLOR
+        if alive.any():
+            live_rows, live_xs = rows[alive], xs[alive]
+            colors = self.palette[species_idx[alive]]
+            for u, v in self._live_stamp:
+                blocks[live_rows, u, live_xs, v] = colors
+        return out
+
+    def render_columns(self, xs, ys, species_ids, alive=None, species_names=None, out=None):
+        """
+        Rasterizes one frame from columns, such as those of a trajectory
+        recording or a PopulationArrays store, without touching organism objects.
+
+        Parameters:
+            xs (numpy.ndarray): X-coordinates.
+            ys (numpy.ndarray): Y-coordinates.
+            species_ids (numpy.ndarray): Species id of every organism.
+            alive (numpy.ndarray): Optional alive flags; all alive if omitted.
+            species_names (list): Species name of every id; the ids are palette
+                indices if None.
+            out (numpy.ndarray): Optional preallocated output array to reuse.
+
+        Returns:
+            numpy.ndarray: RGB uint8 image.
+        """
+        species_ids = np.asarray(species_ids, dtype=np.int64)
+        if species_names is not None:
+            species_ids = self.species_lut(species_names)[species_ids]
+        return self.render(xs, ys, species_ids, alive, out=out)
+
+    def render_organisms(self, organisms, out=None):
+        """
+        Rasterizes one frame from a list of organism objects. Reading the
+        objects costs more than drawing them; prefer render_columns when the
+        state is already held in arrays.
+
+        Parameters:
+            organisms (list): Organisms with species, x, y and alive attributes.
+            out (numpy.ndarray): Optional preallocated output array to reuse.
+
+        Returns:
+            numpy.ndarray: RGB uint8 image.
+        """
+        n = len(organisms)
+        xs = np.fromiter((o.x for o in organisms), dtype=np.int64, count=n)
+        ys = np.fromiter((o.y for o in organisms), dtype=np.int64, count=n)
+        alive = np.fromiter((o.alive for o in organisms), dtype=bool, count=n)
+        species_idx = self.species_indices([o.species for o in organisms])
+        return self.render(xs, ys, species_idx, alive, out=out)
+
+
+def rasterize_frame(organisms, grid_size=20, foodweb=None, terrain=None, scale=4):
+    """
+    Rasterizes the state of the simulation into an RGB uint8 array without matplotlib.
+    For a sequence of frames, reuse a FrameRasterizer instead.
+
+    Parameters:
+        organisms (list): Organisms with species, x, y and alive attributes.
+        grid_size (int): Size of the simulation grid (default is 20).
+        foodweb (object): Optional foodweb object to map species to consistent colors.
+        terrain (object): Optional terrain object drawn as background.
+        scale (int): Pixels per grid cell (default is 4).
+
+    Returns:
+        numpy.ndarray: RGB uint8 image of shape (grid_size * scale, grid_size * scale, 3).
+    """
+    return FrameRasterizer(grid_size, foodweb=foodweb, terrain=terrain, scale=scale).render_organisms(organisms)
+
+
+def save_frame(path, image):
+    """
+    Writes a rasterized frame to an image file (e.g. PNG).
+
+    Parameters:
+        path (str): Output file path.
+        image (numpy.ndarray): RGB uint8 image.
+    """
+    imageio.imwrite(path, image)